@@ -7,6 +7,7 @@ import json
 import avalon.api
 from avalon.vendor import requests
 from reveries.plugins import BaseContractor
+from reveries.utils import format_frame_list
 
 
 def parse_output_paths(instance):
@@ -20,6 +21,18 @@ def parse_output_paths(instance):
     return output_paths
 
 
+def parse_frames(instance):
+    if instance.data.get("renderFrames"):
+        # Only render missing frames of incomplete version
+        return format_frame_list(instance.data["renderFrames"])
+
+    return "{start}-{end}x{step}".format(
+        start=int(instance.data["startFrame"]),
+        end=int(instance.data["endFrame"]),
+        step=int(instance.data["byFrameStep"]),
+    )
+
+
 class ContractorDeadlineMayaRender(BaseContractor):
     """Publish via rendering Maya renderlayers on Deadline
 
@@ -78,11 +91,7 @@ class ContractorDeadlineMayaRender(BaseContractor):
                     "Pool": instance.data["deadlinePool"],
                     "Group": instance.data["deadlineGroup"],
                     "Priority": instance.data["deadlinePriority"],
-                    "Frames": "{start}-{end}x{step}".format(
-                        start=int(instance.data["startFrame"]),
-                        end=int(instance.data["endFrame"]),
-                        step=int(instance.data["byFrameStep"]),
-                    ),
+                    "Frames": parse_frames(instance),
                 },
                 "PluginInfo": {
                     # Input
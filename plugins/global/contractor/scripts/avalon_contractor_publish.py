@@ -7,6 +7,7 @@ import pyblish.util
 from bson import json_util
 from reveries.utils import publish_results_formatting
 from reveries.plugins import parse_contract_environment
+from reveries.profiling import trace_from_environment, stop_tracing
 
 
 log = logging.getLogger("Contractor")
@@ -30,6 +31,15 @@ def check_success(context):
 
 def publish():
 
+    trace_from_environment()
+    try:
+        _publish()
+    finally:
+        stop_tracing()
+
+
+def _publish():
+
     context = pyblish.api.Context()
 
     log.info("Parsing environment ...")
@@ -0,0 +1,20 @@
+
+import pyblish.api
+
+
+class CollectPublishProfiler(pyblish.api.ContextPlugin):
+    """Start profiling publish process
+
+    Wall time, CPU time, database round-trips, Maya command calls and bytes
+    read/written of every plugin and representation extraction will be
+    recorded, and reported by `PublishReports`.
+
+    """
+
+    label = "Collect Publish Profiler"
+    order = pyblish.api.CollectorOrder - 0.49
+
+    def process(self, context):
+        from reveries.profiling import install_profiler
+
+        install_profiler(context)
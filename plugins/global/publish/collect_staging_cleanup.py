@@ -0,0 +1,27 @@
+import pyblish.api
+
+
+class CollectStagingCleanup(pyblish.api.ContextPlugin):
+    """Remove staging dirs that left by failed publishes
+
+    If project has `stageOnPublishRoot` enabled, staging dirs are created in
+    `<root>/<project>/.staging`, and failed publishes will leave them there.
+    Dirs which owner process is still running will be kept, removal runs in
+    background.
+
+    """
+
+    label = "Clean Staging Root"
+    order = pyblish.api.CollectorOrder + 0.11
+
+    def process(self, context):
+        import os
+        from reveries.utils import staging_root, clear_stage
+
+        root = staging_root(context.data["projectDoc"])
+        if root is None or not os.path.isdir(root):
+            return
+
+        removed = clear_stage(root=root, background=True)
+        for dir_path in removed:
+            self.log.debug("Removed: %s" % dir_path)
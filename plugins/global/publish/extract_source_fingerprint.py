@@ -1,11 +1,25 @@
 
-import os
 import pyblish.api
 
-from reveries.utils import AssetHasher
+from reveries.utils import (
+    FINGERPRINT_MODES,
+    BackgroundHash,
+    fingerprint_mode,
+)
 
 
 class ExtractSourceFingerprint(pyblish.api.ContextPlugin):
+    """Fingerprint the workfile for locking version dir
+
+    The fingerprint mode is set by project data `fingerprint`:
+        "c4": Full C4 hash (default)
+        "sampled": File stat with head, tail and spread blocks, fast
+        "chunked": Full content hashed in chunks by threads
+
+    In non-C4 mode, the full C4 hash for database is computed in background
+    along with extraction, and collected by integrator.
+
+    """
 
     label = "Extract Fingerprint"
     order = pyblish.api.ExtractorOrder - 0.4
@@ -13,15 +27,18 @@ class ExtractSourceFingerprint(pyblish.api.ContextPlugin):
     def process(self, context):
 
         current_making = context.data["currentMaking"]
-        hasher = AssetHasher()
-
-        if os.path.isfile(current_making):
-            hasher.add_file(current_making)
+        mode = fingerprint_mode(context.data["projectDoc"])
 
-        if os.path.isdir(current_making):
-            hasher.add_dir(current_making)
-
-        context.data["sourceFingerprint"] = {
+        fingerprint = {
             "currentMaking": current_making,
-            "currentHash": hasher.digest(),
+            "currentHash": FINGERPRINT_MODES[mode](current_making),
         }
+
+        if mode != "c4":
+            fingerprint["fingerprintMode"] = mode
+            context.data["sourceHash"] = BackgroundHash(current_making)
+
+        self.log.debug("Fingerprint (%s): %s"
+                       % (mode, fingerprint["currentHash"]))
+
+        context.data["sourceFingerprint"] = fingerprint
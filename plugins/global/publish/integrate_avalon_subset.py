@@ -7,6 +7,12 @@ import errno
 import pyblish.api
 from avalon import api, io
 from avalon.vendor import filelink
+from reveries.utils import (
+    ContentStore,
+    is_staging_dir,
+    remove_stage,
+    hardlink_files,
+)
 
 
 log = logging.getLogger(__name__)
@@ -35,6 +41,12 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         self.transfers = dict(packages=list(),
                               files=list(),
                               hardlinks=list())
+        self.representation_dirs = dict()
+        self.transferred = dict()
+
+        # Optional content-addressed storage
+        project = instance.context.data["projectDoc"]
+        self.store = ContentStore() if ContentStore.enabled(project) else None
 
         # Check Delegation
         #
@@ -47,16 +59,31 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         # Assemble data and create version, representations
         subset, version, representations = self.register(instance)
 
+        # Wait for background transfers which started at extraction
+        self.wait_transfers(instance)
+
         # Integrate representations' files to shareable space
         self.log.info("Integrating representations to shareable space ...")
         self.integrate()
 
         # Write version and representations to database
-        version_id = self.write_database(instance, version, representations)
+        if instance.data.get("completingVersion") is not None:
+            version_id = self.update_database(instance,
+                                              version,
+                                              representations)
+        else:
+            version_id = self.write_database(instance,
+                                             version,
+                                             representations)
 
         # Update dependent
         self.update_dependent(instance, version_id)
 
+        # Clean up staging dir
+        stagingdir = instance.data["stagingDir"]
+        if is_staging_dir(stagingdir):
+            remove_stage(stagingdir, background=True)
+
     def register(self, instance):
 
         context = instance.context
@@ -72,8 +99,13 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         #   \       /
         #    o   __/
         #
-        assert all(result["success"] for result in context.data["results"]), (
-            "Atomicity not held, aborting.")
+        atomic = all(result["success"] for result in context.data["results"])
+        transfer_queue = context.data.get("transferQueue")
+        if not atomic and transfer_queue is not None:
+            # Stop copying into publish space
+            transfer_queue.cancel()
+
+        assert atomic, "Atomicity not held, aborting."
 
         # Check packages
         #
@@ -138,6 +170,10 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
             dst = publish_path
 
             self.transfers["packages"].append([src, dst])
+            self.representation_dirs[self.normpath(dst)] = representation
+
+        # Staging dir created by `reveries.utils.temp_dir` could be moved
+        self.move_packages = is_staging_dir(stagingdir)
 
         self.transfers["files"] += instance.data["files"]
         self.transfers["hardlinks"] += instance.data["hardlinks"]
@@ -162,6 +198,8 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         #     \|________|
         #
 
+        hardlinks = list()
+
         for job in self.transfers:
             transfers = self.transfers[job]
 
@@ -170,10 +208,8 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
                 self.log.debug("Src. Before: {!r}".format(src))
                 self.log.debug("Dst. Before: {!r}".format(dst))
 
-                src = os.path.abspath(
-                    os.path.normpath(os.path.expandvars(src)))
-                dst = os.path.abspath(
-                    os.path.normpath(os.path.expandvars(dst)))
+                src = self.normpath(src)
+                dst = self.normpath(dst)
 
                 self.log.debug("Src. After: {!r}".format(src))
                 self.log.debug("Dst. After: {!r}".format(dst))
@@ -184,12 +220,50 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
                                    "will not copy.")
                     continue
 
+                if (job, src, dst) in self.transferred:
+                    self.log.debug("Transferred in background.")
+                    if self.store is not None:
+                        self.record_store(dst,
+                                          self.transferred[(job, src, dst)])
+                    continue
+
                 if job == "packages":
-                    self.copy_dir(src, dst)
+                    if self.store is not None:
+                        self.store_dir(src, dst)
+                    elif self.move_packages:
+                        self.move_dir(src, dst)
+                    else:
+                        self.copy_dir(src, dst)
                 if job == "files":
-                    self.copy_file(src, dst)
+                    if self.store is None:
+                        self.copy_file(src, dst)
+                    else:
+                        self.store_file(src, dst)
                 if job == "hardlinks":
-                    self.hardlink_file(src, dst)
+                    # Linked in bulk after all files are in place
+                    hardlinks.append((src, dst))
+
+        if hardlinks:
+            self.hardlink_files(hardlinks)
+
+    def wait_transfers(self, instance):
+        """Wait for background transfers of the instance
+
+        Transfers which were done by `reveries.utils.TransferQueue` will be
+        skipped in `integrate`.
+
+        """
+        transfer_queue = instance.context.data.get("transferQueue")
+        if transfer_queue is None:
+            return
+
+        self.log.info("Waiting for background transfers ...")
+        try:
+            self.transferred = transfer_queue.wait(instance.name)
+        except Exception as e:
+            msg = "Background transfer failed: %s" % e
+            self.log.critical(msg)
+            raise OSError(msg)
 
     def copy_dir(self, src, dst):
         """ Copy given source to destination
@@ -212,6 +286,90 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
             self.log.critical(msg)
             raise OSError(msg)
 
+    def move_dir(self, src, dst):
+        """Move staged package to destination
+
+        Fallback to copy if destination is on other file system.
+
+        Arguments:
+            src (str): the source dir which needs to be moved
+            dst (str): the destination of the source dir
+        Returns:
+            None
+        """
+        if os.path.exists(dst):
+            msg = ("Representation dir existed, this should "
+                   "not happen. Move aborted.")
+            self.log.critical(msg)
+            raise OSError(msg)
+
+        dirname = os.path.dirname(dst)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                msg = "An unexpected error occurred."
+                self.log.critical(msg)
+                raise OSError(msg)
+
+            self.copy_dir(src, dst)
+
+    def normpath(self, path):
+        return os.path.abspath(os.path.normpath(os.path.expandvars(path)))
+
+    def store_dir(self, src, dst):
+        """Put files into content store and hardlink to destination
+
+        Arguments:
+            src (str): the source dir which needs to be stored
+            dst (str): the destination of the source dir
+        Returns:
+            None
+        """
+        try:
+            manifest = self.store.ingest_dir(src, dst)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                msg = ("Representation dir existed, this should "
+                       "not happen. Copy aborted.")
+            else:
+                msg = "An unexpected error occurred."
+
+            self.log.critical(msg)
+            raise OSError(msg)
+
+        self.record_store(dst, manifest)
+
+    def store_file(self, src, dst):
+        c4_id = self.store.ingest_file(src, dst)
+        self.record_store(dst, c4_id)
+
+    def record_store(self, dst, stored):
+        """Add stored files into representation's `storeManifest`
+
+        Arguments:
+            dst (str): Destination of the stored dir or file
+            stored: Manifest list if `dst` is a representation dir, or C4 id
+                if `dst` is a file
+
+        """
+        if dst in self.representation_dirs:
+            data = self.representation_dirs[dst]["data"]
+            data["storeManifest"] = data.get("storeManifest", []) + stored
+            return
+
+        c4_id = stored
+        for repr_dir, representation in self.representation_dirs.items():
+            if dst.startswith(repr_dir + os.sep):
+                path = os.path.relpath(dst, repr_dir).replace("\\", "/")
+                data = representation["data"]
+                data["storeManifest"] = (data.get("storeManifest", []) +
+                                         [[path, c4_id]])
+                break
+
     def copy_file(self, src, dst):
         file_dir = os.path.dirname(dst)
         if not os.path.isdir(file_dir):
@@ -238,6 +396,14 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
 
         filelink.create(src, dst, filelink.HARDLINK)
 
+    def hardlink_files(self, transfers):
+        """Hardlink files in bulk, see `reveries.utils.hardlink_files`"""
+        try:
+            hardlink_files(transfers)
+        except OSError:
+            self.log.critical("An unexpected error occurred.")
+            raise
+
     def write_database(self, instance, version, representations):
         """Write version and representations to database
 
@@ -266,6 +432,38 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
 
         return version_id
 
+    def update_database(self, instance, version, representations):
+        """Update incomplete version and its representations in place
+
+        For completing the version which was published with missing parts,
+        e.g. render sequence with missing frames.
+
+        """
+        version_id = instance.data["completingVersion"]
+
+        self.log.info("Updating version {} in database ..."
+                      "".format(version["name"]))
+
+        io.update_many({"_id": version_id},
+                       {"$set": {"data.incomplete":
+                                 version["data"].get("incomplete", False)}})
+
+        self.log.info("Updating {} representations ..."
+                      "".format(len(representations)))
+        for representation in representations:
+            filter_ = {"type": "representation",
+                       "parent": version_id,
+                       "name": representation["name"]}
+
+            if io.find_one(filter_, projection={"_id": True}) is None:
+                representation["parent"] = version_id
+                io.insert_one(representation)
+            else:
+                io.update_many(filter_,
+                               {"$set": {"data": representation["data"]}})
+
+        return version_id
+
     def get_subset(self, instance):
 
         asset_id = instance.data["assetDoc"]["_id"]
@@ -335,7 +533,12 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         source = context.data["currentMaking"]
         source = source.replace(api.registered_root(), "{root}")
         source = source.replace("\\", "/")
-        hash_val = context.data["sourceFingerprint"]["currentHash"]
+        source_hash = context.data.get("sourceHash")
+        if source_hash is None:
+            hash_val = context.data["sourceFingerprint"]["currentHash"]
+        else:
+            # Full C4 hash computed in background, see fingerprint mode
+            hash_val = source_hash.result()
 
         version_data = {
             "families": families,
@@ -350,7 +553,7 @@ class IntegrateAvalonSubset(pyblish.api.InstancePlugin):
         }
 
         # Include optional data if present in
-        optionals = ["startFrame", "endFrame", "step", "handles"]
+        optionals = ["startFrame", "endFrame", "step", "handles", "incomplete"]
         for key in optionals:
             if key in instance.data:
                 version_data[key] = instance.data[key]
@@ -1,4 +1,5 @@
 
+import os
 import pyblish.api
 import avalon.api
 
@@ -39,3 +40,50 @@ class PublishReports(pyblish.api.ContextPlugin):
                               "".format(publish_contractor))
 
             self.log.info("")
+
+        transfer_queue = context.data.get("transferQueue")
+        if transfer_queue is not None:
+            transfer_queue.close()
+
+        self.report_profile(context)
+
+    def report_profile(self, context):
+        from reveries.profiling import uninstall_profiler
+
+        profiler = context.data.get("publishProfiler")
+        if profiler is None or not profiler.installed:
+            # Uninstalled by failed validation, nothing recorded since
+            return
+
+        # Stop counting before writing profiles
+        uninstall_profiler()
+
+        for instance in context:
+            version_dir = instance.data.get("versionDir")
+            if version_dir and os.path.isdir(version_dir):
+                profiler.write(instance, version_dir)
+
+        template = ("    {wall:>8.3f}s  cpu {cpu:>8.3f}s  db {db:>5}  "
+                    "cmds {cmds:>7}  read {read:>12}  write {write:>12}  "
+                    "{name}")
+
+        self.log.info("Profile (Top plugins by wall time)")
+        self.log.info("===")
+        for record in profiler.summary():
+            name = record["plugin"]
+            if record["instance"]:
+                name += " ({})".format(record["instance"])
+            self.log.info(template.format(name=name, **record))
+
+        self.log.info("")
+        self.log.info("Profile (Representations)")
+        self.log.info("===")
+        for record in profiler.summary(profiler.representations, top=None):
+            name = "{plugin}.{representation} ({instance})".format(**record)
+            self.log.info(template.format(name=name, **record))
+
+        totals = {key: sum(record[key] for record in profiler.plugins)
+                  for key in ("db", "cmds", "read", "write")}
+        self.log.info("")
+        self.log.info("Total: db {db}, cmds {cmds}, read {read} bytes, "
+                      "write {write} bytes".format(**totals))
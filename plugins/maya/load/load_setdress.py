@@ -38,7 +38,12 @@ class SetDressLoader(HierarchicalLoader, avalon.api.Loader):
                        objectSpace=True,
                        matrix=sub_matrix)
 
-    def update_variation(self, data_new, data_old, container, force=False):
+    def update_variation(self,
+                         data_new,
+                         data_old,
+                         container,
+                         force=False,
+                         changes=None):
         """
         """
         import maya.cmds as cmds
@@ -46,25 +51,29 @@ class SetDressLoader(HierarchicalLoader, avalon.api.Loader):
 
         assembly = container["subsetGroup"]
 
-        current_matrix = cmds.xform(assembly,
-                                    query=True,
-                                    matrix=True,
-                                    objectSpace=True)
-        original_matrix = data_old["matrix"]
-        has_matrix_override = not matrix_equals(current_matrix,
-                                                original_matrix)
-
-        if has_matrix_override and not force:
-            self.log.warning("Matrix override preserved on %s",
-                             data_new["namespace"])
-        else:
-            new_matrix = data_new["matrix"]
-            cmds.xform(assembly, objectSpace=True, matrix=new_matrix)
+        if changes is None or changes["matrix"]:
+            current_matrix = cmds.xform(assembly,
+                                        query=True,
+                                        matrix=True,
+                                        objectSpace=True)
+            original_matrix = data_old["matrix"]
+            has_matrix_override = not matrix_equals(current_matrix,
+                                                    original_matrix)
+
+            if has_matrix_override and not force:
+                self.log.warning("Matrix override preserved on %s",
+                                 data_new["namespace"])
+            else:
+                new_matrix = data_new["matrix"]
+                cmds.xform(assembly, objectSpace=True, matrix=new_matrix)
 
         # Update matrix to components
-        old_data_map = {t: m for t, m in self.parse_sub_matrix(data_old)}
+        sub_changes = None if changes is None else changes["subMatrix"]
+        old_data_map = {t: m for t, m in self.parse_sub_matrix(data_old,
+                                                               sub_changes)}
 
-        for transform, sub_matrix in self.parse_sub_matrix(data_new):
+        for transform, sub_matrix in self.parse_sub_matrix(data_new,
+                                                           sub_changes):
             if not transform:
                 continue
 
@@ -99,8 +108,13 @@ class SetDressLoader(HierarchicalLoader, avalon.api.Loader):
 
         return transform_id_map
 
-    def parse_sub_matrix(self, data):
+    def parse_sub_matrix(self, data, changes=None):
         """
+        Args:
+            data (dict): Member data
+            changes (dict, optional): Container id path as key and changed
+                addresses as value, only yield changed transforms if given.
+
         """
         import maya.cmds as cmds
         from reveries.lib import DEFAULT_MATRIX
@@ -109,15 +123,25 @@ class SetDressLoader(HierarchicalLoader, avalon.api.Loader):
         current_NS = cmds.namespaceInfo(currentNamespace=True,
                                         absoluteName=True)
         for container_id, sub_matrix in data["subMatrix"].items():
+            if changes is not None:
+                if container_id not in changes:
+                    continue
+                addresses = changes[container_id]
+            else:
+                addresses = sub_matrix
+
             container = container_from_id_path(container_id, current_NS)
             full_NS = cmds.getAttr(container + ".namespace")
             nodes = cmds.namespaceInfo(full_NS, listOnlyDependencyNodes=True)
 
             transform_id_map = self.transform_by_id(nodes)
 
-            for address in sub_matrix:
+            for address in addresses:
+                if address not in sub_matrix:
+                    continue
+
                 if address == "GROUP":
-                    name, matrix = sub_matrix[address].popitem()
+                    name, matrix = next(iter(sub_matrix[address].items()))
                     transform = full_NS + ":" + name
                 else:
                     transform = transform_id_map.get(address)
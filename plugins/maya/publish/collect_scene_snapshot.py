@@ -0,0 +1,29 @@
+
+import pyblish.api
+
+
+class CollectSceneSnapshot(pyblish.api.ContextPlugin):
+    """Take a snapshot of all instances' member nodes for validation
+
+    Node type, hierarchy, intermediate state, local matrix, keyable state,
+    lock state and user-defined attributes of all members are collected at
+    once, so validators could read from `context.data["sceneSnapshot"]`
+    instead of querying the same nodes again and again.
+
+    """
+
+    order = pyblish.api.CollectorOrder + 0.45
+    hosts = ["maya"]
+    label = "Collect Scene Snapshot"
+
+    def process(self, context):
+        from reveries.maya.snapshot import SceneSnapshot
+
+        nodes = set()
+        for instance in context:
+            nodes.update(instance)
+
+        snapshot = SceneSnapshot(sorted(nodes))
+        context.data["sceneSnapshot"] = snapshot
+
+        self.log.debug("%d nodes collected in scene snapshot." % len(snapshot))
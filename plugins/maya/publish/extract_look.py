@@ -26,6 +26,29 @@ class ExtractLook(PackageExtractor):
         "LookDev"
     ]
 
+    def signature_LookDev(self):
+        from maya import cmds
+        from reveries.maya import utils
+
+        # Published texture paths change every version, use the content
+        # hashes from texture extractor instead.
+        file_node_hashes = self.context.data.get("fileNodeHashes", {})
+        textures = dict()
+        for node in cmds.ls(self.member, type="file"):
+            if node not in file_node_hashes:
+                # Texture content unknown, could not be reused
+                return None
+            textures[node] = file_node_hashes[node]
+
+        # Shading network and everything that serialised into link file
+        # are defined by the scene files.
+        return {
+            "sources": utils.hash_scene_sources(self.context),
+            "member": sorted(cmds.ls(self.member, long=True)),
+            "dagMembers": sorted(cmds.ls(self.data["dagMembers"], long=True)),
+            "textures": textures,
+        }
+
     def extract_LookDev(self):
 
         from maya import cmds
@@ -40,6 +40,21 @@ class ExtractModel(PackageExtractor):
         ):
             super(ExtractModel, self).extract()
 
+    def signature_mayaBinary(self):
+        # All node attributes of members are exported, only the scene files
+        # could define them all.
+        return {
+            "sources": utils.hash_scene_sources(self.context),
+            "member": sorted(cmds.ls(self.member, long=True)),
+        }
+
+    def signature_GPUCache(self):
+        return {
+            "sources": utils.hash_scene_sources(self.context),
+            "member": sorted(cmds.ls(self.member, long=True)),
+            "frame": cmds.currentTime(query=True),
+        }
+
     def extract_mayaBinary(self):
         entry_file = self.file_name("mb")
         package_path = self.create_package()
@@ -3,7 +3,6 @@ import os
 import pyblish.api
 import reveries.utils
 
-from avalon.vendor import clique
 from reveries.maya import io
 from reveries.plugins import DelegatablePackageExtractor, skip_stage
 
@@ -51,28 +50,21 @@ class ExtractPlayblast(DelegatablePackageExtractor):
 
         # Check image sequence length to ensure that the extraction did
         # not interrupted.
-        files = os.listdir(publish_dir)
-        # (NOTE) Did not consider frame step (byFrame)
-        length = end_frame - start_frame + 1
-        collections, _ = clique.assemble(files, minimum_items=length)
+        frames = reveries.utils.frame_range(start_frame, end_frame)
+        try:
+            sequence = reveries.utils.ImageSequence.scan(publish_dir)
+        except ValueError:
+            raise AssertionError("Extraction failed, no sequence found.")
 
-        assert len(collections) == 1, ("Extraction failed, possible "
-                                       "insufficient sequence length.")
-
-        sequence = collections[0]
-
-        assert len(sequence.indexes) == length, ("Sequence length not match, "
-                                                 "this is a bug.")
-
-        entry_fname = (sequence.head +
-                       "%%0%dd" % sequence.padding +
-                       sequence.tail)
+        missing = sequence.missing(frames)
+        assert not missing, ("Extraction failed, %d frames missing: %s"
+                             % (len(missing), missing[:20]))
 
         self.add_data({
             "imageFormat": self.ext,
-            "entryFileName": entry_fname,
-            "seqStart": list(sequence.indexes)[0],
-            "seqEnd": list(sequence.indexes)[-1],
+            "entryFileName": sequence.entry_file_name,
+            "seqStart": frames[0],
+            "seqEnd": frames[-1],
             "startFrame": start_frame,
             "endFrame": end_frame,
             "byFrameStep": 1,
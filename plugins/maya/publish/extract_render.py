@@ -1,13 +1,25 @@
 
 import os
 import pyblish.api
+import avalon.io
 
-from avalon.vendor import clique
 from reveries.plugins import DelegatablePackageExtractor, skip_stage
+from reveries.utils import ImageSequence, frame_range
 
 
 class ExtractRender(DelegatablePackageExtractor):
     """Start GUI rendering if not delegate to Deadline
+
+    If `partialSequence` is enabled in instance or project data, sequence
+    with missing frames could still be published, the missing frames will be
+    saved in representation data and the version will be marked as
+    `incomplete`.
+
+    Publish from the same workfile again will complete that version instead
+    of creating a new one, only frames that were missing will be linked into
+    the version dir and the documents will be updated in place. If the
+    publish is delegated to Deadline, only the missing frames are rendered.
+
     """
 
     label = "Extract Render"
@@ -42,8 +54,7 @@ class ExtractRender(DelegatablePackageExtractor):
 
         # Check image sequence length to ensure that the extraction did
         # not interrupted.
-        seq_dir = os.path.dirname(output_path)
-        self.add_sequence(seq_dir, aov_name, repr_dir)
+        self.add_sequence(output_path, aov_name, repr_dir)
 
     @skip_stage
     def extract_imageSequenceSet(self):
@@ -59,49 +70,133 @@ class ExtractRender(DelegatablePackageExtractor):
         for aov_name, aov_path in self.data["outputPaths"].items():
             # Check image sequence length to ensure that the extraction did
             # not interrupted.
-            seq_dir = os.path.dirname(aov_path)
-            self.add_sequence(seq_dir, aov_name, repr_dir)
+            self.add_sequence(aov_path, aov_name, repr_dir)
+
+    def _get_next_version(self):
+        version = self._find_incomplete_version()
+        if version is None:
+            return super(ExtractRender, self)._get_next_version()
+
+        self.log.info("Completing incomplete version %d." % version["name"])
+
+        self._completing_version = version
+        self.data["completingVersion"] = version["_id"]
+
+        # Previous sequences data for only linking new frames
+        self._previous_sequences = dict()
+        representations = avalon.io.find({"type": "representation",
+                                          "parent": version["_id"]},
+                                         projection={"data.sequence": True})
+        for representation in representations:
+            self._previous_sequences.update(
+                representation["data"].get("sequence", {}))
+
+        # Render only missing frames
+        missing = set()
+        for sequence in self._previous_sequences.values():
+            missing.update(sequence.get("missingFrames", []))
+        if missing:
+            self.data["renderFrames"] = sorted(missing)
+
+        return version["name"]
+
+    def _find_incomplete_version(self):
+        """Return latest version if it's incomplete and from same workfile"""
+        project = self.context.data["projectDoc"]
+        partial = self.data.get("partialSequence",
+                                project["data"].get("partialSequence"))
+        if not partial or self._subset_doc is None:
+            return None
+
+        version = avalon.io.find_one({"type": "version",
+                                      "parent": self._subset_doc["_id"]},
+                                     sort=[("name", -1)])
+        if version is None or not version["data"].get("incomplete"):
+            return None
+
+        if (self.context.data.get("contractorAccepted") and
+                version["name"] != self.data["versionNext"]):
+            # Not the version that delegated to complete
+            return None
+
+        version_dir = self._format_version_dir(version["name"])
+        if not os.path.isfile(os.path.join(version_dir, self.metadata)):
+            return None
+        if not self._is_version_matched(version_dir):
+            self.log.warning("Latest version %d is incomplete but the "
+                             "workfile has changed, publish new version."
+                             % version["name"])
+            return None
+
+        return version
+
+    def add_sequence(self, output_path, seq_name, repr_dir):
+        """Verify rendered frames and add them to hardlink queue
+
+        Only the files of output path pattern and in frame range (with
+        `byFrameStep`) are collected. If completing a version, only the
+        frames that were missing will be added.
 
-    def add_sequence(self, seq_dir, seq_name, repr_dir):
-        """
         """
+        seq_dir, pattern = os.path.split(output_path)
         self.log.debug("Collecting sequence from: %s" % seq_dir)
-        files = os.listdir(seq_dir)
 
-        # (NOTE) Did not consider frame step (byFrame)
         start_frame = self.data["startFrame"]
         end_frame = self.data["endFrame"]
-        length = end_frame - start_frame + 1
-        collections, _ = clique.assemble(files, minimum_items=length)
-
-        assert len(collections) == 1, ("Extraction failed, possible "
-                                       "insufficient sequence length.")
-
-        sequence = collections[0]
-
-        assert len(sequence.indexes) == length, ("Sequence length not match, "
-                                                 "this is a bug.")
-
-        entry_fname = (sequence.head +
-                       "%%0%dd" % sequence.padding +
-                       sequence.tail)
-
-        self.add_data({"sequence": {
-            seq_name: {
-                "imageFormat": self.data["fileExt"],
-                "entryFileName": entry_fname,
-                "seqStart": list(sequence.indexes)[0],
-                "seqEnd": list(sequence.indexes)[-1],
-                "startFrame": start_frame,
-                "endFrame": end_frame,
-                "byFrameStep": self.data["byFrameStep"],
-                "renderlayer": self.data["renderlayer"],
-            }
-        }})
-
-        for file in files:
-            src = seq_dir + "/" + file
-            dst = os.path.join(repr_dir, seq_name, file)
+        frames = frame_range(start_frame, end_frame, self.data["byFrameStep"])
+
+        try:
+            sequence = ImageSequence.scan(seq_dir, pattern)
+        except ValueError:
+            raise AssertionError("Extraction failed, no sequence found in "
+                                 "%s" % seq_dir)
+
+        project = self.context.data["projectDoc"]
+        partial = self.data.get("partialSequence",
+                                project["data"].get("partialSequence"))
+
+        # Frames that have been linked by previous publish
+        linked = set()
+        if self._completing_version is not None:
+            previous = self._previous_sequences.get(seq_name)
+            if previous is not None:
+                linked = set(frames) - set(previous.get("missingFrames", []))
+
+        # Frames that have been linked may have been cleaned from output dir
+        missing = [frame for frame in sequence.missing(frames)
+                   if frame not in linked]
+        if missing and partial:
+            self.log.warning("%d frames missing in %s, publish incomplete "
+                             "sequence: %s" % (len(missing), seq_name,
+                                               missing[:20]))
+        else:
+            assert not missing, ("Extraction failed, %d frames missing: %s"
+                                 % (len(missing), missing[:20]))
+
+        new_frames = [frame for frame in frames
+                      if frame in sequence.frames and frame not in linked]
+
+        data = {
+            "imageFormat": self.data["fileExt"],
+            "entryFileName": sequence.entry_file_name,
+            "seqStart": frames[0],
+            "seqEnd": frames[-1],
+            "startFrame": start_frame,
+            "endFrame": end_frame,
+            "byFrameStep": self.data["byFrameStep"],
+            "renderlayer": self.data["renderlayer"],
+        }
+        if partial:
+            data["missingFrames"] = missing
+            self.data["incomplete"] = (self.data.get("incomplete") or
+                                       bool(missing))
+
+        self.add_data({"sequence": {seq_name: data}})
+
+        self.log.debug("Linking %d frames of %s" % (len(new_frames),
+                                                    seq_name))
+        for src in sequence.file_paths(new_frames):
+            dst = os.path.join(repr_dir, seq_name, os.path.basename(src))
             self.add_hardlink(src, dst)
 
     def start_local_rendering(self):
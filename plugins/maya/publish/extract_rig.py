@@ -7,7 +7,7 @@ from maya import cmds
 from avalon import maya
 
 from reveries.plugins import PackageExtractor
-from reveries.maya import capsule
+from reveries.maya import capsule, utils
 
 
 class ExtractRig(PackageExtractor):
@@ -22,6 +22,13 @@ class ExtractRig(PackageExtractor):
         "mayaBinary",
     ]
 
+    def signature_mayaBinary(self):
+        # Rig could be anything in the scene, only the scene files define it
+        return {
+            "sources": utils.hash_scene_sources(self.context),
+            "member": sorted(cmds.ls(self.member, long=True)),
+        }
+
     def extract_mayaBinary(self):
         # Define extract output file path
         entry_file = self.file_name("mb")
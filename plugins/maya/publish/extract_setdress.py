@@ -1,10 +1,10 @@
 
 import os
-import json
 import pyblish.api
 from maya import cmds
 from reveries.plugins import PackageExtractor
-from reveries.maya import io, lib, utils
+from reveries.utils import dump_members
+from reveries.maya import io, lib
 from reveries.maya.hierarchy import (
     walk_containers,
     container_to_id_path,
@@ -40,32 +40,23 @@ class ExtractSetDress(PackageExtractor):
         transforms = cmds.ls(members,
                              type="transform",
                              referencedNodes=True)
+        # Subset group node's matrix
+        subset_group = container["subsetGroup"]
 
-        for transform in transforms:
-            matrix = cmds.xform(transform,
-                                query=True,
-                                matrix=True,
-                                objectSpace=True)
+        matrices = lib.ls_matrices(transforms + [subset_group])
+        _, group_matrix, _ = matrices.pop()
 
+        for transform, matrix, address in matrices:
             if matrix_equals(matrix, DEFAULT_MATRIX):
                 matrix = "<default>"
 
-            address = utils.get_id(transform)
             data["subMatrix"][id_path][address] = matrix
 
-        # Collect subseet group node's matrix
-        subset_group = container["subsetGroup"]
-
-        matrix = cmds.xform(subset_group,
-                            query=True,
-                            matrix=True,
-                            objectSpace=True)
-
-        if matrix_equals(matrix, DEFAULT_MATRIX):
+        if matrix_equals(group_matrix, DEFAULT_MATRIX):
             return
 
         name = subset_group.rsplit(":", 1)[-1]
-        data["subMatrix"][id_path]["GROUP"] = {name: matrix}
+        data["subMatrix"][id_path]["GROUP"] = {name: group_matrix}
 
     def parse_matrix(self):
         for data in self.data["subsetData"]:
@@ -87,7 +78,7 @@ class ExtractSetDress(PackageExtractor):
 
     def extract_setPackage(self):
         entry_file = self.file_name("abc")
-        instances_file = self.file_name("json")
+        instances_file = self.file_name("jsonl")
         package_path = self.create_package()
         entry_path = os.path.join(package_path, entry_file)
         instances_path = os.path.join(package_path, instances_file)
@@ -95,9 +86,8 @@ class ExtractSetDress(PackageExtractor):
         self.parse_matrix()
 
         self.log.info("Dumping setdress members data ..")
-        with open(instances_path, "w") as fp:
-            json.dump(self.data["subsetData"], fp, ensure_ascii=False)
-            self.log.debug("Dumped: {}".format(instances_path))
+        dump_members(self.data["subsetData"], instances_path)
+        self.log.debug("Dumped: {}".format(instances_path))
 
         self.log.info("Extracting hierarchy ..")
         cmds.select(self.data["subsetSlots"])
@@ -7,11 +7,19 @@ import avalon.io
 
 from reveries.plugins import PackageExtractor, skip_stage
 from reveries.maya.plugins import env_embedded_path
-from reveries.utils import hash_file
+from reveries.utils import hash_files, resolve_file_patterns
 
 
 class ExtractTexture(PackageExtractor):
     """Export texture files
+
+    UDIM tiles and image sequences are all packaged, each unique source
+    file will only be hashed once. Files which content already published
+    in latest version will be hardlinked instead of copied.
+
+    A manifest of package relative file paths and their hashes is saved
+    in representation data as `textureManifest`.
+
     """
 
     label = "Extract Texture"
@@ -27,43 +35,41 @@ class ExtractTexture(PackageExtractor):
     def extract_TexturePack(self):
 
         from maya import cmds
+        from reveries.maya import lib
 
         package_path = self.create_package()
         package_path = env_embedded_path(package_path)
 
         if "fileNodePath" not in self.context.data:
             self.context.data["fileNodePath"] = dict()
+        if "fileNodeHashes" not in self.context.data:
+            self.context.data["fileNodeHashes"] = dict()
 
         # Extract textures
         #
         self.log.info("Extracting textures..")
 
-        # Get latest hashes
-        path = [
-            avalon.api.Session["AVALON_PROJECT"],
-            avalon.api.Session["AVALON_ASSET"],
-            self.data["subset"],
-            -1,  # latest version
-            "TexturePack"
-        ]
-        representation = avalon.io.locate(path)
-        if representation is None:
-            # Never been published
-            latest_hashes = dict()
-        else:
-            representation = avalon.io.find_one({"_id": representation})
-            latest_hashes = representation["data"]["hashes"]
+        latest_hashes = self.get_latest_hashes()
+
+        # Resolved by validator, UDIM tiles and sequences expanded
+        texture_files = dict(self.data.get("textureFiles", {}))
+        patterns = {file_node: lib.get_file_node_pattern(file_node)
+                    for file_node in self.member
+                    if file_node not in texture_files}
+        if patterns:
+            resolved = resolve_file_patterns(patterns.values())
+            for file_node, pattern in patterns.items():
+                texture_files[file_node] = resolved[pattern]
+
+        # Hash each unique file once
+        hashes = hash_files(path for file_node in self.member
+                            for path, _, _ in texture_files[file_node])
+
+        manifest = list()
 
         # Hash file to check which to copy and which to remain old link
         for file_node in self.member:
-            attr_name = file_node + ".fileTextureName"
-            img_path = cmds.getAttr(attr_name,
-                                    expandEnvironmentVariables=True)
-
-            img_name = os.path.basename(img_path)
-            paths = [package_path]
-            paths += file_node.split(":")  # Namespace as fsys hierarchy
-            paths.append(img_name)  # image name
+            # Namespace as fsys hierarchy
             #
             # Include node name as part of the path should prevent
             # file name collision which may introduce by two or
@@ -74,19 +80,72 @@ class ExtractTexture(PackageExtractor):
             #   File_A.fileTextureName = "asset/a/texture.png"
             #   File_B.fileTextureName = "asset/b/texture.png"
             #
-            final_path = os.path.join(*paths)
+            node_dir = file_node.split(":")
+
+            for img_path, _, _ in texture_files[file_node]:
+                img_name = os.path.basename(img_path)  # image name
+                relative_path = os.path.join(*(node_dir + [img_name]))
+                final_path = os.path.join(package_path, relative_path)
 
-            hash_value = hash_file(img_path)
-            try:
-                previous_path = latest_hashes[hash_value]
-            except KeyError:
-                latest_hashes[hash_value] = final_path
-                self.add_file(img_path, final_path)
-            else:
-                self.add_hardlink(previous_path, final_path)
+                hash_value = hashes[img_path]
+                try:
+                    previous_path = latest_hashes[hash_value]
+                except KeyError:
+                    latest_hashes[hash_value] = final_path
+                    self.add_file(img_path, final_path)
+                else:
+                    self.add_hardlink(previous_path, final_path)
+
+                manifest.append([relative_path, hash_value])
+
+            attr_name = file_node + ".fileTextureName"
+            img_path = cmds.getAttr(attr_name,
+                                    expandEnvironmentVariables=True)
+            img_name = os.path.basename(img_path)
+            final_path = os.path.join(*([package_path] + node_dir +
+                                        [img_name]))
 
             self.context.data["fileNodePath"][file_node] = final_path
+            self.context.data["fileNodeHashes"][file_node] = sorted(
+                hashes[path] for path, _, _ in texture_files[file_node])
             self.log.debug("FileNode: {!r}".format(file_node))
             self.log.debug("Texture Path: {!r}".format(final_path))
 
-        self.add_data({"hashes": latest_hashes})
+        self.add_data({
+            "textureManifest": {
+                "root": package_path,
+                "files": manifest,
+            }
+        })
+
+    def get_latest_hashes(self):
+        """Return file hash and path of latest published textures
+
+        Returns:
+            dict: Hash value as key, published file path as value
+
+        """
+        path = [
+            avalon.api.Session["AVALON_PROJECT"],
+            avalon.api.Session["AVALON_ASSET"],
+            self.data["subset"],
+            -1,  # latest version
+            "TexturePack"
+        ]
+        representation = avalon.io.locate(path)
+        if representation is None:
+            # Never been published
+            return dict()
+
+        representation = avalon.io.find_one({"_id": representation},
+                                            projection={"data": True})
+        data = representation["data"]
+
+        if "textureManifest" not in data:
+            # Published before using manifest
+            return dict(data.get("hashes", {}))
+
+        root = data["textureManifest"]["root"]
+        return {hash_value: os.path.join(root, relative_path)
+                for relative_path, hash_value
+                in data["textureManifest"]["files"]}
@@ -56,14 +56,16 @@ class ValidateAttributeNiceName(pyblish.api.InstancePlugin):
     @classmethod
     def get_invalid(cls, instance):
         from maya import cmds
+        from reveries.maya.snapshot import get_snapshot
 
         if instance.context.data["mayaVersionAPI"] >= 20180300:
             return None
 
         invalid = dict()
+        snapshot = get_snapshot(instance)
 
         for node in instance:
-            for attr in cmds.listAttr(node, userDefined=True) or list():
+            for attr in snapshot.list_user_attributes(node):
                 nice = cmds.attributeQuery(attr, node=node, niceName=True)
 
                 # niceName can't have any whitespace if longer then 64 chars
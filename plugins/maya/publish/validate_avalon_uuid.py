@@ -1,6 +1,5 @@
 
 from collections import defaultdict
-from maya import cmds
 
 import pyblish.api
 
@@ -10,6 +9,7 @@ from reveries.maya import lib, pipeline
 from reveries.maya.utils import Identifier, get_id_status, set_avalon_uuid
 from reveries.plugins import RepairInstanceAction
 from reveries.maya.plugins import MayaSelectInvalidAction
+from reveries.maya.snapshot import get_snapshot
 
 
 class SelectMissing(MayaSelectInvalidAction):
@@ -128,13 +128,13 @@ class ValidateAvalonUUID(pyblish.api.InstancePlugin):
         family = instance.data["family"]
         required_types = pipeline.uuid_required_node_types(family)
 
-        lock_state = cmds.lockNode(instance, query=True, lock=True)
-        for node, lock in zip(instance, lock_state):
-            if lock:
+        snapshot = get_snapshot(instance)
+        for node in instance:
+            if snapshot.is_locked(node):
                 cls.log.debug("Skipping locked node: %s" % node)
                 continue
 
-            if cmds.nodeType(node) not in required_types:
+            if snapshot.node_type(node) not in required_types:
                 continue
 
             if node in group_nodes:
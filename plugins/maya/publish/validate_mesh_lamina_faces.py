@@ -22,11 +22,11 @@ class ValidateMeshLaminaFaces(pyblish.api.InstancePlugin):
 
     @classmethod
     def get_invalid(cls, instance):
-        from maya import cmds
+        from reveries.maya import lib
+        from reveries.maya.snapshot import get_snapshot
 
-        meshes = cmds.ls(instance, type="mesh", long=True)
-        invalid = [mesh for mesh in meshes if
-                   cmds.polyInfo(mesh, laminaFaces=True)]
+        meshes = get_snapshot(instance).ls(instance, type="mesh")
+        invalid = [mesh for mesh in meshes if lib.lamina_faces(mesh)]
 
         return invalid
 
@@ -29,24 +29,56 @@ class ValidateNoNameCollision(pyblish.api.InstancePlugin):
     def get_invalid(cls, context):
         from maya import cmds
 
-        invalid = list()
-
+        namespaces = context.data["loadedNamespace"]
+        # Compose the leaf node name without namespace and see if it
+        # exists. This ensure that when the namespace been removed,
+        # base name stays the same.
+        # For example, we have two nodes `foo:A|foo:B` and `foo:A|B`,
+        # and the namespace `foo` is going to be removed. The node
+        # `foo:A|B` is the invalid node and MUST rename since there
+        # will be two `A|B` node when the namespace is gone, and we
+        # don't wont it to be auto-renamed to `A|B1`.
+        renamed = set()
         for node in context.data["loadedNamespaceContent"]:
-            # Compose the leaf node name without namespace and see if it
-            # exists. This ensure that when the namespace been removed,
-            # base name stays the same.
-            # For example, we have two nodes `foo:A|foo:B` and `foo:A|B`,
-            # and the namespace `foo` is going to be removed. The node
-            # `foo:A|B` is the invalid node and MUST rename since there
-            # will be two `A|B` node when the namespace is gone, and we
-            # don't wont it to be auto-renamed to `A|B1`.
-            # (Note) This assumes the node has only one namespace depth,
-            # hierarchical namespace will not work right.
-            parts = node.rsplit("|", 1)
-            leaf = ":".join(parts.pop().split(":")[1:])
-            renamed = "|".join(parts + [leaf])
-
-            if cmds.objExists(renamed):
-                invalid.append(renamed)
-
-        return invalid
+            name = strip_namespace(node, namespaces)
+            if name is not None:
+                renamed.add(name)
+
+        # One scene snapshot instead of `cmds.objExists` per node
+        existing = set(cmds.ls(long=True))
+
+        return sorted(renamed & existing)
+
+
+def strip_namespace(node, namespaces):
+    """Return node's long name which leaf has no loaded namespace
+
+    The outermost namespace in `namespaces` that the leaf belongs to will
+    be removed, and the nested namespaces will be kept, just like what
+    `cmds.namespace(removeNamespace=ns, mergeNamespaceWithRoot=True)` does.
+
+    Args:
+        node (str): Node's long name
+        namespaces (iterable): Namespaces that are going to be removed
+
+    Returns:
+        str: Renamed long name, or `None` if leaf not in any namespace of
+            `namespaces`.
+
+    Example:
+        >>> strip_namespace("|foo:A|foo:bar:B", ["foo"])
+        '|foo:A|bar:B'
+
+    """
+    parts = node.rsplit("|", 1)
+    leaf = parts.pop()
+
+    matched = [ns for ns in (ns.strip(":") for ns in namespaces)
+               if leaf.startswith(ns + ":")]
+    if not matched:
+        return None
+
+    namespace = min(matched, key=len)
+    leaf = leaf[len(namespace) + 1:]
+
+    return "|".join(parts + [leaf])
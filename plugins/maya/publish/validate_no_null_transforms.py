@@ -4,6 +4,7 @@ import maya.cmds as cmds
 
 from reveries.plugins import RepairInstanceAction
 from reveries.maya.plugins import MayaSelectInvalidAction
+from reveries.maya.snapshot import get_snapshot
 
 
 class RepairInvalid(RepairInstanceAction):
@@ -11,27 +12,6 @@ class RepairInvalid(RepairInstanceAction):
     label = "Delete Empty/Null Transforms"
 
 
-def has_shape_children(node):
-    # Check if any descendants
-    allDescendents = cmds.listRelatives(node,
-                                        allDescendents=True,
-                                        fullPath=True)
-    if not allDescendents:
-        return False
-
-    # Check if there are any shapes at all
-    shapes = cmds.ls(allDescendents, shapes=True)
-    if not shapes:
-        return False
-
-    # Check if all descendent shapes are intermediateObjects;
-    # if so we consider this node a null node and return False.
-    if all(cmds.getAttr('{0}.intermediateObject'.format(x)) for x in shapes):
-        return False
-
-    return True
-
-
 class ValidateNoNullTransforms(pyblish.api.InstancePlugin):
     """Ensure no null transforms are in the scene.
 
@@ -58,12 +38,13 @@ class ValidateNoNullTransforms(pyblish.api.InstancePlugin):
     def get_invalid(cls, instance):
         """Return invalid transforms in instance"""
 
-        transforms = cmds.ls(instance, type='transform', long=True)
+        snapshot = get_snapshot(instance)
+        transforms = snapshot.ls(instance, type='transform')
+
+        has_shapes = snapshot.has_shape_descendents()
 
-        invalid = []
-        for transform in transforms:
-            if not has_shape_children(transform):
-                invalid.append(transform)
+        invalid = [transform for transform in transforms
+                   if not has_shapes[snapshot.index(transform)]]
 
         return invalid
 
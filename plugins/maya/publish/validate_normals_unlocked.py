@@ -2,7 +2,9 @@ from maya import cmds
 
 import pyblish.api
 from reveries.plugins import RepairInstanceAction
+from reveries.maya import lib
 from reveries.maya.plugins import MayaSelectInvalidAction
+from reveries.maya.snapshot import get_snapshot
 
 
 class SelectInvalid(MayaSelectInvalidAction):
@@ -37,15 +39,13 @@ class ValidateNormalsUnlocked(pyblish.api.Validator):
     @staticmethod
     def has_locked_normals(mesh):
         """Return whether a mesh node has locked normals"""
-        return any(cmds.polyNormalPerVertex("{}.vtxFace[*][*]".format(mesh),
-                                            query=True,
-                                            freezeNormal=True))
+        return lib.has_locked_normals(mesh)
 
     @classmethod
     def get_invalid(cls, instance):
         """Return the meshes with locked normals in instance"""
 
-        meshes = cmds.ls(instance, type="mesh", long=True)
+        meshes = get_snapshot(instance).ls(instance, type="mesh")
         return [mesh for mesh in meshes if cls.has_locked_normals(mesh)]
 
     def process(self, instance):
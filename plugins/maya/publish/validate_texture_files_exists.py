@@ -1,10 +1,14 @@
 
-import os
 import pyblish.api
 
 
 class ValidateTextureFilesExists(pyblish.api.InstancePlugin):
     """Ensure file exists
+
+    UDIM tiles and image sequences are expanded, at least one file of the
+    pattern must exist. Resolved files are stored as `textureFiles` in
+    instance data.
+
     """
 
     order = pyblish.api.ValidatorOrder
@@ -15,24 +19,35 @@ class ValidateTextureFilesExists(pyblish.api.InstancePlugin):
     ]
 
     @classmethod
-    def get_invalid(cls, instance):
-        from maya import cmds
+    def resolve_texture_files(cls, instance):
+        """Return (path, size, mtime) of each file node's texture files"""
+        from reveries.maya import lib
+        from reveries.utils import resolve_file_patterns
 
-        invalid = list()
+        patterns = {file_node: lib.get_file_node_pattern(file_node)
+                    for file_node in instance}
+        resolved = resolve_file_patterns(patterns.values())
 
-        for file_node in instance:
-            attr_name = file_node + ".fileTextureName"
-            img_path = cmds.getAttr(attr_name,
-                                    expandEnvironmentVariables=True)
+        return {file_node: resolved[pattern]
+                for file_node, pattern in patterns.items()}
 
-            if not os.path.isfile(img_path):
-                invalid.append(file_node)
+    @classmethod
+    def get_invalid(cls, instance, texture_files=None):
+        if texture_files is None:
+            texture_files = cls.resolve_texture_files(instance)
+
+        invalid = [file_node for file_node in instance
+                   if not texture_files[file_node]]
 
         return invalid
 
     def process(self, instance):
 
-        invalid = self.get_invalid(instance)
+        texture_files = self.resolve_texture_files(instance)
+        # For reuse
+        instance.data["textureFiles"] = texture_files
+
+        invalid = self.get_invalid(instance, texture_files)
 
         if invalid:
             self.log.error(
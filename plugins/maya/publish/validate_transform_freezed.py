@@ -2,10 +2,9 @@
 import pyblish.api
 from maya import cmds
 
-from reveries import lib
 from reveries.plugins import RepairInstanceAction
 from reveries.maya.plugins import MayaSelectInvalidAction
-from reveries.maya.lib import TRANSFORM_ATTRS
+from reveries.maya.snapshot import get_snapshot
 
 
 class SelectInvalid(MayaSelectInvalidAction):
@@ -54,37 +53,31 @@ class ValidateTranformFreezed(pyblish.api.InstancePlugin):
 
         """
 
-        invalid = list()
+        snapshot = get_snapshot(instance)
 
-        _identity = [1.0, 0.0, 0.0, 0.0,
-                     0.0, 1.0, 0.0, 0.0,
-                     0.0, 0.0, 1.0, 0.0,
-                     0.0, 0.0, 0.0, 1.0]
         _tolerance = 1e-30
 
         if instance.data["family"] == "reveries.model":
-            transforms = cmds.ls(instance, type="transform")
+            transforms = snapshot.ls(instance, type="transform")
         else:
-            goemetries = cmds.ls(instance, type=("mesh", "nurbsCurve"))
-            transforms = cmds.listRelatives(goemetries,
-                                            parent=True,
-                                            type="transform")
-
-        for transform in transforms:
-
-            matrix = cmds.xform(transform,
-                                query=True,
-                                matrix=True,
-                                objectSpace=True)
-
-            if not lib.matrix_equals(_identity, matrix, _tolerance):
-
-                # If it's transform is not keyable, should be fine to ignore
-                def is_keyable(attr):
-                    return cmds.getAttr(transform + "." + attr, keyable=True)
-
-                if any(is_keyable(attr) for attr in TRANSFORM_ATTRS):
-                    invalid.append(transform)
+            goemetries = snapshot.ls(instance, type=("mesh", "nurbsCurve"))
+            # Parent transforms that are not in instance are not collected
+            # in snapshot, add them.
+            orphans = [node for node in goemetries
+                       if snapshot.parent(node) is None]
+            if orphans:
+                snapshot.add(cmds.listRelatives(orphans,
+                                                parent=True,
+                                                fullPath=True) or [])
+            transforms = set(snapshot.parent(node) for node in goemetries)
+            transforms = snapshot.ls(sorted(transforms - {None}),
+                                     type="transform")
+
+        candidates = snapshot.ls_non_identity(transforms, _tolerance)
+
+        # If it's transform is not keyable, should be fine to ignore
+        invalid = [transform for transform in candidates
+                   if snapshot.is_transform_keyable(transform)]
 
         return invalid
 
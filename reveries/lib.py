@@ -51,3 +51,72 @@ def iter_uri(path, sep):
 
         path = split[0]
         yield path
+
+
+def find_lamina_faces(face_counts, face_vertices):
+    """Find faces which share all of their edges with another face
+
+    Each face is hashed by its sorted edge set, faces that have the same
+    edge set are lamina faces.
+
+    Args:
+        face_counts (list): Vertex count of each face
+        face_vertices (list): Flattened vertex indices of all faces
+
+    Returns:
+        list: Sorted lamina face indices
+
+    Example:
+        >>> find_lamina_faces([3, 3, 3], [0, 1, 2, 2, 1, 0, 1, 2, 3])
+        [0, 1]
+
+    """
+    first_face = dict()
+    lamina = set()
+
+    offset = 0
+    for face, count in enumerate(face_counts):
+        vertices = face_vertices[offset:offset + count]
+        offset += count
+
+        edges = tuple(sorted(
+            (a, b) if a < b else (b, a)
+            for a, b in zip(vertices, vertices[1:] + vertices[:1])
+        ))
+
+        other = first_face.setdefault(edges, face)
+        if other != face:
+            lamina.update((other, face))
+
+    return sorted(lamina)
+
+
+def find_non_identity(matrices, tolerance=1e-10):
+    """Find the matrices which are not identity matrix in a flat sequence
+
+    Rows that exactly equal to identity matrix are skipped by one sequence
+    compare, only the rest will be compared with tolerance.
+
+    Args:
+        matrices (list, array.array): Flattened matrices, 16 floats per row
+        tolerance (float): the precision of the differences
+
+    Returns:
+        list: Row indices of non-identity matrices
+
+    Example:
+        >>> find_non_identity(DEFAULT_MATRIX + [2.0] * 16 + DEFAULT_MATRIX)
+        [1]
+
+    """
+    identity = list(DEFAULT_MATRIX)
+    non_identity = list()
+
+    for row, start in enumerate(range(0, len(matrices), 16)):
+        matrix = list(matrices[start:start + 16])
+        if matrix == identity:
+            continue
+        if not matrix_equals(identity, matrix, tolerance):
+            non_identity.append(row)
+
+    return non_identity
@@ -14,6 +14,7 @@ from pyblish import api as pyblish
 from . import pipeline
 from .. import PLUGINS_DIR
 from ..utils import override_event
+from ..profiling import trace_from_environment
 
 self = sys.modules[__name__]
 self.installed = None
@@ -74,6 +75,9 @@ def install():  # pragma: no cover
 
     _override()
 
+    # Opt-in `maya.cmds` and `avalon.io` tracing, see `REVERIES_TRACE`
+    trace_from_environment()
+
     self.installed = True
 
 
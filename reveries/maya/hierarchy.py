@@ -10,6 +10,7 @@ from avalon.maya.pipeline import (
 )
 
 from ..plugins import message_box_error
+from ..lib import DEFAULT_MATRIX, matrix_equals
 
 from . import lib
 from . import capsule
@@ -213,7 +214,7 @@ def get_loader(loader_name, representation_id):
         return Loader
 
 
-def _attach_subset(slot, namespace, root, subset_group):
+def attach_subset(slot, namespace, root, subset_group):
     """Attach into the setdress hierarchy
     """
     # Namespace is missing from root node(s), add namespace
@@ -254,10 +255,10 @@ def add_subset(data, namespace, root, on_update=None):
     try:
 
         with capsule.namespaced(namespace, new=False) as namespace:
-            subset_group = _attach_subset(data["slot"],
-                                          namespace,
-                                          root,
-                                          subset_group)
+            subset_group = attach_subset(data["slot"],
+                                         namespace,
+                                         root,
+                                         subset_group)
             sub_container["subsetGroup"] = subset_group
 
             yield sub_container
@@ -329,13 +330,157 @@ def change_subset(container, data, namespace, root):
     try:
         # Update parenting and matrix
         with capsule.namespaced(namespace, new=False) as namespace:
-            subset_group = _attach_subset(data["slot"],
-                                          namespace,
-                                          root,
-                                          container["subsetGroup"])
+            subset_group = attach_subset(data["slot"],
+                                         namespace,
+                                         root,
+                                         container["subsetGroup"])
             container["subsetGroup"] = subset_group
 
             yield container
 
     finally:
         pass
+
+
+def _to_matrix(matrix):
+    """Return matrix as list, resolve `<default>` matrix"""
+    if matrix == "<default>":
+        return DEFAULT_MATRIX
+    return matrix
+
+
+def _is_matrix_changed(old, new):
+    if old is None or new is None:
+        return old is not new
+    return not matrix_equals(_to_matrix(old), _to_matrix(new))
+
+
+def diff_sub_matrix(sub_matrix_old, sub_matrix_new):
+    """Compare two `subMatrix` data and return changed transform addresses
+
+    The address "GROUP" represents the subset group node of the container,
+    any other address is the `AvalonID` of a transform node.
+
+    Args:
+        sub_matrix_old (dict): Previous `subMatrix` of a setdress member
+        sub_matrix_new (dict): Current `subMatrix` of a setdress member
+
+    Returns:
+        dict: Container id path as key, set of changed addresses as value.
+            Only container id path which has any change will be included.
+
+    """
+    changes = dict()
+
+    for id_path, new in sub_matrix_new.items():
+        old = sub_matrix_old.get(id_path, {})
+        changed = set()
+
+        for address, matrix in new.items():
+            if address == "GROUP":
+                # {name: matrix}
+                group_old = old.get(address, {})
+                if (set(group_old) != set(matrix) or
+                        any(_is_matrix_changed(group_old[name], matrix[name])
+                            for name in matrix)):
+                    changed.add(address)
+
+            elif _is_matrix_changed(old.get(address), matrix):
+                changed.add(address)
+
+        for address in old:
+            if address not in new:
+                # Transform removed or matrix reset to default (GROUP)
+                changed.add(address)
+
+        if changed:
+            changes[id_path] = changed
+
+    return changes
+
+
+def diff_member(data_old, data_new):
+    """Compare two setdress member data
+
+    Args:
+        data_old (dict): Previous member data
+        data_new (dict): Current member data
+
+    Returns:
+        dict: Changes of the member, all entries are falsy if nothing changed.
+            {
+                "loader": bool,
+                "representation": bool,
+                "hierarchy": bool,
+                "slot": bool,
+                "matrix": bool,
+                "subMatrix": {id_path: set(addresses)},
+            }
+
+    """
+    return {
+        "loader": data_old["loader"] != data_new["loader"],
+        "representation": (data_old["representation"] !=
+                           data_new["representation"]),
+        "hierarchy": data_old["hierarchy"] != data_new["hierarchy"],
+        "slot": data_old["slot"] != data_new["slot"],
+        "matrix": _is_matrix_changed(data_old["matrix"], data_new["matrix"]),
+        "subMatrix": diff_sub_matrix(data_old["subMatrix"],
+                                     data_new["subMatrix"]),
+    }
+
+
+def diff_members(members_old, members_new):
+    """Compute the difference between two setdress members data
+
+    Members are matched by their namespace, which is unique within one
+    setdress package.
+
+    This can be used to preview what will be changed in scene inventory, or
+    to update only the members that actually changed.
+
+    Args:
+        members_old (list): Previous members data (loaded `members.json`)
+        members_new (list): Current members data (loaded `members.json`)
+
+    Returns:
+        dict: {
+            "added": [data_new, ...],
+            "removed": [data_old, ...],
+            "changed": [(data_old, data_new, changes), ...],
+            "unchanged": [(data_old, data_new), ...],
+        }
+
+        Where `changes` is the dict returned from `diff_member`.
+
+    """
+    result = {
+        "added": list(),
+        "removed": list(),
+        "changed": list(),
+        "unchanged": list(),
+    }
+
+    old_by_namespace = {data["namespace"]: data for data in members_old}
+    new_namespaces = set()
+
+    for data_new in members_new:
+        namespace = data_new["namespace"]
+        new_namespaces.add(namespace)
+
+        data_old = old_by_namespace.get(namespace)
+        if data_old is None:
+            result["added"].append(data_new)
+            continue
+
+        changes = diff_member(data_old, data_new)
+        if any(changes.values()):
+            result["changed"].append((data_old, data_new, changes))
+        else:
+            result["unchanged"].append((data_old, data_new))
+
+    for data_old in members_old:
+        if data_old["namespace"] not in new_namespaces:
+            result["removed"].append(data_old)
+
+    return result
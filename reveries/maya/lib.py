@@ -1,4 +1,5 @@
 
+import os
 import logging
 
 from maya import cmds
@@ -6,7 +7,6 @@ from maya.api import OpenMaya as om
 
 from .. import utils, lib
 from ..vendor.six import string_types
-from .vendor import capture
 
 
 log = logging.getLogger(__name__)
@@ -485,6 +485,37 @@ def hasAttr(node, attr):
     return cmds.objExists(node + "." + attr)
 
 
+def get_file_node_pattern(file_node):
+    """Return file node's texture file path, or pattern if it's tiled
+
+    If the file node is using UV tiling mode or frame extension, the path
+    pattern with tile and frame tokens (i.e. `<UDIM>`, `<f>`) will be
+    returned, which can be expanded by `reveries.utils.resolve_file_patterns`.
+    Environment variables will be expanded.
+
+    Arguments:
+        file_node (str): Name of file node
+
+    Returns:
+        str: Texture file path or pattern
+
+    """
+    path = cmds.getAttr(file_node + ".fileTextureName",
+                        expandEnvironmentVariables=True)
+
+    tiled = (hasAttr(file_node, "uvTilingMode") and
+             cmds.getAttr(file_node + ".uvTilingMode"))
+    sequence = cmds.getAttr(file_node + ".useFrameExtension")
+
+    if ((tiled or sequence) and
+            hasAttr(file_node, "computedFileTextureNamePattern")):
+        pattern = cmds.getAttr(file_node + ".computedFileTextureNamePattern")
+        if pattern:
+            path = os.path.expandvars(pattern)
+
+    return path
+
+
 def lsAttr(attr, value=None, namespace=None):
     """Return nodes matching `key` and `value`
 
@@ -558,7 +589,7 @@ def lsAttrs(attrs, namespace=None):
     dag_fn = om.MFnDagNode()
     selection_list = om.MSelectionList()
 
-    first_attr = attrs.iterkeys().next()
+    first_attr = next(iter(attrs))
 
     try:
         selection_list.add("{0}*.{1}".format(namespace, first_attr),
@@ -592,6 +623,92 @@ def lsAttrs(attrs, namespace=None):
     return list(matches)
 
 
+def ls_matrices(nodes, attr=AVALON_ID_ATTR_LONG):
+    """Return nodes' local matrix and string attribute value in one pass
+
+    This is a faster alternative of calling `cmds.xform` and `cmds.getAttr`
+    for each node, by reading `matrix` plug and the attribute plug through
+    OpenMaya.
+
+    Arguments:
+        nodes (list): A list of transform node names
+        attr (str, optional): Name of string attribute to read along with,
+            default `AvalonID`.
+
+    Returns:
+        list: A list of (node, matrix, value) tuples in the order of input
+            nodes. The `matrix` is a flat list of 16 floats which is the same
+            as `cmds.xform(query=True, matrix=True, objectSpace=True)`, the
+            `value` is `None` if attribute not exists.
+
+    """
+    selection_list = om.MSelectionList()
+    fn_node = om.MFnDependencyNode()
+    fn_matrix = om.MFnMatrixData()
+
+    result = list()
+    for node in nodes:
+        # (NOTE) Resolve one by one, `MSelectionList` merges duplicated
+        #   items which may break the order.
+        selection_list.clear()
+        selection_list.add(node)
+        fn_node.setObject(selection_list.getDependNode(0))
+
+        plug = fn_node.findPlug("matrix", True)
+        matrix = list(fn_matrix.setObject(plug.asMObject()).matrix())
+
+        try:
+            value = fn_node.findPlug(attr, True).asString()
+        except RuntimeError:
+            value = None
+
+        result.append((node, matrix, value))
+
+    return result
+
+
+def _get_mfn_mesh(mesh):
+    selection_list = om.MSelectionList()
+    selection_list.add(mesh)
+    return om.MFnMesh(selection_list.getDagPath(0))
+
+
+def lamina_faces(mesh):
+    """Return lamina face indices of the mesh
+
+    Same result as `cmds.polyInfo(mesh, laminaFaces=True)` but reading the
+    face-vertex connectivity through `MFnMesh` in one call.
+
+    Arguments:
+        mesh (str): Mesh node name
+
+    Returns:
+        list: Sorted lamina face indices
+
+    """
+    face_counts, face_vertices = _get_mfn_mesh(mesh).getVertices()
+    return lib.find_lamina_faces(list(face_counts), list(face_vertices))
+
+
+def has_locked_normals(mesh):
+    """Return True if any face-vertex normal of the mesh is locked
+
+    Same result as querying `freezeNormal` on all `vtxFace` components with
+    `cmds.polyNormalPerVertex`, but without expanding component list. Each
+    normal that being used by face-vertices will be checked only once.
+
+    Arguments:
+        mesh (str): Mesh node name
+
+    Returns:
+        bool
+
+    """
+    fn_mesh = _get_mfn_mesh(mesh)
+    _, normal_ids = fn_mesh.getNormalIds()
+    return any(fn_mesh.isNormalLocked(i) for i in set(normal_ids))
+
+
 def ls_duplicated_name(nodes, rename=False):
     """Genreate a node name duplication report dict
 
@@ -732,6 +849,8 @@ def parse_active_camera():
         str: Name of camera
 
     """
+    from .vendor import capture
+
     panel = capture.parse_active_panel()
     camera = cmds.modelPanel(panel, query=True, camera=True)
 
@@ -1,6 +1,5 @@
 
 import os
-import json
 
 import avalon.api
 import avalon.io
@@ -11,7 +10,11 @@ from .utils import (
     generate_container_id,
 )
 
-from ..utils import get_representation_path_
+from ..utils import (
+    get_representation_path_,
+    load_members,
+    MembersReader,
+)
 
 from ..plugins import (
     PackageLoader,
@@ -32,10 +35,15 @@ from .hierarchy import (
     get_representation,
     get_loader,
     add_subset,
+    attach_subset,
     change_subset,
     get_referenced_containers,
+    diff_member,
+    diff_members,
 )
 
+from .capsule import namespaced
+
 
 REPRS_PLUGIN_MAPPING = {
     "Alembic": "AbcImport.mll",
@@ -377,13 +385,57 @@ class ImportLoader(MayaBaseLoader):
         return True
 
 
+def _members_data_path(entry_path):
+    """Return members data file path of the setdress package
+
+    Packages published before line-delimited members data was introduced
+    only have `.json` members file.
+
+    """
+    entry_path = os.path.expandvars(entry_path)
+    members_path = entry_path.replace(".abc", ".jsonl")
+    if not os.path.isfile(members_path):
+        members_path = entry_path.replace(".abc", ".json")
+
+    return members_path
+
+
 def _parse_members_data(entry_path):
-    # Load members data
-    members_path = entry_path.replace(".abc", ".json")
-    with open(os.path.expandvars(members_path), "r") as fp:
-        members = json.load(fp)
+    """Load members data
+
+    Arguments:
+        entry_path (str): Setdress package entry file path
+
+    """
+    return load_members(_members_data_path(entry_path))
+
 
-    return members
+def _filter_members_data(entry_path, container_ids):
+    """Load members data of given container ids only
+
+    Arguments:
+        entry_path (str): Setdress package entry file path
+        container_ids (list): Container ids of members to load
+
+    Returns:
+        tuple: List of members data, and list of the container ids that
+            in package but not given
+
+    """
+    members_path = _members_data_path(entry_path)
+    container_ids = set(container_ids)
+
+    if members_path.endswith(".json"):
+        members = load_members(members_path)
+        return ([data for data in members
+                 if data["containerId"] in container_ids],
+                [data["containerId"] for data in members
+                 if data["containerId"] not in container_ids])
+
+    with MembersReader(members_path) as reader:
+        all_ids = reader.container_ids()
+        return ([reader.get(id_) for id_ in all_ids if id_ in container_ids],
+                [id_ for id_ in all_ids if id_ not in container_ids])
 
 
 class HierarchicalLoader(MayaBaseLoader):
@@ -405,8 +457,23 @@ class HierarchicalLoader(MayaBaseLoader):
         """To be implemented by subclass"""
         raise NotImplementedError("Must be implemented by subclass")
 
-    def update_variation(self, data_new, data_old, container, force=False):
-        """To be implemented by subclass"""
+    def update_variation(self,
+                         data_new,
+                         data_old,
+                         container,
+                         force=False,
+                         changes=None):
+        """To be implemented by subclass
+
+        Arguments:
+            data_new (dict): Current member data
+            data_old (dict): Previous member data
+            container (dict): Member's container
+            force (bool, optional): Discard local overrides
+            changes (dict, optional): Changes computed by `diff_member`,
+                only changed matrices will be updated if provided.
+
+        """
         raise NotImplementedError("Must be implemented by subclass")
 
     def load(self, context, name=None, namespace=None, options=None):
@@ -420,23 +487,18 @@ class HierarchicalLoader(MayaBaseLoader):
         representation = context["representation"]
         entry_path = self.file_path(representation)
 
-        # Load members data
-        members = _parse_members_data(entry_path)
-
         if "containerId" in options:
             container_id = options["containerId"]
             hierarchy = options["hierarchy"]
 
-            _members = list()
-            for data in members:
-                try:
-                    sub_hierarchy = hierarchy[data["containerId"]]
-                except KeyError:
-                    self.log.warning("Asset possibly been removed in parent "
-                                     "asset. Container ID: %s",
-                                     data["containerId"])
-                    continue
+            # Load members data, only those in hierarchy
+            members, removed = _filter_members_data(entry_path, hierarchy)
+            for id_ in removed:
+                self.log.warning("Asset possibly been removed in parent "
+                                 "asset. Container ID: %s", id_)
 
+            for data in members:
+                sub_hierarchy = hierarchy[data["containerId"]]
                 child_ident, member_data = sub_hierarchy.popitem()
 
                 child_ident = child_ident.split("|")
@@ -444,12 +506,10 @@ class HierarchicalLoader(MayaBaseLoader):
                 data["namespace"] = child_ident[1]
                 data["hierarchy"] = member_data
 
-                _members.append(data)
-
-            members = _members
-
         else:
             container_id = generate_container_id()
+            # Load members data
+            members = _parse_members_data(entry_path)
 
         asset_name = asset["data"].get("shortName", asset["name"])
         family_name = context["version"]["data"]["families"][0].split(".")[-1]
@@ -523,6 +583,24 @@ class HierarchicalLoader(MayaBaseLoader):
 
         members = _parse_members_data(entry_path)
 
+        # Compute members' difference, so that only changed members will
+        # be touched.
+        diff = diff_members(self._members_data_from_container(container),
+                            members)
+        if force_update:
+            # Re-apply all members
+            for data_old, data_new in diff["unchanged"]:
+                changes = diff_member(data_old, data_new)
+                diff["changed"].append((data_old, data_new, changes))
+            diff["unchanged"] = list()
+
+        self.log.info("Members: %d added, %d removed, %d changed, "
+                      "%d unchanged.",
+                      len(diff["added"]),
+                      len(diff["removed"]),
+                      len(diff["changed"]),
+                      len(diff["unchanged"]))
+
         #
         # Start updating
 
@@ -537,71 +615,79 @@ class HierarchicalLoader(MayaBaseLoader):
 
         update_id_on_import(hierarchy)
 
-        # Get current members data
-        current_members = dict()
-        new_namespaces = set(data_new["namespace"] for data_new in members)
-
-        for data_old in self._members_data_from_container(container):
-            namespace_old = data_old["namespace"]
-
-            if namespace_old not in new_namespaces:
-                # Remove
-                avalon.api.remove(current_subcons.pop(namespace_old))
-            else:
-                current_members[namespace_old] = data_old
+        for data_old in diff["removed"]:
+            # Remove
+            avalon.api.remove(current_subcons.pop(data_old["namespace"]))
 
         # Update sub-subsets
         namespace = container["namespace"]
         group_name = self.group_name(namespace, container["name"])
 
-        add_list = []
-        for data_new in members:
-
-            repr_id = data_new["representation"]
-            data_new["representationDoc"] = get_representation(repr_id)
-            data_new["loaderCls"] = get_loader(data_new["loader"], repr_id)
-
-            sub_ns = data_new["namespace"]
-
-            if sub_ns in current_members:
-                sub_container = current_subcons[sub_ns]
-                data_old = current_members[sub_ns]
-
-                is_repr_diff = (data_old["representation"] !=
-                                data_new["representation"])
-                has_override = (data_old["representation"] !=
-                                sub_container["representation"])
-
-                if sub_container["loader"] == data_new["loader"]:
-
-                    if is_repr_diff and has_override and not force_update:
-                        self.log.warning("Your scene had local representation "
-                                         "overrides within the set. New "
-                                         "representations not loaded for %s.",
-                                         sub_container["namespace"])
-
-                    else:
-                        # Update
-                        root = group_name
-                        with change_subset(sub_container,
-                                           data_new,
-                                           namespace,
-                                           root) as sub_container:
-
-                            self.update_variation(data_new=data_new,
-                                                  data_old=data_old,
-                                                  container=sub_container,
-                                                  force=force_update)
-                else:
-                    # Update
-                    # But Loaders are different, remove first, add later
-                    avalon.api.remove(sub_container)
-                    add_list.append(data_new)
-
-            else:
+        add_list = list(diff["added"])
+        for data_old, data_new, changes in diff["changed"]:
+
+            sub_container = current_subcons[data_new["namespace"]]
+
+            if (sub_container["loader"] != data_new["loader"] or
+                    changes["loader"]):
+                # Update
+                # But Loaders are different, remove first, add later
+                avalon.api.remove(sub_container)
                 add_list.append(data_new)
+                continue
+
+            has_override = (data_old["representation"] !=
+                            sub_container["representation"])
+
+            if (changes["representation"] or changes["hierarchy"] or
+                    force_update):
+
+                if (changes["representation"] and has_override and
+                        not force_update):
+                    self.log.warning("Your scene had local representation "
+                                     "overrides within the set. New "
+                                     "representations not loaded for %s.",
+                                     sub_container["namespace"])
+                    continue
+
+                repr_id = data_new["representation"]
+                data_new["representationDoc"] = get_representation(repr_id)
+                data_new["loaderCls"] = get_loader(data_new["loader"],
+                                                   repr_id)
+                # Update
+                root = group_name
+                with change_subset(sub_container,
+                                   data_new,
+                                   namespace,
+                                   root) as sub_container:
+
+                    self.update_variation(data_new=data_new,
+                                          data_old=data_old,
+                                          container=sub_container,
+                                          force=force_update)
+                continue
+
+            # Only slot or matrix changed, no need to reload
+            if changes["slot"]:
+                with namespaced(namespace, new=False) as namespace_:
+                    subset_group = attach_subset(data_new["slot"],
+                                                 namespace_,
+                                                 group_name,
+                                                 sub_container["subsetGroup"])
+                    sub_container["subsetGroup"] = subset_group
+
+            if changes["matrix"] or changes["subMatrix"]:
+                with namespaced(namespace, new=False):
+                    self.update_variation(data_new=data_new,
+                                          data_old=data_old,
+                                          container=sub_container,
+                                          changes=changes)
 
         for data in add_list:
+            repr_id = data["representation"]
+            data["representationDoc"] = get_representation(repr_id)
+            data["loaderCls"] = get_loader(data["loader"], repr_id)
+
             # Add
             root = group_name
             on_update = container
@@ -610,11 +696,15 @@ class HierarchicalLoader(MayaBaseLoader):
                 self.apply_variation(data=data,
                                      container=sub_container)
 
-        # TODO: Add all new nodes in the reference to the container
-        #   Currently new nodes in an updated reference are not added to the
-        #   container whereas actually they should be!
+        # Add new nodes in the reference to the container
         nodes = cmds.referenceQuery(reference_node, nodes=True, dagPath=True)
-        cmds.sets(nodes, forceElement=container["objectName"])
+        members = set(cmds.ls(cmds.sets(container["objectName"],
+                                        query=True) or [],
+                              long=True))
+        new_nodes = [node for node in cmds.ls(nodes, long=True)
+                     if node not in members]
+        if new_nodes:
+            cmds.sets(new_nodes, forceElement=container["objectName"])
 
         # Update container
         version, subset, asset, _ = parents
@@ -0,0 +1,400 @@
+
+import logging
+from array import array
+
+from maya import cmds
+from maya.api import OpenMaya as om
+
+from ..lib import DEFAULT_MATRIX, find_non_identity
+from ..vendor.six import string_types
+from .lib import TRANSFORM_ATTRS
+
+
+log = logging.getLogger(__name__)
+
+
+_MATRIX_SIZE = 16
+_UNKNOWN = -1
+
+
+class SceneSnapshot(object):
+    """A read-only table of DG/DAG node states for validation
+
+    Node states are collected once through OpenMaya and stored in flat,
+    array-backed tables keyed by node index, so validators could read them
+    without re-querying the DG for every node.
+
+    DAG nodes are stored by their full path name, and the descendents of
+    every added DAG node are added as well, so parent/children/shapes table
+    of the snapshot is closed.
+
+    Tables (all indexed by node index):
+        names (list): Full path name of DAG node, or name of DG node
+        types (list): Node type name, same as `cmds.nodeType`
+        parents (array): Parent node index, -1 if not in snapshot or DG node
+        children (list): List of children node indices
+        shapes (list): List of children shape node indices
+        is_dag (array): 1 if DAG node
+        is_shape (array): 1 if shape node
+        intermediate (array): 1 if node is an intermediate object
+        locked (array): 1 if node is locked
+        matrices (array): Local matrix, 16 floats per node, identity matrix
+            if the node is not a transform
+        keyable (array): 1 if any of `TRANSFORM_ATTRS` is keyable, 0 if
+            none of them or not a transform. This is resolved on demand by
+            `is_transform_keyable`, -1 if not yet resolved.
+        user_attrs (list): List of user-defined attribute long names
+
+    (NOTE) This is a snapshot, it will not reflect any change made to the
+        scene after it has been taken.
+
+    """
+
+    def __init__(self, nodes=None):
+        self.names = list()
+        self.types = list()
+        self.parents = array("l")
+        self.children = list()
+        self.shapes = list()
+        self.is_dag = array("b")
+        self.is_shape = array("b")
+        self.intermediate = array("b")
+        self.locked = array("b")
+        self.matrices = array("d")
+        self.keyable = array("b")
+        self.user_attrs = list()
+
+        self._index = dict()
+        self._parent_names = list()
+        self._derived_types = dict()
+        self._shape_descendents = None
+        self._non_identity = dict()  # tolerance: (evaluated count, indices)
+
+        if nodes:
+            self.add(nodes)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, node):
+        return self.index(node) is not None
+
+    def add(self, nodes):
+        """Add nodes and their DAG descendents into snapshot
+
+        Nodes that already in snapshot will be skipped.
+
+        Args:
+            nodes (list): A list of node names
+
+        """
+        selection_list = om.MSelectionList()
+        fn_node = om.MFnDependencyNode()
+        fn_dag = om.MFnDagNode()
+
+        added = list()
+
+        for node in nodes:
+            if node in self._index:
+                continue
+
+            selection_list.clear()
+            try:
+                selection_list.add(node)
+            except RuntimeError:
+                log.debug("Node not exists: %s" % node)
+                continue
+
+            try:
+                dag_path = selection_list.getDagPath(0)
+            except TypeError:
+                mobject = selection_list.getDependNode(0)
+                fn_node.setObject(mobject)
+                name = fn_node.name()
+                if name not in self._index:
+                    added.append(self._add_node(name, fn_node))
+                self._index[node] = self._index[name]
+                continue
+
+            name = dag_path.fullPathName()
+            if name not in self._index:
+                added += self._add_dag_hierarchy(dag_path, fn_node, fn_dag)
+            self._index[node] = self._index[name]
+
+        if added:
+            self._link()
+            self._shape_descendents = None
+
+    def _add_node(self, name, fn_node, dag_path=None, fn_dag=None):
+        index = len(self.names)
+        mobject = fn_node.object()
+
+        self.names.append(name)
+        self.types.append(fn_node.typeName)
+        self.parents.append(-1)
+        self.children.append(list())
+        self.shapes.append(list())
+        self.locked.append(fn_node.isLocked)
+        self.user_attrs.append(self._user_attributes(fn_node))
+
+        is_dag = dag_path is not None
+        self.is_dag.append(is_dag)
+        self.is_shape.append(is_dag and mobject.hasFn(om.MFn.kShape))
+
+        intermediate = False
+        if is_dag:
+            fn_dag.setObject(dag_path)
+            plug = fn_dag.findPlug("intermediateObject", True)
+            intermediate = plug.asBool()
+
+            parent = om.MDagPath(dag_path)
+            parent.pop()
+            parent_name = parent.fullPathName() if parent.length() else None
+        else:
+            parent_name = None
+
+        self.intermediate.append(intermediate)
+        self._parent_names.append(parent_name)
+
+        if mobject.hasFn(om.MFn.kTransform):
+            plug = fn_node.findPlug("matrix", True)
+            data = om.MFnMatrixData(plug.asMObject())
+            self.matrices.extend(data.matrix())
+            self.keyable.append(_UNKNOWN)
+        else:
+            self.matrices.extend(DEFAULT_MATRIX)
+            self.keyable.append(False)
+
+        self._index[name] = index
+
+        return index
+
+    def _add_dag_hierarchy(self, dag_path, fn_node, fn_dag):
+        added = list()
+        queue = [dag_path]
+
+        while queue:
+            path = queue.pop()
+            name = path.fullPathName()
+            if name in self._index:
+                continue
+
+            fn_node.setObject(path.node())
+            added.append(self._add_node(name, fn_node, path, fn_dag))
+
+            for i in range(path.childCount()):
+                child = om.MDagPath(path)
+                child.push(path.child(i))
+                queue.append(child)
+
+        return added
+
+    def _link(self):
+        """Resolve parent/children relationship by index"""
+        # Previously added root nodes may also have their parent added
+        orphans = [index for index, parent in enumerate(self.parents)
+                   if parent == -1 and self._parent_names[index]]
+        for index in orphans:
+            parent = self._index.get(self._parent_names[index])
+            if parent is None:
+                continue
+
+            self.parents[index] = parent
+            self.children[parent].append(index)
+            if self.is_shape[index]:
+                self.shapes[parent].append(index)
+
+    def _user_attributes(self, fn_node):
+        attrs = list()
+        for i in range(fn_node.attributeCount()):
+            attr = fn_node.attribute(i)
+            if (fn_node.attributeClass(attr) ==
+                    om.MFnDependencyNode.kLocalDynamicAttr):
+                attrs.append(om.MFnAttribute(attr).name)
+        return attrs
+
+    def index(self, node):
+        """Return node index in snapshot, `None` if not in snapshot"""
+        try:
+            return self._index[node]
+        except KeyError:
+            pass
+
+        long_names = cmds.ls(node, long=True)
+        if len(long_names) == 1:
+            return self._index.get(long_names[0])
+
+    def ls(self, nodes=None, type=None):
+        """Return full path names of nodes that in snapshot
+
+        Args:
+            nodes (list, optional): Node names to filter, list all nodes
+                in snapshot if not provided.
+            type (str or tuple, optional): Node type(s), including all
+                derived types, like `cmds.ls(type=...)`
+
+        Returns:
+            list
+
+        """
+        if nodes is None:
+            indices = range(len(self.names))
+        else:
+            indices = (self.index(node) for node in nodes)
+
+        if type is None:
+            return [self.names[i] for i in indices if i is not None]
+
+        types = self.derived_types(type)
+        return [self.names[i] for i in indices
+                if i is not None and self.types[i] in types]
+
+    def derived_types(self, type):
+        """Return a set of type names which derived from given type(s)"""
+        types = (type,) if isinstance(type, string_types) else tuple(type)
+        try:
+            return self._derived_types[types]
+        except KeyError:
+            pass
+
+        derived = set()
+        for type_name in types:
+            derived.add(type_name)
+            derived.update(cmds.nodeType(type_name,
+                                         derived=True,
+                                         isTypeName=True) or [])
+
+        self._derived_types[types] = derived
+        return derived
+
+    def node_type(self, node):
+        return self.types[self._index[node]]
+
+    def parent(self, node):
+        parent = self.parents[self._index[node]]
+        return None if parent == -1 else self.names[parent]
+
+    def list_children(self, node, shapes=False):
+        index = self._index[node]
+        indices = self.shapes[index] if shapes else self.children[index]
+        return [self.names[i] for i in indices]
+
+    def is_intermediate(self, node):
+        return bool(self.intermediate[self._index[node]])
+
+    def is_locked(self, node):
+        return bool(self.locked[self._index[node]])
+
+    def matrix(self, node):
+        start = self._index[node] * _MATRIX_SIZE
+        return list(self.matrices[start:start + _MATRIX_SIZE])
+
+    def is_transform_keyable(self, node):
+        """Return True if any of `TRANSFORM_ATTRS` is keyable
+
+        Plugs are queried on first call and the result is cached.
+
+        """
+        index = self._index[node]
+        keyable = self.keyable[index]
+
+        if keyable == _UNKNOWN:
+            selection_list = om.MSelectionList()
+            selection_list.add(self.names[index])
+            fn_node = om.MFnDependencyNode(selection_list.getDependNode(0))
+
+            keyable = any(fn_node.findPlug(attr, True).isKeyable
+                          for attr in TRANSFORM_ATTRS)
+            self.keyable[index] = keyable
+
+        return bool(keyable)
+
+    def has_shape_descendents(self):
+        """Return flags of whether node has non-intermediate shape descendent
+
+        All nodes are evaluated bottom-up in one pass, from the deepest level
+        of the DAG to the top, each node passes its state to the parent. The
+        result is cached until new nodes being added.
+
+        Returns:
+            array: 1 if the node has any non-intermediate shape descendent,
+                indexed by node index
+
+        """
+        if self._shape_descendents is not None:
+            return self._shape_descendents
+
+        levels = list()
+        for index, name in enumerate(self.names):
+            if not self.is_dag[index]:
+                continue
+            depth = name.count("|")
+            while len(levels) <= depth:
+                levels.append(list())
+            levels[depth].append(index)
+
+        flags = array("b", [0] * len(self.names))
+
+        for level in reversed(levels):
+            for index in level:
+                parent = self.parents[index]
+                if parent == -1:
+                    continue
+                if flags[index] or (self.is_shape[index] and
+                                    not self.intermediate[index]):
+                    flags[parent] = 1
+
+        self._shape_descendents = flags
+        return flags
+
+    def ls_non_identity(self, nodes, tolerance=1e-10):
+        """Return nodes which local matrix is not identity matrix
+
+        All local matrices in snapshot are evaluated in one pass, and input
+        nodes are filtered by the result. The result is cached per tolerance,
+        only nodes added afterward will be evaluated on next call.
+
+        Args:
+            nodes (list): Node names
+            tolerance (float, optional): Matrix compare tolerance
+
+        Returns:
+            list: Full path names in the order of input nodes
+
+        """
+        evaluated, non_identity = self._non_identity.get(tolerance,
+                                                         (0, set()))
+        if evaluated < len(self.names):
+            matrices = self.matrices[evaluated * _MATRIX_SIZE:]
+            non_identity.update(evaluated + row for row in
+                                find_non_identity(matrices, tolerance))
+            self._non_identity[tolerance] = (len(self.names), non_identity)
+
+        indices = (self.index(node) for node in nodes)
+        return [self.names[i] for i in indices if i in non_identity]
+
+    def list_user_attributes(self, node):
+        return list(self.user_attrs[self._index[node]])
+
+
+def get_snapshot(instance):
+    """Get scene snapshot from publish context and ensure instance included
+
+    If the snapshot has not been collected, a new one will be created and
+    stored into context.
+
+    Args:
+        instance (pyblish.api.Instance): Publish instance
+
+    Returns:
+        SceneSnapshot
+
+    """
+    context = instance.context
+    snapshot = context.data.get("sceneSnapshot")
+    if snapshot is None:
+        snapshot = context.data["sceneSnapshot"] = SceneSnapshot()
+
+    snapshot.add(instance)
+
+    return snapshot
@@ -125,11 +125,15 @@ class App(QtWidgets.QWidget):
         )
         self._callbacks.append(callback)
 
+        # Keep scene index up to date
+        commands.scene_index.install_callbacks()
+
     def closeEvent(self, event):
 
         # Delete callbacks
         for callback in self._callbacks:
             om.MMessage.removeCallback(callback)
+        commands.scene_index.uninstall_callbacks()
 
         return super(App, self).closeEvent(event)
 
@@ -4,6 +4,7 @@ import json
 import os
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 
 from avalon import io, api
 from avalon.maya.pipeline import AVALON_CONTAINER_ID
@@ -125,11 +126,278 @@ def get_all_asset_nodes():
     return nodes
 
 
-_cached_containerized_nodes = dict()
 _interface = (lambda con: get_interface_from_container(con))
 _asset_id = (lambda con: cmds.getAttr(_interface(con) + ".assetId"))
 
 
+def _ls_id_attributed(nodes):
+    """Return long names of nodes which have `AvalonID` attribute"""
+    selection_list = om.MSelectionList()
+    fn_node = om.MFnDependencyNode()
+    fn_dag = om.MFnDagNode()
+
+    attributed = list()
+    for node in nodes:
+        try:
+            selection_list.add(node)
+        except RuntimeError:
+            # Not a node, e.g. component or placeHolderList
+            continue
+
+    for i in range(selection_list.length()):
+        mobj = selection_list.getDependNode(i)
+        if not fn_node.setObject(mobj).hasAttribute(lib.AVALON_ID_ATTR_LONG):
+            continue
+
+        if mobj.hasFn(om.MFn.kDagNode):
+            attributed += [path.fullPathName()
+                           for path in fn_dag.setObject(mobj).getAllPaths()]
+        else:
+            attributed.append(fn_node.name())
+
+    return attributed
+
+
+class SceneIndex(object):
+    """Index of loaded assets and looks in current scene for Look Manager
+
+    The index is refreshed lazily on query. Scene callbacks only flag the
+    index as dirty, and on refresh, only containers that are new to the
+    index or have been updated will be parsed, removed containers will be
+    dropped. If any DAG node has been renamed or reparented, members of all
+    containers will be collected again.
+
+    Without callbacks, scene changes could not be tracked, `update` will
+    rebuild the entire index.
+
+    Index:
+        node -> asset id
+        node -> namespace
+        asset id -> loaded looks
+
+    """
+
+    def __init__(self):
+        self._callbacks = list()
+        self._container_callbacks = dict()
+        self.reset()
+
+    def reset(self, *args):
+        """Drop everything, index will be rebuilt on next query"""
+        if self._container_callbacks:
+            om.MMessage.removeCallbacks(
+                list(self._container_callbacks.values()))
+        self._container_callbacks = dict()
+        self._containers = dict()  # container: (asset id, nodes)
+        self._looks = dict()  # container: look
+        self._node_asset = dict()
+        self._node_namespace = dict()
+        self._outdated = set()
+        self._renamed = False
+        self._dirty = True
+
+    def mark_dirty(self, *args):
+        """Flag for checking new or removed containers on next query"""
+        self._dirty = True
+
+    def mark_renamed(self, *args):
+        """Flag for collecting members of all containers on next query"""
+        self._renamed = True
+        self._dirty = True
+
+    def _on_container_changed(self, message, plug, *args):
+        """Flag container to be parsed again if it has been updated"""
+        if (message & om.MNodeMessage.kAttributeSet and
+                plug.partialName(useLongNames=True) == "representation"):
+            container = om.MFnDependencyNode(plug.node()).name()
+            self._outdated.add(container)
+            self._dirty = True
+
+    def install_callbacks(self):
+        """Register Maya callbacks to keep the index up to date"""
+        if self._callbacks:
+            return
+
+        self._callbacks += [
+            om.MDGMessage.addNodeAddedCallback(self.mark_dirty, "objectSet"),
+            om.MDGMessage.addNodeRemovedCallback(self.mark_dirty,
+                                                 "objectSet"),
+            # Null MObject for all nodes
+            om.MNodeMessage.addNameChangedCallback(om.MObject(),
+                                                   self.mark_renamed),
+            om.MDagMessage.addAllDagChangesCallback(self.mark_renamed),
+        ]
+        for message in (om.MSceneMessage.kAfterNew,
+                        om.MSceneMessage.kAfterOpen,
+                        om.MSceneMessage.kAfterImport,
+                        om.MSceneMessage.kAfterCreateReference,
+                        om.MSceneMessage.kAfterLoadReference,
+                        om.MSceneMessage.kAfterUnloadReference,
+                        om.MSceneMessage.kAfterRemoveReference):
+            self._callbacks.append(
+                om.MSceneMessage.addCallback(message, self.reset))
+
+        # Containers indexed before callbacks installed may have been
+        # changed, start over.
+        self.reset()
+
+    def uninstall_callbacks(self):
+        """Remove registered Maya callbacks"""
+        om.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = list()
+        # Can no longer track changes
+        self.reset()
+
+    def _watch(self, container):
+        """Watch container attribute changes if callbacks installed"""
+        if not self._callbacks or container in self._container_callbacks:
+            return
+
+        selection_list = om.MSelectionList()
+        selection_list.add(container)
+        self._container_callbacks[container] = (
+            om.MNodeMessage.addAttributeChangedCallback(
+                selection_list.getDependNode(0), self._on_container_changed)
+        )
+
+    def _drop(self, container):
+        self._containers.pop(container, None)
+        self._looks.pop(container, None)
+        callback = self._container_callbacks.pop(container, None)
+        if callback is not None:
+            om.MMessage.removeCallback(callback)
+
+    def update(self):
+        """Bring the index up to date, rebuild if callbacks not installed"""
+        if not self._callbacks:
+            self.reset()
+        self.refresh()
+
+    def refresh(self):
+        """Index new or updated containers and drop removed ones"""
+        if not self._dirty:
+            return
+
+        containers = set(lib.lsAttrs({"id": AVALON_CONTAINER_ID}))
+        indexed = set(self._containers) | set(self._looks)
+
+        # Updated containers will be parsed again, and members of all
+        # containers if any node has been renamed or reparented.
+        outdated = self._outdated & indexed
+        if self._renamed:
+            outdated.update(self._containers)
+
+        removed = (indexed - containers) | outdated
+        if removed:
+            for container in removed:
+                self._drop(container)
+            self._rebuild_lookup()
+            indexed -= removed
+
+        new_looks = list()
+        for container in containers - indexed:
+            if cmds.getAttr(container + ".loader") == "LookLoader":
+                new_looks.append(container)
+            else:
+                self._add_container(container)
+            self._watch(container)
+
+        self._add_looks(new_looks)
+
+        self._outdated = set()
+        self._renamed = False
+        self._dirty = False
+
+    def _add_container(self, container):
+        asset_id = _asset_id(container)
+        members = cmds.sets(container, query=True) or []
+        nodes = _ls_id_attributed(members)
+
+        self._containers[container] = (asset_id, nodes)
+        self._update_lookup(asset_id, nodes)
+
+    def _add_looks(self, containers):
+        if not containers:
+            return
+
+        looks = [parse_container(container) for container in containers]
+
+        version_ids = [io.ObjectId(look["versionId"]) for look in looks]
+        versions = {
+            str(version["_id"]): version["name"] for version in
+            io.find({"_id": {"$in": version_ids}}, projection={"name": True})
+        }
+
+        for container, look in zip(containers, looks):
+            look["version"] = versions.get(look["versionId"])
+            self._looks[container] = look
+
+    def _update_lookup(self, asset_id, nodes):
+        for node in nodes:
+            self._node_asset[node] = asset_id
+            self._node_namespace[node] = get_namespace_from_node(node)
+
+    def _rebuild_lookup(self):
+        self._node_asset = dict()
+        self._node_namespace = dict()
+        for asset_id, nodes in self._containers.values():
+            self._update_lookup(asset_id, nodes)
+
+    def asset_id(self, node):
+        """Return asset id of the node, or None if not containerized"""
+        self.refresh()
+
+        if node not in self._node_asset and not self._callbacks:
+            # Not able to track scene changes without callbacks, rebuild
+            # on miss.
+            self.update()
+
+        return self._node_asset.get(node)
+
+    def group_by_asset(self, nodes):
+        """Group containerized nodes by asset id
+
+        Arguments:
+            nodes (list): A list of node long names
+
+        Returns:
+            dict: Asset id as key, list of nodes as value
+
+        """
+        self.refresh()
+
+        grouped = dict()
+        for node in nodes:
+            asset_id = self._node_asset.get(node)
+            if asset_id is None:
+                continue
+
+            if asset_id not in grouped:
+                grouped[asset_id] = list()
+            grouped[asset_id].append(node)
+
+        return grouped
+
+    def namespaces(self, nodes):
+        """Return namespaces of containerized nodes"""
+        self.refresh()
+        return set(self._node_namespace[node] for node in nodes
+                   if node in self._node_namespace)
+
+    def loaded_looks(self, asset_id=None):
+        """Return look containers which loaded for the asset
+
+        Return all loaded looks if `asset_id` not provided.
+
+        """
+        self.refresh()
+        return [look for look in self._looks.values()
+                if asset_id is None or look["assetId"] == str(asset_id)]
+
+
+scene_index = SceneIndex()
+
+
 def get_asset_id_from_node(node):
     """Get asset id by lookup container that this node belongs to
     Args:
@@ -138,25 +406,7 @@ def get_asset_id_from_node(node):
     Returns:
         str
     """
-    if node in _cached_containerized_nodes:
-        return _cached_containerized_nodes[node]
-
-    _cached_containerized_nodes.clear()
-
-    containers = {
-        container: set(cmds.ls(cmds.sets(container, query=True),
-                               long=True))
-        for container in lib.lsAttrs({"id": AVALON_CONTAINER_ID})
-        if not cmds.getAttr(container + ".loader") == "LookLoader"
-    }
-    for container, content in containers.items():
-        _id = _asset_id(container)
-        for _node in content:
-            if not lib.hasAttr(_node, lib.AVALON_ID_ATTR_LONG):
-                continue
-            _cached_containerized_nodes[_node] = _id
-
-    return _cached_containerized_nodes.get(node)
+    return scene_index.asset_id(node)
 
 
 def create_asset_id_hash(nodes):
@@ -167,19 +417,8 @@ def create_asset_id_hash(nodes):
     Returns:
         dict
     """
-    node_id_hash = dict()
-    for node in cmds.ls(nodes, long=True):
-        if not lib.hasAttr(node, lib.AVALON_ID_ATTR_LONG):
-            continue
-        asset_id = get_asset_id_from_node(node)
-        if asset_id is None:
-            continue
-
-        if asset_id not in node_id_hash:
-            node_id_hash[asset_id] = list()
-        node_id_hash[asset_id].append(node)
-
-    return node_id_hash
+    scene_index.update()
+    return scene_index.group_by_asset(cmds.ls(nodes, long=True))
 
 
 def create_items_from_nodes(nodes):
@@ -205,9 +444,19 @@ def create_items_from_nodes(nodes):
     if not id_hashes:
         return asset_view_items
 
+    asset_ids = [io.ObjectId(_id) for _id in id_hashes]
+    assets = {
+        str(asset["_id"]): asset for asset in
+        io.find({"_id": {"$in": asset_ids}}, projection={"name": True})
+    }
+
+    # Collect available look subsets for all assets in one pass
+    looks_by_asset = dict()
+    for look in scene_index.loaded_looks():
+        looks_by_asset.setdefault(look["assetId"], list()).append(look)
+
     for _id, id_nodes in id_hashes.items():
-        asset = io.find_one({"_id": io.ObjectId(_id)},
-                            projection={"name": True})
+        asset = assets.get(_id)
 
         # Skip if asset id is not found
         if not asset:
@@ -215,14 +464,10 @@ def create_items_from_nodes(nodes):
             log.warning("Nodes: %s" % id_nodes)
             continue
 
-        # Collect available look subsets for this asset
-        looks = list_loaded_looks(asset["_id"])
+        looks = looks_by_asset.get(_id, list())
 
         # Collect namespaces the asset is found in
-        namespaces = set()
-        for node in id_nodes:
-            namespace = get_namespace_from_node(node)
-            namespaces.add(namespace)
+        namespaces = scene_index.namespaces(id_nodes)
 
         asset_view_items.append({"label": asset["name"],
                                  "asset": asset,
@@ -235,22 +480,8 @@ def create_items_from_nodes(nodes):
 def list_loaded_looks(asset_id):
     """Return all look subsets in scene for the given asset
     """
-    look_subsets = list()
-
-    for container in lib.lsAttrs({"id": AVALON_CONTAINER_ID}):
-        if (cmds.getAttr(container + ".loader") == "LookLoader" and
-                _asset_id(container) == str(asset_id)):
-
-            look = parse_container(container)
-
-            version_id = io.ObjectId(look["versionId"])
-            version = io.find_one({"_id": version_id},
-                                  projection={"name": True})
-            look["version"] = version["name"]
-
-            look_subsets.append(look)
-
-    return look_subsets
+    scene_index.update()
+    return scene_index.loaded_looks(asset_id)
 
 
 def remove_unused_looks():
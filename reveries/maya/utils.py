@@ -125,6 +125,53 @@ class MeshHasher(object):
         return result
 
 
+def hash_scene_sources(context):
+    """Return fingerprints of the workfile and all loaded referenced files
+
+    Everything in the scene is defined by these files, since the workfile
+    must be saved before publish. Referenced files are hashed by project's
+    fingerprint mode. Computed once per publish context.
+
+    Arguments:
+        context (pyblish.api.Context): Publish context
+
+    Returns:
+        dict
+
+    """
+    sources = context.data.get("sceneSources")
+    if sources is not None:
+        return sources
+
+    from ..utils import FINGERPRINT_MODES, fingerprint_mode
+
+    mode = fingerprint_mode(context.data["projectDoc"])
+    hash_file = FINGERPRINT_MODES[mode]
+
+    references = dict()
+    for reference in cmds.ls(type="reference"):
+        try:
+            if not cmds.referenceQuery(reference, isLoaded=True):
+                continue
+            path = cmds.referenceQuery(reference,
+                                       filename=True,
+                                       withoutCopyNumber=True)
+        except RuntimeError:
+            # Not associated with a file, e.g. sharedReferenceNode
+            continue
+
+        if path not in references:
+            references[path] = hash_file(path)
+
+    sources = {
+        "workfile": context.data["sourceFingerprint"]["currentHash"],
+        "references": references,
+    }
+    context.data["sceneSources"] = sources
+
+    return sources
+
+
 def remove_unused_plugins():
     """Remove unused plugin from scene
 
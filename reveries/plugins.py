@@ -5,6 +5,7 @@ import inspect
 import types
 import logging
 import json
+import copy
 import shutil
 
 import pyblish.api
@@ -12,7 +13,17 @@ import avalon.api
 import avalon.io
 
 from .vendor import six
-from .utils import temp_dir, deep_update
+from .utils import (
+    temp_dir,
+    staging_root,
+    deep_update,
+    is_staging_dir,
+    get_representation_path_,
+    _C4Hasher,
+    ContentStore,
+    TransferQueue,
+)
+from .profiling import measure, TRACE_ENV
 from . import CONTRACTOR_PATH
 
 
@@ -45,6 +56,10 @@ class BaseContractor(object):
             "PYTHONPATH": os.getenv("PYTHONPATH", ""),
         }, **avalon.api.Session)
 
+        # Keep tracing on contractor if enabled
+        if os.getenv(TRACE_ENV):
+            environment[TRACE_ENV] = os.environ[TRACE_ENV]
+
         # Save Context data from source
         #
         context_data_entry = [
@@ -314,6 +329,15 @@ def context_process(process):
     return _context_process
 
 
+_transfer_queues = list()
+
+
+def _close_transfer_queues(**kwargs):
+    """Stop background transfer threads when publish finished or stopped"""
+    while _transfer_queues:
+        _transfer_queues.pop().close()
+
+
 def skip_stage(extractor):
     """Decorator, indicate the extractor will directly save to publish dir
 
@@ -333,6 +357,8 @@ def skip_stage(extractor):
 
         return result
 
+    _skip_stage.skip_stage = True
+
     return _skip_stage
 
 
@@ -378,6 +404,18 @@ class PackageExtractor(pyblish.api.InstancePlugin):
           publish session been completed, no matter what happened during
           long extraction time.
 
+    * If `skipUnchanged` is enabled in instance or project data and the
+      extractor implements `signature_<representationName>` that returns
+      data which defines the representation content, the C4 hash of it will
+      be saved in representation data as `signature`. Unchanged
+      representation will not be extracted, the latest package will be
+      hardlinked into the new version dir instead.
+
+    * If project has `asyncTransfer` enabled, each extracted package and the
+      files added by `add_file`, `add_hardlink` will be transferred to the
+      version dir in background right after extracted, see
+      `reveries.utils.TransferQueue`. Integrator then only waits for them.
+
     Example usage:
 
         ```python
@@ -446,7 +484,22 @@ class PackageExtractor(pyblish.api.InstancePlugin):
 
         for method, repr_ in extract_methods:
             self._current_representation = repr_
-            method()
+            with measure(self.context,
+                         plugin=type(self).__name__,
+                         instance=self._instance_name,
+                         representation=repr_):
+                # Reuse in the same way the method would extract
+                self._extract_to_publish_dir = getattr(method,
+                                                       "skip_stage",
+                                                       False)
+                try:
+                    reused = self._reuse_unchanged(repr_)
+                finally:
+                    self._extract_to_publish_dir = False
+
+                if not reused:
+                    method()
+            self._transfer_package(repr_)
 
     def process(self, instance):
         """Extractor's main process
@@ -465,9 +518,11 @@ class PackageExtractor(pyblish.api.InstancePlugin):
         self.data = instance.data
         self.member = instance[:]
 
+        self._instance_name = instance.name
         self._active_representations = list()
         self._current_representation = None
         self._extract_to_publish_dir = False
+        self._completing_version = None
         self._subset_doc = avalon.io.find_one({
             "type": "subset",
             "parent": self.data["assetDoc"]["_id"],
@@ -476,6 +531,7 @@ class PackageExtractor(pyblish.api.InstancePlugin):
 
         project = instance.context.data["projectDoc"]
         self._publish_dir_template = project["config"]["template"]["publish"]
+        self._staging_root = staging_root(project)
         self._publish_dir_key = {"root": avalon.api.registered_root(),
                                  "project": avalon.Session["AVALON_PROJECT"],
                                  "silo": avalon.Session["AVALON_SILO"],
@@ -504,6 +560,181 @@ class PackageExtractor(pyblish.api.InstancePlugin):
         if "hardlinks" not in self.data:
             self.data["hardlinks"] = list()
 
+        self._transfer_queue = self._get_transfer_queue()
+        self._pending_transfers = list()
+
+        self._skip_unchanged = self.data.get(
+            "skipUnchanged", project["data"].get("skipUnchanged", False))
+
+    def _publish_path(self, representation):
+        """Return representation dir in current version dir"""
+        template_data = dict(self._publish_dir_key,
+                             representation=representation)
+        return self._publish_dir_template.format(**template_data)
+
+    def _representation_signature(self, representation):
+        """Return C4 hash of the content signature of the representation
+
+        The signature is composed by the method `signature_<representation>`
+        which returns JSON serializable data that defines the content of the
+        representation, e.g. mesh hashes. Return None if the extractor does
+        not implement it.
+
+        """
+        method = getattr(self, "signature_" + representation, None)
+        if method is None:
+            return None
+
+        components = method()
+        if components is None:
+            return None
+
+        hasher = _C4Hasher()
+        hasher.hash_obj.update(json.dumps([type(self).__name__,
+                                           representation,
+                                           components],
+                                          sort_keys=True,
+                                          default=str).encode("utf-8"))
+        return hasher.digest()
+
+    def _find_unchanged(self, representation, signature):
+        """Find latest representation that has the same signature
+
+        Returns:
+            tuple: Representation document and its package dir, or None
+
+        """
+        if self._subset_doc is None:
+            return None
+
+        version = avalon.io.find_one({"type": "version",
+                                      "parent": self._subset_doc["_id"]},
+                                     sort=[("name", -1)])
+        if version is None:
+            return None
+
+        previous = avalon.io.find_one({"type": "representation",
+                                       "parent": version["_id"],
+                                       "name": representation})
+        if previous is None:
+            return None
+        if previous["data"].get("signature") != signature:
+            return None
+
+        parents = [version,
+                   self._subset_doc,
+                   self.data["assetDoc"],
+                   self.context.data["projectDoc"]]
+        package_dir = get_representation_path_(previous, parents)
+        if not os.path.isdir(package_dir):
+            return None
+
+        return previous, package_dir
+
+    def _reuse_unchanged(self, representation):
+        """Reuse latest package if representation content is unchanged
+
+        Only if `skipUnchanged` is enabled in instance or project data, the
+        content signature is computed, since it may cost as much as querying
+        the whole shading network, and saved into representation data. If
+        the latest version has the same signature, the extraction will be
+        skipped and the files of latest package will be hardlinked into
+        current version dir, representation data will also be copied from
+        latest one with `reusedFrom` entry that points to the reused
+        representation.
+
+        Returns:
+            bool: True if latest package has been reused
+
+        """
+        if not self._skip_unchanged:
+            return False
+
+        signature = self._representation_signature(representation)
+        if signature is None:
+            return False
+
+        self.add_data({"signature": signature})
+
+        found = self._find_unchanged(representation, signature)
+        if found is None:
+            return False
+
+        previous, package_dir = found
+        self.log.info("Representation {!r} unchanged, reusing {}"
+                      "".format(representation, package_dir))
+
+        self.create_package()
+        publish_path = self._publish_path(representation)
+        for root, dirs, files in os.walk(package_dir):
+            for name in files:
+                src = os.path.join(root, name)
+                dst = os.path.join(publish_path,
+                                   os.path.relpath(src, package_dir))
+                self.add_hardlink(src, dst)
+
+        data = copy.deepcopy(previous["data"])
+        data["reusedFrom"] = str(previous["_id"])
+        self.add_data(data)
+
+        return True
+
+    def _get_transfer_queue(self):
+        """Return context shared `TransferQueue` if project enabled it"""
+        project = self.context.data["projectDoc"]
+        if not TransferQueue.enabled(project):
+            return None
+
+        queue = self.context.data.get("transferQueue")
+        if queue is None:
+            store = ContentStore() if ContentStore.enabled(project) else None
+            queue = TransferQueue(store=store)
+            self.context.data["transferQueue"] = queue
+
+            # `PublishReports` closes the queue, but it will not be reached
+            # if the publish failed or stopped early.
+            _transfer_queues.append(queue)
+            callbacks = pyblish.api.registered_callbacks().get("published")
+            if _close_transfer_queues not in (callbacks or []):
+                pyblish.api.register_callback("published",
+                                              _close_transfer_queues)
+
+        return queue
+
+    def _transfer_package(self, representation):
+        """Submit extracted package and its files to background transfer
+
+        Files and hardlinks that added while extracting into staging dir are
+        submitted after the package, just like the order of integration.
+
+        """
+        if self._transfer_queue is None:
+            return
+
+        staging_dir = self.data.get("stagingDir")
+        package_dir = os.path.join(staging_dir or "", representation)
+
+        if staging_dir and os.path.isdir(package_dir):
+            self._transfer_queue.submit(self._instance_name,
+                                        "packages",
+                                        package_dir,
+                                        self._publish_path(representation),
+                                        move=is_staging_dir(staging_dir))
+
+        pending, self._pending_transfers = self._pending_transfers, list()
+        for job, src, dst in pending:
+            self._transfer_queue.submit(self._instance_name, job, src, dst)
+
+    def _transfer(self, job, src, dst):
+        if self._transfer_queue is None:
+            return
+
+        if self._extract_to_publish_dir:
+            self._transfer_queue.submit(self._instance_name, job, src, dst)
+        else:
+            # Wait for the package being submitted
+            self._pending_transfers.append((job, src, dst))
+
     def _get_next_version(self):
         """Get current subset instance's next version number"""
         version = None
@@ -520,27 +751,34 @@ class PackageExtractor(pyblish.api.InstancePlugin):
 
         return version_number
 
-    def _acquire_version_dir(self, version_locked=False):
-        """Get a version dir which binded to current workfile
-        """
+    def _format_version_dir(self, version_number):
+        """Return version dir path of the version number"""
         version_dir_template = os.path.dirname(self._publish_dir_template)
+        template_data = dict(self._publish_dir_key, version=version_number)
+        version_dir = version_dir_template.format(**template_data)
+        # Clean the path
+        return os.path.abspath(os.path.normpath(version_dir))
 
-        def format_version_dir(version_number):
-            self._publish_dir_key["version"] = version_number
-            version_dir = version_dir_template.format(**self._publish_dir_key)
-            # Clean the path
-            version_dir = os.path.abspath(os.path.normpath(version_dir))
+    def _is_version_matched(self, version_dir):
+        """Does the fingerprint in this version match with workfile ?"""
+        metadata_path = os.path.join(version_dir, self.metadata)
+        # Load fingerprint from version dir
+        with open(metadata_path, "r") as fp:
+            metadata = json.load(fp)
 
-            return version_dir
+        return metadata == self.context.data["sourceFingerprint"]
 
-        def is_version_matched(version_dir):
-            """Does the fingerprint in this version match with workfile ?"""
-            metadata_path = os.path.join(version_dir, self.metadata)
-            # Load fingerprint from version dir
-            with open(metadata_path, "r") as fp:
-                metadata = json.load(fp)
+    def _acquire_version_dir(self, version_locked=False):
+        """Get a version dir which binded to current workfile
+
+        If `self._completing_version` has been set (by `_get_next_version`),
+        the content of the matched version dir will be kept, so the missing
+        parts of that version could be added.
 
-            return metadata == self.context.data["sourceFingerprint"]
+        """
+        def format_version_dir(version_number):
+            self._publish_dir_key["version"] = version_number
+            return self._format_version_dir(version_number)
 
         def create_version_dir(version_dir):
             """Create a version named dir and dump workfile fingerprint"""
@@ -583,7 +821,11 @@ class PackageExtractor(pyblish.api.InstancePlugin):
             self.log.debug("Version Dir: {}".format(version_dir))
 
             if os.path.isdir(version_dir):
-                if is_version_matched(version_dir):
+                if self._is_version_matched(version_dir):
+                    if self._completing_version is not None:
+                        # Keep previous extracted stuff for completing
+                        self.log.debug("Completing version dir.")
+                        break
                     # This version dir match the current workfile, remove
                     # previous extracted stuff.
                     self.log.debug("Cleaning version dir.")
@@ -640,6 +882,9 @@ class PackageExtractor(pyblish.api.InstancePlugin):
         "pyblish_tmp_" prefix, but if the extraction method get decorated with
         `skip_stage`, the staging directory will be the publish directory.
 
+        If project has `stageOnPublishRoot` enabled, staging directory will be
+        created under project root, see `reveries.utils.staging_root`.
+
         Return:
             repr_dir (str): staging directory
 
@@ -650,15 +895,17 @@ class PackageExtractor(pyblish.api.InstancePlugin):
             if self._extract_to_publish_dir:
                 staging_dir = self.data["versionDir"]
             else:
-                staging_dir = temp_dir(prefix="pyblish_tmp_")
+                staging_dir = temp_dir(prefix="pyblish_tmp_",
+                                       root=self._staging_root)
 
             self.data["stagingDir"] = staging_dir
 
         repr_dir = os.path.join(staging_dir, self._current_representation)
 
         if os.path.isdir(repr_dir):
-            self.log.warning("Representation dir existed, this should not "
-                             "happen. Files may overwritten.")
+            if self._completing_version is None:
+                self.log.warning("Representation dir existed, this should "
+                                 "not happen. Files may overwritten.")
         else:
             os.makedirs(repr_dir)
 
@@ -685,6 +932,7 @@ class PackageExtractor(pyblish.api.InstancePlugin):
 
         """
         self.data["files"].append((src, dst))
+        self._transfer("files", src, dst)
 
     def add_hardlink(self, src, dst):
         """Add file to hardlink queue
@@ -695,6 +943,7 @@ class PackageExtractor(pyblish.api.InstancePlugin):
 
         """
         self.data["hardlinks"].append((src, dst))
+        self._transfer("hardlinks", src, dst)
 
 
 class DelegatablePackageExtractor(PackageExtractor):
@@ -816,8 +1065,12 @@ class RepairInstanceAction(pyblish.api.Action):
 
         # Apply pyblish.logic to get the instances for the plug-in
         instances = pyblish.api.instances_by_plugin(errored_instances, plugin)
-        for instance in instances:
-            plugin.fix(instance)
+        try:
+            for instance in instances:
+                plugin.fix(instance)
+        finally:
+            # Scene changed, snapshot will be re-taken on next validation
+            context.data.pop("sceneSnapshot", None)
 
 
 class RepairContextAction(pyblish.api.Action):
@@ -843,7 +1096,11 @@ class RepairContextAction(pyblish.api.Action):
         # Apply pyblish.logic to get the instances for the plug-in
         if plugin in errored_plugins:
             self.log.info("Attempting fix ...")
-            plugin.fix(context)
+            try:
+                plugin.fix(context)
+            finally:
+                # Scene changed, snapshot will be re-taken on next validation
+                context.data.pop("sceneSnapshot", None)
 
 
 class SelectInvalidAction(pyblish.api.Action):
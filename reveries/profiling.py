@@ -0,0 +1,573 @@
+
+import os
+import sys
+import json
+import time
+import socket
+import atexit
+import logging
+import contextlib
+from timeit import default_timer
+
+import pyblish.api
+
+
+log = logging.getLogger(__name__)
+
+
+PROFILE_FILE = ".profile.json"
+
+# Functions in `avalon.io` that make database round-trip
+DB_FUNCTIONS = [
+    "find",
+    "find_one",
+    "insert_one",
+    "insert_many",
+    "update_one",
+    "update_many",
+    "replace_one",
+    "delete_one",
+    "delete_many",
+    "save",
+    "distinct",
+    "aggregate",
+    "locate",
+    "parenthood",
+]
+
+METRICS = ("wall", "cpu", "db", "cmds", "read", "write")
+
+
+def cpu_time():
+    """Return user + system CPU time of current process in seconds"""
+    times = os.times()
+    return times[0] + times[1]
+
+
+def io_counters():
+    """Return bytes read and written by current process
+
+    On Linux, this reads `rchar` and `wchar` from `/proc/self/io`, which
+    including reads/writes that served by page cache and network file
+    system. On Windows, this reads `GetProcessIoCounters`.
+
+    Returns:
+        tuple: (read bytes, written bytes), (0, 0) if not supported
+
+    """
+    if os.name == "nt":
+        import ctypes
+
+        class IO_COUNTERS(ctypes.Structure):
+            _fields_ = [(name, ctypes.c_ulonglong) for name in (
+                "ReadOperationCount",
+                "WriteOperationCount",
+                "OtherOperationCount",
+                "ReadTransferCount",
+                "WriteTransferCount",
+                "OtherTransferCount",
+            )]
+
+        counters = IO_COUNTERS()
+        kernel32 = ctypes.windll.kernel32
+        if kernel32.GetProcessIoCounters(kernel32.GetCurrentProcess(),
+                                         ctypes.byref(counters)):
+            return counters.ReadTransferCount, counters.WriteTransferCount
+        return 0, 0
+
+    try:
+        with open("/proc/self/io", "r") as fp:
+            stats = dict(line.split(":", 1) for line in fp if ":" in line)
+    except (IOError, OSError):
+        return 0, 0
+
+    return int(stats["rchar"]), int(stats["wchar"])
+
+
+class CallCounter(object):
+    """Count function calls by patching module attributes
+
+    Functions are replaced with a wrapper that increments the counter of
+    the given category, and will be restored on `uninstall`.
+
+    Example:
+        >>> from avalon import io
+        >>> counter = CallCounter()
+        >>> counter.install(io, DB_FUNCTIONS, "db")
+        >>> io.find_one({"type": "project"})
+        >>> counter.counts["db"]
+        1
+        >>> counter.uninstall()
+
+    """
+
+    def __init__(self):
+        self.counts = dict()
+        self._patched = list()
+
+    def install(self, module, names, category):
+        """Wrap module functions
+
+        Arguments:
+            module (module): Module that has the functions
+            names (list): Function names
+            category (str): Counter name
+
+        """
+        counts = self.counts
+        counts.setdefault(category, 0)
+
+        def wrap(func):
+            def wrapper(*args, **kwargs):
+                counts[category] += 1
+                return func(*args, **kwargs)
+
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+
+        for name in names:
+            func = getattr(module, name, None)
+            if not callable(func) or isinstance(func, type):
+                continue
+
+            wrapper = wrap(func)
+            setattr(module, name, wrapper)
+            self._patched.append((module, name, func, wrapper))
+
+    def uninstall(self):
+        """Restore all wrapped functions"""
+        for module, name, func, wrapper in reversed(self._patched):
+            if getattr(module, name, None) is wrapper:
+                setattr(module, name, func)
+            else:
+                log.warning("%s.%s has been patched by others, not "
+                            "restored." % (module.__name__, name))
+        self._patched = list()
+
+
+class PublishProfiler(object):
+    """Record resource usage of every plugin and representation extraction
+
+    Each record has these metrics:
+        wall: Wall time in seconds
+        cpu: CPU time in seconds
+        db: Number of database round-trips through `avalon.io`
+        cmds: Number of `maya.cmds` calls, 0 if not in Maya
+        read: Bytes read
+        write: Bytes written
+
+    Plugin records are taken on pyblish `pluginProcessed` signal, the usage
+    between two plugins are counted into the later one, except the wall time
+    which is the duration that pyblish measured.
+
+    """
+
+    def __init__(self):
+        self.counter = CallCounter()
+        self.plugins = list()
+        self.representations = list()
+        self.installed = False
+        self._last = None
+
+    def install(self):
+        from avalon import io
+
+        self.counter.install(io, DB_FUNCTIONS, "db")
+        try:
+            from maya import cmds
+        except ImportError:
+            self.counter.counts["cmds"] = 0
+        else:
+            names = [name for name in dir(cmds) if not name.startswith("_")]
+            self.counter.install(cmds, names, "cmds")
+
+        pyblish.api.register_callback("pluginProcessed",
+                                      self.on_plugin_processed)
+        self._last = self.snapshot()
+        self.installed = True
+
+    def uninstall(self):
+        try:
+            pyblish.api.deregister_callback("pluginProcessed",
+                                            self.on_plugin_processed)
+        except (KeyError, ValueError):
+            pass
+        self.counter.uninstall()
+        self.installed = False
+
+    def snapshot(self):
+        read, write = io_counters()
+        return {
+            "wall": time.time(),
+            "cpu": cpu_time(),
+            "db": self.counter.counts.get("db", 0),
+            "cmds": self.counter.counts.get("cmds", 0),
+            "read": read,
+            "write": write,
+        }
+
+    @staticmethod
+    def delta(start, end):
+        return {key: end[key] - start[key] for key in METRICS}
+
+    def on_plugin_processed(self, result):
+        current = self.snapshot()
+        record = self.delta(self._last, current)
+        self._last = current
+
+        plugin = result["plugin"]
+        instance = result["instance"]
+
+        record["wall"] = (result["duration"] or 0) / 1000.0
+        record.update({
+            "plugin": plugin.__name__,
+            "order": plugin.order,
+            "instance": None if instance is None else instance.name,
+            "action": result["action"],
+            "success": result["success"],
+        })
+        self.plugins.append(record)
+
+    def failed(self):
+        """Return True if any recorded plugin has failed"""
+        return not all(record["success"] for record in self.plugins)
+
+    @contextlib.contextmanager
+    def measure(self, **info):
+        """Record usage of the code block with additional info"""
+        start = self.snapshot()
+        try:
+            yield
+        finally:
+            record = self.delta(start, self.snapshot())
+            record.update(info)
+            self.representations.append(record)
+
+    def instance_profile(self, instance):
+        """Return records of the instance and context plugins"""
+        name = instance.name
+        return {
+            "instance": name,
+            "plugins": [r for r in self.plugins if r["instance"] == name],
+            "context": [r for r in self.plugins if r["instance"] is None],
+            "representations": [r for r in self.representations
+                                if r.get("instance") == name],
+        }
+
+    def write(self, instance, dir_path):
+        """Write instance profile into `.profile.json` in `dir_path`"""
+        path = os.path.join(dir_path, PROFILE_FILE)
+        with open(path, "w") as fp:
+            json.dump(self.instance_profile(instance), fp, indent=4)
+        return path
+
+    def summary(self, records=None, top=5):
+        """Return the most time consuming records
+
+        Arguments:
+            records (list, optional): Records to summarize, default all
+                plugin records
+            top (int, optional): Number of records to return
+
+        Returns:
+            list
+
+        """
+        records = self.plugins if records is None else records
+        return sorted(records, key=lambda r: r["wall"], reverse=True)[:top]
+
+
+_current = None
+
+
+def install_profiler(context):
+    """Install a new profiler into context, the previous one is uninstalled
+
+    The profiler will be uninstalled on `published` signal, or `validated`
+    signal if validation failed, so the wrapped functions will not be left
+    in session if the publish stopped before `PublishReports`. A succeeded
+    validation could be followed by extraction without re-collecting.
+
+    """
+    global _current
+
+    if _current is not None:
+        _current.uninstall()
+
+    # Registered once and never deregistered, since removing callback while
+    # pyblish is emitting the signal may skip other callbacks.
+    registered = pyblish.api.registered_callbacks()
+    for signal, callback in (("published", _on_published),
+                             ("validated", _on_validated)):
+        if callback not in registered.get(signal, []):
+            pyblish.api.register_callback(signal, callback)
+
+    _current = PublishProfiler()
+    _current.install()
+    context.data["publishProfiler"] = _current
+
+    return _current
+
+
+def _on_published(**kwargs):
+    uninstall_profiler()
+
+
+def _on_validated(**kwargs):
+    if _current is not None and _current.failed():
+        uninstall_profiler()
+
+
+def uninstall_profiler():
+    global _current
+
+    if _current is not None:
+        _current.uninstall()
+        _current = None
+
+
+def measure(context, **info):
+    """Record usage of the code block if the context has profiler"""
+    profiler = context.data.get("publishProfiler")
+    if profiler is None:
+        return _null_context()
+    return profiler.measure(**info)
+
+
+@contextlib.contextmanager
+def _null_context():
+    yield
+
+
+TRACE_ENV = "REVERIES_TRACE"
+
+_tracer = None
+
+
+class CallTracer(object):
+    """Trace function calls with time and caller by patching module attributes
+
+    For each traced function, the number of calls, cumulative (inclusive)
+    time and the callers are recorded. Call stacks are aggregated in the
+    "collapsed" format of Brendan Gregg's FlameGraph, which could be read by
+    `flamegraph.pl`, speedscope or similar tools.
+
+    Tracing a function costs a frame walk on every call, so this should only
+    be enabled for investigation, see `trace_from_environment`.
+
+    Args:
+        stack_depth (int, optional): Max number of caller frames per stack
+
+    """
+
+    def __init__(self, stack_depth=32):
+        self.stack_depth = stack_depth
+        self.stats = dict()
+        self.stacks = dict()
+        self._patched = list()
+        self._code_names = dict()
+
+    def install(self, module, names, prefix):
+        """Wrap module functions
+
+        Arguments:
+            module (module): Module that has the functions
+            names (list): Function names
+            prefix (str): Name prefix in report, e.g. "cmds"
+
+        """
+        for name in names:
+            func = getattr(module, name, None)
+            if not callable(func) or isinstance(func, type):
+                continue
+
+            wrapper = self._wrap(func, prefix + "." + name)
+            setattr(module, name, wrapper)
+            self._patched.append((module, name, func, wrapper))
+
+    def uninstall(self):
+        """Restore all wrapped functions"""
+        for module, name, func, wrapper in reversed(self._patched):
+            if getattr(module, name, None) is wrapper:
+                setattr(module, name, func)
+        self._patched = list()
+
+    def _wrap(self, func, label):
+        stats = self.stats
+        record = self._record
+
+        def wrapper(*args, **kwargs):
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = default_timer() - start
+                record(label, elapsed, sys._getframe(1))
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+
+        stats[label] = {"calls": 0, "time": 0.0, "callers": dict()}
+
+        return wrapper
+
+    def _code_name(self, code):
+        try:
+            return self._code_names[code]
+        except KeyError:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            name = "%s.%s" % (module, code.co_name)
+            self._code_names[code] = name
+            return name
+
+    def _record(self, label, elapsed, frame):
+        stat = self.stats[label]
+        stat["calls"] += 1
+        stat["time"] += elapsed
+
+        # Skip wrappers of `CallCounter` which may wrap this tracer
+        while (frame is not None and
+               frame.f_globals.get("__name__") == __name__):
+            frame = frame.f_back
+        if frame is None:
+            return
+
+        caller = "%s:%d" % (self._code_name(frame.f_code), frame.f_lineno)
+        callers = stat["callers"]
+        callers[caller] = callers.get(caller, 0) + 1
+
+        frames = list()
+        while frame is not None and len(frames) < self.stack_depth:
+            frames.append(self._code_name(frame.f_code))
+            frame = frame.f_back
+
+        frames.reverse()
+        frames.append(label)
+        stack = ";".join(frames)
+        self.stacks[stack] = self.stacks.get(stack, 0) + elapsed
+
+    def report(self, top=None):
+        """Return traced functions sorted by cumulative time
+
+        Arguments:
+            top (int, optional): Number of functions to return, default all
+
+        Returns:
+            list: A list of (label, calls, time, callers) tuple, `callers` is
+                a list of (caller, calls) sorted by calls
+
+        """
+        report = list()
+        for label, stat in self.stats.items():
+            if not stat["calls"]:
+                continue
+            callers = sorted(stat["callers"].items(),
+                             key=lambda item: item[1],
+                             reverse=True)
+            report.append((label, stat["calls"], stat["time"], callers))
+
+        report.sort(key=lambda item: item[2], reverse=True)
+        return report[:top]
+
+    def dump(self, dir_path):
+        """Write traced stats and flamegraph stacks into `dir_path`
+
+        Two files will be written, named by host name, process id and time:
+            `trace_*.json`: Call counts, time and callers of each function
+            `trace_*.folded`: Collapsed stacks weighted by microseconds
+
+        Returns:
+            tuple: Paths of the json file and the stack file
+
+        """
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+
+        basename = "trace_%s_%d_%d" % (socket.gethostname(),
+                                       os.getpid(),
+                                       int(time.time()))
+        stats_path = os.path.join(dir_path, basename + ".json")
+        stack_path = os.path.join(dir_path, basename + ".folded")
+
+        with open(stats_path, "w") as fp:
+            json.dump([{"function": label,
+                        "calls": calls,
+                        "time": elapsed,
+                        "callers": callers}
+                       for label, calls, elapsed, callers in self.report()],
+                      fp,
+                      indent=4)
+
+        with open(stack_path, "w") as fp:
+            for stack, elapsed in sorted(self.stacks.items()):
+                microseconds = int(elapsed * 1e6)
+                if microseconds:
+                    fp.write("%s %d\n" % (stack, microseconds))
+
+        return stats_path, stack_path
+
+
+def trace_from_environment():
+    """Start tracing `maya.cmds` and `avalon.io` if `REVERIES_TRACE` is set
+
+    The value of `REVERIES_TRACE` is the directory to write the trace files
+    into, the files are written on process exit or `stop_tracing`. Nothing
+    will be patched if the variable is not set, so there is no overhead.
+
+    Calling this more than once is harmless, the tracer is only installed
+    once per process.
+
+    Returns:
+        CallTracer: The tracer, or `None` if tracing is not enabled
+
+    """
+    global _tracer
+
+    dir_path = os.environ.get(TRACE_ENV)
+    if not dir_path:
+        return None
+
+    if _tracer is not None:
+        return _tracer
+
+    from avalon import io
+
+    _tracer = CallTracer()
+    _tracer.install(io, DB_FUNCTIONS, "io")
+    try:
+        from maya import cmds
+    except ImportError:
+        pass
+    else:
+        names = [name for name in dir(cmds) if not name.startswith("_")]
+        _tracer.install(cmds, names, "cmds")
+
+    atexit.register(stop_tracing)
+    log.info("Tracing enabled, output to: %s" % dir_path)
+
+    return _tracer
+
+
+def stop_tracing():
+    """Stop tracing and write trace files
+
+    Returns:
+        tuple: Paths of the json file and the stack file, or `None` if not
+            tracing
+
+    """
+    global _tracer
+
+    if _tracer is None:
+        return None
+
+    tracer, _tracer = _tracer, None
+    tracer.uninstall()
+
+    paths = tracer.dump(os.environ[TRACE_ENV])
+    for label, calls, elapsed, callers in tracer.report(top=10):
+        log.info("%9.3fs %8d  %s" % (elapsed, calls, label))
+    log.info("Trace saved: %s" % ", ".join(paths))
+
+    return paths
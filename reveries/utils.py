@@ -1,14 +1,30 @@
 
 import os
+import re
+import math
+import time
 import tempfile
 import hashlib
 import codecs
 import shutil
 import weakref
 import getpass
+import socket
 import errno
+import json
+import stat
 import pymongo
 
+from multiprocessing.pool import ThreadPool
+
+try:
+    from os import scandir as _scandir
+except ImportError:
+    try:
+        from scandir import scandir as _scandir
+    except ImportError:
+        _scandir = None
+
 from avalon import io, Session
 
 import pyblish.api
@@ -16,43 +32,203 @@ import avalon
 from pyblish_qml.ipc import formatting
 
 
-def temp_dir(prefix="pyblish_tmp_"):
+STAGING_OWNER_SUFFIX = ".owner"
+STAGING_TRASH_PREFIX = ".trash_"
+
+
+def temp_dir(prefix="pyblish_tmp_", root=None):
     """Provide a temporary directory for staging
 
-    This temporary directory is generated through `tempfile.mkdtemp()`
+    This temporary directory is generated through `tempfile.mkdtemp()`, and
+    the owner of the directory (user, host, pid and time) will be written
+    into a file next to it, `<dir>.owner`, so `clear_stage` could tell the
+    directory is still in use or not. The owner file is written to a
+    temporary file then renamed, so it will never be read half-written.
 
     Arguments:
         prefix (str, optional): Prefix name of the temporary directory
+        root (str, optional): Where to create the directory, default is
+            `tempfile.gettempdir()`. Staging on the same file system of
+            publish root enables integration to move instead of copy.
 
     """
-    return tempfile.mkdtemp(prefix=prefix)
+    if root is not None:
+        _makedirs(root)
+
+    dir_path = tempfile.mkdtemp(prefix=prefix, dir=root)
+
+    owner = {
+        "user": getpass.getuser(),
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "time": time.time(),
+    }
+    owner_file = dir_path + STAGING_OWNER_SUFFIX
+    with open(owner_file + ".tmp", "w") as fp:
+        json.dump(owner, fp)
+    os.rename(owner_file + ".tmp", owner_file)
+
+    return dir_path
+
+
+def staging_root(project):
+    """Return staging root of the project, `None` for system temp dir
+
+    If project data has `stageOnPublishRoot` set to True, staging dirs will
+    be created in `<root>/<project>/.staging`.
+
+    Arguments:
+        project (dict): Project document
+
+    """
+    if not project["data"].get("stageOnPublishRoot"):
+        return None
+
+    return os.path.join(avalon.api.registered_root(),
+                        project["name"],
+                        ".staging")
+
+
+def is_staging_dir(dir_path):
+    """Return True if the directory is created by `temp_dir`"""
+    return os.path.isfile(dir_path + STAGING_OWNER_SUFFIX)
+
+
+def _is_pid_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION,
+                                      False,
+                                      pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+def _is_stage_in_use(dir_path, grace):
+    """Is the staging dir's owner still running"""
+    try:
+        with open(dir_path + STAGING_OWNER_SUFFIX, "r") as fp:
+            owner = json.load(fp)
+    except (IOError, OSError, ValueError):
+        # Just created and owner not yet written, or created by previous
+        # version, keep it until it has not been modified for a while.
+        try:
+            return time.time() - os.path.getmtime(dir_path) < grace
+        except OSError:
+            # Removed by others
+            return True
+
+    if owner["host"] == socket.gethostname():
+        return _is_pid_alive(owner["pid"])
+
+    # Unable to check process on other host
+    return time.time() - owner["time"] < grace
+
 
+def remove_stage(dir_path, background=False):
+    """Remove staging directory and its owner file
 
-def clear_stage(prefix="pyblish_tmp_"):
+    The directory will be renamed as trash first, so only one process
+    could claim and remove it when cleaning concurrently.
+
+    Arguments:
+        dir_path (str): Staging directory path
+        background (bool, optional): Remove in a daemon thread, default
+            False
+
+    Returns:
+        bool: True if the directory has been claimed for removal
+
+    """
+    root, name = os.path.split(os.path.normpath(dir_path))
+    trash = os.path.join(root, "%s%s_%d" % (STAGING_TRASH_PREFIX,
+                                            name,
+                                            os.getpid()))
+    try:
+        os.rename(dir_path, trash)
+    except OSError:
+        # Removed or claimed by others
+        return False
+
+    owner_file = dir_path + STAGING_OWNER_SUFFIX
+    if os.path.isfile(owner_file):
+        os.remove(owner_file)
+
+    if background:
+        import threading
+        thread = threading.Thread(target=shutil.rmtree,
+                                  args=(trash,),
+                                  kwargs={"ignore_errors": True})
+        thread.daemon = True
+        thread.start()
+    else:
+        shutil.rmtree(trash, ignore_errors=True)
+
+    return True
+
+
+def clear_stage(prefix="pyblish_tmp_",
+                root=None,
+                background=False,
+                grace=86400):
     """Remove temporary staging directory with prefix
 
-    Remove temporary directory which named with prefix in
-    `tempfile.gettempdir()`
+    Remove temporary directory which named with prefix in `root`, default
+    is `tempfile.gettempdir()`. Directories which owner process is still
+    running will be kept, so it's safe to clear while other publishes are
+    in progress.
 
     Arguments:
         prefix (str, optional): Prefix name of the temporary directory
+        root (str, optional): Where the directories are
+        background (bool, optional): Remove in a daemon thread, default
+            False
+        grace (int, optional): Seconds to keep directories which owned by
+            process on other host, or have no owner and modified recently,
+            default one day
+
+    Returns:
+        list: Removed directories
 
     """
-    tempdir = tempfile.gettempdir()
-    cwd_backup = os.getcwd()
+    root = root or tempfile.gettempdir()
+    removed = list()
+
+    for item in os.listdir(root):
+        full_path = os.path.join(root, item)
+
+        if item.startswith(STAGING_TRASH_PREFIX + prefix):
+            # Left from interrupted removal
+            if os.path.isdir(full_path):
+                shutil.rmtree(full_path, ignore_errors=True)
+            continue
+
+        if not (item.startswith(prefix) and os.path.isdir(full_path)):
+            continue
 
-    os.chdir(tempdir)
-    for item in os.listdir(tempdir):
-        if not (os.path.isdir(item) and item.startswith(prefix)):
+        if _is_stage_in_use(full_path, grace):
             continue
 
-        # Remove
-        full_path = os.path.join(tempdir, item)
-        print("Removing {!r}".format(full_path))
-        shutil.rmtree(full_path)
-        print("Removed.")
+        if remove_stage(full_path, background=background):
+            removed.append(full_path)
 
-    os.chdir(cwd_backup)
+    return removed
 
 
 def get_timeline_data(project=None, asset_name=None):
@@ -205,6 +381,532 @@ def hash_file(file_path):
     return hasher.digest()
 
 
+def hash_files(file_paths, workers=8):
+    """Hash files concurrently, each unique path will be hashed once
+
+    Args:
+        file_paths (list): File paths
+        workers (int, optional): Number of threads, default 8
+
+    Returns:
+        dict: File path as key, hash value as value
+
+    """
+    file_paths = sorted(set(file_paths))
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        hashes = pool.map(hash_file, file_paths)
+    finally:
+        pool.close()
+        pool.join()
+
+    return dict(zip(file_paths, hashes))
+
+
+def hash_path(path):
+    """Return C4 hash of a file or all files in a directory"""
+    hasher = AssetHasher()
+    if os.path.isfile(path):
+        hasher.add_file(path)
+    elif os.path.isdir(path):
+        hasher.add_dir(path)
+    return hasher.digest()
+
+
+def _walk_files(path):
+    """Return sorted (relative path, file path) of a file or directory"""
+    if os.path.isfile(path):
+        return [(os.path.basename(path), path)]
+
+    files = list()
+    for root, dirs, names in os.walk(path):
+        for name in names:
+            file_path = os.path.join(root, name)
+            rel_path = os.path.relpath(file_path, path).replace("\\", "/")
+            files.append((rel_path, file_path))
+    return sorted(files)
+
+
+def sampled_hash(path, block_size=64 * 1024, blocks=16):
+    """Return a fast fingerprint by sampling file content
+
+    Each file contributes its relative path, size, modification time, the
+    head and tail block, and `blocks` of blocks at offsets that evenly
+    spread across the file. This reads at most `(blocks + 2) * block_size`
+    bytes per file, regardless the file size.
+
+    (NOTE) Changes that not in sampled blocks, and not altering size or
+        modification time, will not be detected. This is for locking version
+        dir only, not for content identity.
+
+    Args:
+        path (str): File or directory path
+        block_size (int, optional): Bytes per block, default 64KB
+        blocks (int, optional): Number of blocks between head and tail
+
+    Returns:
+        str: "sampled:" prefixed sha512 hex digest
+
+    """
+    hasher = hashlib.sha512()
+
+    for rel_path, file_path in _walk_files(path):
+        st = os.stat(file_path)
+        size = st.st_size
+        hasher.update(("%s:%d:%d\n" % (rel_path, size, int(st.st_mtime))
+                       ).encode("utf-8"))
+
+        with open(file_path, "rb") as file:
+            if size <= (blocks + 2) * block_size:
+                hasher.update(file.read())
+                continue
+
+            step = (size - block_size) // (blocks + 1)
+            for index in range(blocks + 2):
+                file.seek(min(index * step, size - block_size))
+                hasher.update(file.read(block_size))
+
+    return "sampled:" + hasher.hexdigest()
+
+
+def _chunk_digest(args):
+    file_path, offset, size, algorithm = args
+    with open(file_path, "rb") as file:
+        file.seek(offset)
+        return hashlib.new(algorithm, file.read(size)).digest()
+
+
+def chunked_hash(path, chunk_size=8 * 1024 * 1024, workers=4):
+    """Return a full content fingerprint hashed in chunks concurrently
+
+    Files are split into chunks, chunks are hashed in threads (`hashlib`
+    releases GIL while hashing), then the ordered chunk digests are hashed
+    again as the result, like a two-level hash tree. BLAKE2b is used if
+    available (Python 3.6+), otherwise SHA-512, the algorithm name is part
+    of the result so fingerprints from different algorithms never match.
+
+    Args:
+        path (str): File or directory path
+        chunk_size (int, optional): Bytes per chunk, default 8MB
+        workers (int, optional): Number of threads, default 4
+
+    Returns:
+        str: Algorithm name prefixed hex digest
+
+    """
+    algorithm = "blake2b" if hasattr(hashlib, "blake2b") else "sha512"
+
+    jobs = list()
+    hasher = hashlib.new(algorithm)
+    for rel_path, file_path in _walk_files(path):
+        size = os.path.getsize(file_path)
+        hasher.update(("%s:%d\n" % (rel_path, size)).encode("utf-8"))
+        jobs += [(file_path, offset, chunk_size, algorithm)
+                 for offset in range(0, size, chunk_size)]
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        for digest in pool.imap(_chunk_digest, jobs):
+            hasher.update(digest)
+    finally:
+        pool.close()
+        pool.join()
+
+    return algorithm + ":" + hasher.hexdigest()
+
+
+FINGERPRINT_MODES = {
+    "c4": hash_path,
+    "sampled": sampled_hash,
+    "chunked": chunked_hash,
+}
+
+
+def fingerprint_mode(project):
+    """Return source fingerprint mode from project document
+
+    The mode is set by project data `fingerprint`, one of the keys in
+    `FINGERPRINT_MODES`, default "c4".
+
+    """
+    mode = project["data"].get("fingerprint") or "c4"
+    if mode not in FINGERPRINT_MODES:
+        raise ValueError("Unknown fingerprint mode %r, should be one of %s"
+                         % (mode, sorted(FINGERPRINT_MODES)))
+    return mode
+
+
+class BackgroundHash(object):
+    """Compute C4 hash of file or directory in a background thread
+
+    Example:
+        >> source_hash = BackgroundHash("/path/to/workfile.mb")
+        >> # Do other works...
+        >> source_hash.result()
+        'c45xZeXwMSpqXjpDumcHMA6mhoAmGHkUo7r9WmN2UgSEQzj9KjgseaQdkEJ11f...'
+
+    """
+
+    def __init__(self, path):
+        import threading
+
+        self.path = path
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._result = hash_path(self.path)
+        except Exception as error:
+            self._error = error
+
+    def result(self):
+        """Wait for the hash and return it, re-raise error if any"""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+_FILE_TOKEN = re.compile(r"<UDIM>|<udim>|<U>|<V>|<u>|<v>|<f>|<F>|"
+                         r"(#+)|%0?(\d*)d")
+
+
+def _file_token_regex(match):
+    token = match.group(0)
+    if token.lower() == "<udim>":
+        return r"(\d{4})"
+    if token.lower() == "<f>":
+        return r"(-?\d+)"
+    if match.group(1):  # Frame padding "####"
+        return r"(-?\d{%d,})" % len(match.group(1))
+    if token.startswith("%"):  # Frame padding "%04d"
+        return r"(-?\d{%s,})" % (match.group(2) or "1")
+    return r"(\d+)"  # <U>, <V>, <u>, <v>
+
+
+def file_pattern_regex(pattern):
+    """Compile file name pattern which contains tile or frame tokens
+
+    Supported tokens:
+        <UDIM>, <udim>: Mari style UDIM tile, e.g. 1001
+        <U>, <V>, <u>, <v>: Mudbox/ZBrush style tile coordinate
+        <f>, <F>, ####, %04d: Frame number
+
+    Args:
+        pattern (str): File name pattern
+
+    Returns:
+        A compiled regular expression object which fully matches the file
+        names of the pattern, or `None` if there is no token in pattern.
+
+    """
+    regex = ""
+    position = 0
+    for match in _FILE_TOKEN.finditer(pattern):
+        regex += re.escape(pattern[position:match.start()])
+        regex += _file_token_regex(match)
+        position = match.end()
+
+    if not position:
+        return None
+
+    regex += re.escape(pattern[position:])
+
+    return re.compile("^" + regex + "$")
+
+
+def _listdir(dir_path):
+    try:
+        return os.listdir(dir_path)
+    except OSError:
+        return []
+
+
+def _stat_file(file_path):
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_size, st.st_mtime
+
+
+def resolve_file_patterns(patterns, workers=8):
+    """Expand file patterns and stat all files concurrently
+
+    Tile and frame tokens in file name (see `file_pattern_regex`) will be
+    expanded by listing the directory, tokens in directory path are not
+    supported. Each directory is listed once and all files are stat in a
+    thread pool, which matters on high-latency network file systems.
+
+    Args:
+        patterns (list): File paths or file path patterns
+        workers (int, optional): Number of threads, default 8
+
+    Returns:
+        dict: Pattern as key, a list of existing files' (path, size, mtime)
+            tuples as value, sorted by path. The list is empty if no file
+            found.
+
+    """
+    candidates = dict()
+    regexes = dict()
+    for pattern in set(patterns):
+        dir_path, file_name = os.path.split(pattern)
+        regex = file_pattern_regex(file_name)
+        if regex is None:
+            candidates[pattern] = [pattern]
+        else:
+            regexes[pattern] = (dir_path, regex)
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        dirs = sorted(set(dir_path for dir_path, _ in regexes.values()))
+        listing = dict(zip(dirs, pool.map(_listdir, dirs)))
+
+        for pattern, (dir_path, regex) in regexes.items():
+            candidates[pattern] = sorted(os.path.join(dir_path, name)
+                                         for name in listing[dir_path]
+                                         if regex.match(name))
+
+        paths = sorted(set(path for paths in candidates.values()
+                           for path in paths))
+        stats = dict(zip(paths, pool.map(_stat_file, paths)))
+
+    finally:
+        pool.close()
+        pool.join()
+
+    return {
+        pattern: [(path,) + stats[path] for path in paths
+                  if stats[path] is not None]
+        for pattern, paths in candidates.items()
+    }
+
+
+def _scandir_files(dir_path):
+    """Return file names in directory
+
+    With `os.scandir` (or the `scandir` backport on Python 2), file type
+    comes with directory listing, no extra stat call for each entry.
+
+    """
+    if _scandir is None:
+        return _listdir(dir_path)
+    try:
+        return [entry.name for entry in _scandir(dir_path) if entry.is_file()]
+    except OSError:
+        return []
+
+
+_FRAME_NUMBER = re.compile(r"^(.*?)(\d+)(\D*)$")
+
+
+def frame_range(start, end, step=1):
+    """Return frame numbers from `start` to `end` by `step`
+
+    Fractional frames are rounded half up, like the frame number in rendered
+    file names.
+
+    """
+    step = step or 1
+    count = int((end - start) / float(step) + 1e-6) + 1
+
+    frames = list()
+    for i in range(max(0, count)):
+        frame = int(math.floor(start + i * step + 0.5))
+        if not frames or frame != frames[-1]:
+            frames.append(frame)
+
+    return frames
+
+
+def format_frame_list(frames):
+    """Format frame numbers into a frame list string like "1-5,8,10-12"
+
+    Consecutive frames are collapsed into ranges, this is the format that
+    both Deadline job and Maya batch render accept.
+
+    """
+    ranges = list()
+    for frame in sorted(set(frames)):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+
+    return ",".join(str(start) if start == end else "%d-%d" % (start, end)
+                    for start, end in ranges)
+
+
+class ImageSequence(object):
+    """Image sequence files in one directory
+
+    Example:
+        >> sequence = ImageSequence.scan("/renders/beauty", "beauty.####.exr")
+        >> sequence.entry_file_name
+        'beauty.%04d.exr'
+        >> sequence.missing(frame_range(1001, 1100, 2))
+        [1051]
+
+    Attributes:
+        dir_path (str): Sequence directory
+        head (str): File name before frame number
+        tail (str): File name after frame number
+        padding (int): Frame number padding, 0 if not padded
+        frames (dict): Frame number as key, file name as value
+
+    """
+
+    def __init__(self, dir_path, head, tail, padding, frames):
+        self.dir_path = dir_path
+        self.head = head
+        self.tail = tail
+        self.padding = padding
+        self.frames = frames
+
+    @classmethod
+    def scan(cls, dir_path, pattern=None):
+        """Scan the sequence in directory
+
+        If `pattern` has frame token (see `file_pattern_regex`), only file
+        names of the pattern will be parsed. Otherwise the largest sequence
+        in directory is taken.
+
+        Args:
+            dir_path (str): Sequence directory
+            pattern (str, optional): File name pattern, e.g. "img.####.exr"
+
+        Raises:
+            ValueError: If no sequence found
+
+        """
+        names = _scandir_files(dir_path)
+
+        token = _FILE_TOKEN.search(pattern or "")
+        regex = file_pattern_regex(pattern) if token else None
+
+        if regex is not None:
+            if token.group(1):
+                padding = len(token.group(1))
+            else:
+                padding = int(token.group(2) or 0)
+            head = pattern[:token.start()]
+            tail = pattern[token.end():]
+
+            frames = dict()
+            for name in names:
+                match = regex.match(name)
+                if match is not None:
+                    frames[int(match.group(1))] = name
+
+            sequences = [(head, tail, padding, frames)] if frames else []
+
+        else:
+            grouped = dict()
+            for name in names:
+                match = _FRAME_NUMBER.match(name)
+                if match is None:
+                    continue
+                head, number, tail = match.groups()
+                grouped.setdefault((head, tail), dict())[number] = name
+
+            sequences = list()
+            for (head, tail), numbers in grouped.items():
+                # Padded if any frame number has leading zero
+                padded = [len(n) for n in numbers if n.startswith("0")]
+                padding = min(padded) if padded else 0
+                frames = {int(n): name for n, name in numbers.items()}
+                sequences.append((head, tail, padding, frames))
+
+            sequences.sort(key=lambda seq: len(seq[-1]))
+
+        if not sequences:
+            raise ValueError("No sequence found in %s" % dir_path)
+
+        head, tail, padding, frames = sequences[-1]
+        return cls(dir_path, head, tail, padding, frames)
+
+    @property
+    def entry_file_name(self):
+        if self.padding:
+            return self.head + "%%0%dd" % self.padding + self.tail
+        return self.head + "%d" + self.tail
+
+    @property
+    def start(self):
+        return min(self.frames)
+
+    @property
+    def end(self):
+        return max(self.frames)
+
+    def missing(self, frames):
+        """Return sorted frames which have no file"""
+        return sorted(set(frames) - set(self.frames))
+
+    def file_paths(self, frames=None):
+        """Return file paths of frames, all frames if not given"""
+        if frames is None:
+            frames = sorted(self.frames)
+        return [os.path.join(self.dir_path, self.frames[frame])
+                for frame in frames]
+
+
+def hardlink_files(transfers, workers=8):
+    """Create hardlinks in bulk
+
+    Destination dirs are created once for each dir, then files are linked
+    by threads, which matters on high-latency network file systems.
+
+    Plain threads are used instead of `ThreadPool`, which takes a tenth of
+    a second to close on Python 2 and that is longer than linking a few
+    hundred files on local disk.
+
+    Args:
+        transfers (list): A list of (src, dst) pairs
+        workers (int, optional): Number of threads, default 8
+
+    """
+    import threading
+    from avalon.vendor import filelink
+
+    for dir_path in set(os.path.dirname(dst) for _, dst in transfers):
+        if not os.path.isdir(dir_path):
+            _makedirs(dir_path)
+
+    pending = iter(transfers)
+    lock = threading.Lock()
+    errors = list()
+
+    def link():
+        while not errors:
+            with lock:
+                transfer = next(pending, None)
+            if transfer is None:
+                return
+            try:
+                filelink.create(transfer[0], transfer[1], filelink.HARDLINK)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=link)
+               for _ in range(max(1, min(workers, len(transfers))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
 def plugins_by_range(base=1.5, offset=2, paths=None):
     """Find plugins by thier order which fits in range
 
@@ -235,10 +937,53 @@ def plugins_by_range(base=1.5, offset=2, paths=None):
     return plugins
 
 
+_B58_CHARS = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# All two digits of base58, index is the value of the two digits
+_B58_PAIRS = [a + b for a in _B58_CHARS for b in _B58_CHARS]
+_B58_PAIR_BASE = 58 ** 2
+_B58_QUAD_BASE = 58 ** 4
+# Convert big number 8 digits per divmod
+_B58_CHUNK_BASE = 58 ** 8
+
+if hasattr(int, "from_bytes"):
+    def _bytes_to_int(data):
+        return int.from_bytes(data, "big")
+else:
+    def _bytes_to_int(data):
+        return int(codecs.encode(data, "hex_codec") or b"0", 16)
+
+
+def _b58encode_int(value):
+    """Base58 encode non-negative integer, result has leading "1" padded
+    to a multiple of 8 digits
+
+    The value is split into chunks of 8 digits (58^8) from the lowest end,
+    then each chunk is converted into four digit pairs by lookup table. This
+    is linear to the length of the result, compares to one divmod and one
+    string concatenation per digit.
+
+    """
+    chunks = list()
+    while value:
+        value, chunk = divmod(value, _B58_CHUNK_BASE)
+        chunks.append(chunk)
+
+    pairs = _B58_PAIRS
+    pieces = list()
+    for chunk in reversed(chunks):
+        high, low = divmod(chunk, _B58_QUAD_BASE)
+        a, b = divmod(high, _B58_PAIR_BASE)
+        c, d = divmod(low, _B58_PAIR_BASE)
+        pieces.append(pairs[a] + pairs[b] + pairs[c] + pairs[d])
+
+    return "".join(pieces)
+
+
 class _C4Hasher(object):
 
     CHUNK_SIZE = 4096 * 10  # magic number
     PREFIX = "c4"
+    ID_LENGTH = 90
 
     def __init__(self):
         self.hash_obj = None
@@ -252,33 +997,38 @@ class _C4Hasher(object):
     def _b58encode(self, bytes):
         """Base58 Encode bytes to string
         """
-        b58chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-        b58base = 58
+        return _b58encode_int(_bytes_to_int(bytes)).lstrip("1") or "1"
 
-        long_value = int(codecs.encode(bytes, "hex_codec"), 16)
+    @classmethod
+    def encode(cls, digest):
+        """Return C4 ID of sha512 digest
 
-        result = ""
-        while long_value >= b58base:
-            div, mod = divmod(long_value, b58base)
-            result = b58chars[mod] + result
-            long_value = div
-
-        result = b58chars[long_value] + result
+        Arguments:
+            digest (bytes): sha512 digest
 
-        return result
+        """
+        b58_hash = _b58encode_int(_bytes_to_int(digest))
+        # sha512 digest takes at most 88 base58 digits, pad with "1" (zero)
+        return cls.PREFIX + b58_hash.rjust(cls.ID_LENGTH - 2, "1")
 
     def digest(self):
         """Return hash value of data added so far
         """
-        c4_id_length = 90
-        b58_hash = self._b58encode(self.hash_obj.digest())
+        return self.encode(self.hash_obj.digest())
 
-        padding = ""
-        if len(b58_hash) < (c4_id_length - 2):
-            padding = "1" * (c4_id_length - 2 - len(b58_hash))
+    def digest_many(self, data):
+        """Return hash values of each data, not affecting current session
 
-        c4id = self.PREFIX + padding + b58_hash
-        return c4id
+        Arguments:
+            data (list): A list of bytes, each will be hashed individually
+
+        Returns:
+            list: C4 IDs in the same order of input
+
+        """
+        sha512 = hashlib.sha512
+        encode = self.encode
+        return [encode(sha512(item).digest()) for item in data]
 
 
 class AssetHasher(_C4Hasher):
@@ -382,12 +1132,570 @@ def deep_update(d, update):
     return d
 
 
+MEMBERS_FORMAT = "reveries-members"
+MEMBERS_FORMAT_VERSION = 1
+
+
+def dump_members(members, file_path):
+    """Write setdress members data as line-delimited records
+
+    The first line is a header which contains the byte offset and size of
+    each member record by `containerId`, the rest are one JSON record per
+    line. This allows reading one member without parsing the whole file.
+
+    Arguments:
+        members (list): A list of member data dict
+        file_path (str): Output file path
+
+    """
+    records = list()
+    index = dict()
+    offset = 0
+
+    for data in members:
+        record = json.dumps(data, separators=(",", ":")) + "\n"
+        record = record.encode("utf-8")
+        index[data["containerId"]] = [offset, len(record)]
+        records.append(record)
+        offset += len(record)
+
+    header = {
+        "format": MEMBERS_FORMAT,
+        "version": MEMBERS_FORMAT_VERSION,
+        "count": len(records),
+        "index": index,
+    }
+
+    with open(file_path, "wb") as fp:
+        fp.write((json.dumps(header, separators=(",", ":")) +
+                  "\n").encode("utf-8"))
+        for record in records:
+            fp.write(record)
+
+
+class MembersReader(object):
+    """Lazy reader of line-delimited setdress members data
+
+    Only the header is parsed on open, member records are parsed on access.
+
+    Example:
+        >>> with MembersReader("/path/to/setdress.jsonl") as reader:
+        ...     data = reader.get("CON1f5b9b8a...")
+        ...     for data in reader:
+        ...         print(data["namespace"])
+
+    Arguments:
+        file_path (str): Members data file path
+
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+
+        header = json.loads(self._file.readline().decode("utf-8"))
+        if (not isinstance(header, dict) or
+                header.get("format") != MEMBERS_FORMAT):
+            self.close()
+            raise ValueError("Not a members data file: %s" % file_path)
+
+        self.version = header["version"]
+        self._index = header["index"]
+        self._data_start = self._file.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, container_id):
+        return container_id in self._index
+
+    def __iter__(self):
+        self._file.seek(self._data_start)
+        for line in self._file:
+            yield json.loads(line.decode("utf-8"))
+
+    def close(self):
+        self._file.close()
+
+    def container_ids(self):
+        """Return all member container ids in the order of records"""
+        return sorted(self._index, key=lambda id_: self._index[id_][0])
+
+    def get(self, container_id, default=None):
+        """Return member data by container id
+
+        Arguments:
+            container_id (str): Member container id
+            default (optional): Return this if member not found
+
+        """
+        try:
+            offset, size = self._index[container_id]
+        except KeyError:
+            return default
+
+        self._file.seek(self._data_start + offset)
+        return json.loads(self._file.read(size).decode("utf-8"))
+
+
+def load_members(file_path):
+    """Load all setdress members data from file
+
+    Support both line-delimited members data and legacy JSON list.
+
+    Arguments:
+        file_path (str): Members data file path
+
+    Returns:
+        list: A list of member data dict
+
+    """
+    if file_path.endswith(".json"):
+        with open(file_path, "r") as fp:
+            return json.load(fp)
+
+    with MembersReader(file_path) as reader:
+        return list(reader)
+
+
+def convert_members_file(file_path, remove=False):
+    """Convert legacy members JSON file into line-delimited members data
+
+    For upgrading setdress packages which published before the
+    line-delimited format was introduced.
+
+    Arguments:
+        file_path (str): Legacy members JSON file path (`.json`)
+        remove (bool, optional): Remove legacy file after converted,
+            default False.
+
+    Returns:
+        str: Converted file path (`.jsonl`)
+
+    """
+    output = os.path.splitext(file_path)[0] + ".jsonl"
+    dump_members(load_members(file_path), output)
+
+    if remove:
+        os.remove(file_path)
+
+    return output
+
+
+class ContentStore(object):
+    """Content-addressed file store under project root
+
+    Each file is stored once in `<root>/<project>/.store` by its C4 id and
+    hardlinked into version directories, so files that stay the same
+    between versions share storage and integrate by linking instead of
+    copying.
+
+    Stored files are set to read-only, because editing one of them through
+    any hardlink will change all versions that share it.
+
+    The representations which files are in store will have `storeManifest`
+    in their data, a list of [relative path, C4 id] pairs, which is used
+    for reference-counting in `collect_garbage`.
+
+    Example:
+        >>> store = ContentStore()
+        >>> manifest = store.ingest_dir("/path/to/staging", "/path/to/v002")
+
+    """
+
+    DIRNAME = ".store"
+
+    def __init__(self, root=None, project=None):
+        root = root or avalon.api.registered_root()
+        project = project or Session["AVALON_PROJECT"]
+        self.root = os.path.join(root, project, self.DIRNAME)
+
+    @classmethod
+    def enabled(cls, project):
+        """Is content store enabled in the project document
+
+        Args:
+            project (dict): Project document
+
+        """
+        return bool(project["data"].get("contentStore"))
+
+    def path(self, c4_id):
+        """Return file path of the C4 id in store"""
+        return os.path.join(self.root, c4_id[2:4], c4_id)
+
+    def add(self, file_path, c4_id=None):
+        """Store file if its content is not yet in store
+
+        The file is copied into a temporary file in store first, then being
+        renamed, so the store will not have any incomplete file.
+
+        Args:
+            file_path (str): File to store
+            c4_id (str, optional): Pre-computed C4 id of the file
+
+        Returns:
+            str: C4 id of the file
+
+        """
+        c4_id = c4_id or hash_file(file_path)
+        stored = self.path(c4_id)
+        if os.path.isfile(stored):
+            return c4_id
+
+        _makedirs(os.path.dirname(stored))
+        fd, temp = tempfile.mkstemp(prefix=".tmp_",
+                                    dir=os.path.dirname(stored))
+        os.close(fd)
+        try:
+            shutil.copyfile(file_path, temp)
+            os.chmod(temp, 0o444)
+            if os.path.isfile(stored):
+                # Stored by others in the meantime
+                os.remove(temp)
+            else:
+                os.rename(temp, stored)
+        except Exception:
+            if os.path.isfile(temp):
+                os.remove(temp)
+            raise
+
+        return c4_id
+
+    def link(self, c4_id, dst):
+        """Hardlink stored file to destination"""
+        from avalon.vendor import filelink
+
+        _makedirs(os.path.dirname(dst))
+        filelink.create(self.path(c4_id), dst, filelink.HARDLINK)
+
+    def ingest_file(self, src, dst, c4_id=None):
+        """Store file and hardlink it to destination
+
+        Returns:
+            str: C4 id of the file
+
+        """
+        c4_id = self.add(src, c4_id)
+        self.link(c4_id, dst)
+        return c4_id
+
+    def ingest_dir(self, src, dst, workers=8):
+        """Store all files in directory and hardlink them to destination
+
+        Files are hashed concurrently.
+
+        Args:
+            src (str): Source directory
+            dst (str): Destination directory, must not exists
+            workers (int, optional): Number of threads for hashing
+
+        Returns:
+            list: Manifest, a list of [relative path, C4 id]
+
+        """
+        if os.path.exists(dst):
+            raise OSError(errno.EEXIST, "Destination existed.", dst)
+
+        relative_paths = list()
+        for root, dirs, files in os.walk(src):
+            for name in files:
+                path = os.path.join(root, name)
+                relative_paths.append(os.path.relpath(path, src))
+
+        _makedirs(dst)
+
+        relative_paths.sort()
+        hashes = hash_files([os.path.join(src, path)
+                             for path in relative_paths], workers)
+
+        manifest = list()
+        for path in relative_paths:
+            c4_id = self.ingest_file(os.path.join(src, path),
+                                     os.path.join(dst, path),
+                                     hashes[os.path.join(src, path)])
+            manifest.append([path.replace("\\", "/"), c4_id])
+
+        return manifest
+
+    def referenced_ids(self):
+        """Count references of each C4 id from representations in database
+
+        Returns:
+            dict: C4 id as key, reference count as value
+
+        """
+        counts = dict()
+        representations = io.find({"type": "representation",
+                                   "data.storeManifest": {"$exists": True}},
+                                  projection={"data.storeManifest": True})
+        for representation in representations:
+            for _, c4_id in representation["data"]["storeManifest"]:
+                counts[c4_id] = counts.get(c4_id, 0) + 1
+
+        return counts
+
+    def collect_garbage(self, grace=86400, dry_run=False):
+        """Remove stored files that no representation is referencing
+
+        Args:
+            grace (int, optional): Files that stored within this amount of
+                seconds will be kept, for they may belong to publishes that
+                are still in progress. Default one day.
+            dry_run (bool, optional): Only return, not removing anything
+
+        Returns:
+            list: Removed (or to be removed if `dry_run`) file paths
+
+        """
+        counts = self.referenced_ids()
+        deadline = time.time() - grace
+
+        removed = list()
+        for root, dirs, files in os.walk(self.root):
+            for name in files:
+                if counts.get(name):
+                    continue
+
+                path = os.path.join(root, name)
+                if os.path.getmtime(path) > deadline:
+                    continue
+
+                removed.append(path)
+                if not dry_run:
+                    os.chmod(path, 0o644)
+                    os.remove(path)
+
+        return removed
+
+
+def _makedirs(dir_path):
+    try:
+        os.makedirs(dir_path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+class TransferQueue(object):
+    """Transfer files to publish space in background threads
+
+    Extractors submit package dirs, files and hardlinks as soon as they are
+    extracted, so copying overlaps with the extraction of other
+    representations and instances. Integrator waits for the transfers of
+    the instance and only writes database.
+
+    Jobs are the same as `IntegrateAvalonSubset.transfers`, "packages",
+    "files" and "hardlinks". A job which source is the destination of a
+    previous job, e.g. a hardlink to a file that is still copying, or which
+    destination is inside a package dir that is still copying, waits for
+    that job first.
+
+    The results of each instance are returned by `wait`, which are manifest
+    or C4 id if content store is used, see `ContentStore`.
+
+    Example:
+        >> queue = TransferQueue()
+        >> queue.submit("instanceA", "files", "/path/to/src", "/path/to/dst")
+        >> queue.wait("instanceA")
+        {('files', '/path/to/src', '/path/to/dst'): None}
+
+    """
+
+    def __init__(self, store=None, workers=4):
+        import threading
+
+        self.store = store
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._jobs = dict()  # owner: [(key, async result)]
+        self._targets = dict()  # destination: async result
+        self._package_dirs = dict()  # package destination: async result
+        self._cancelled = False
+
+    @classmethod
+    def enabled(cls, project):
+        """Is background transfer enabled in the project document
+
+        Args:
+            project (dict): Project document
+
+        """
+        return bool(project["data"].get("asyncTransfer"))
+
+    @staticmethod
+    def normpath(path):
+        return os.path.abspath(os.path.normpath(os.path.expandvars(path)))
+
+    def submit(self, owner, job, src, dst, move=False):
+        """Submit one transfer
+
+        Args:
+            owner (str): Instance name
+            job (str): "packages", "files" or "hardlinks"
+            src (str): Source path
+            dst (str): Destination path
+            move (bool, optional): Move package dir instead of copy
+
+        Returns:
+            tuple: Transfer key (job, src, dst) in normalized path, or None
+                if source and destination are the same.
+
+        """
+        src = self.normpath(src)
+        dst = self.normpath(dst)
+        if src == dst:
+            return None
+
+        key = (job, src, dst)
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(max(1, self.workers))
+
+            depends = self._dependencies(src, dst)
+            result = self._pool.apply_async(self._transfer,
+                                            (key, move, depends))
+            self._jobs.setdefault(owner, list()).append((key, result))
+            self._targets[dst] = result
+            if job == "packages":
+                self._package_dirs[dst] = result
+
+        return key
+
+    def _dependencies(self, src, dst):
+        """Return transfers that the job should wait for
+
+        Source that is a previous destination is an exact lookup, and only
+        the parent dirs of source and destination are looked up in package
+        destinations, so submitting is not slowed down by the number of
+        queued files.
+
+        """
+        depends = list()
+        if src in self._targets:
+            depends.append(self._targets[src])
+
+        if self._package_dirs:
+            for path in (src, dst):
+                parent = os.path.dirname(path)
+                while parent and parent != path:
+                    if parent in self._package_dirs:
+                        depends.append(self._package_dirs[parent])
+                        break
+                    path, parent = parent, os.path.dirname(parent)
+
+        return depends
+
+    def _transfer(self, key, move, depends):
+        from avalon.vendor import filelink
+
+        for depend in depends:
+            # Submitted earlier, so it's either running or done
+            depend.wait()
+        if self._cancelled:
+            return None
+
+        job, src, dst = key
+
+        if job == "packages":
+            if os.path.exists(dst):
+                raise OSError(errno.EEXIST, "Representation dir existed, "
+                              "this should not happen.", dst)
+            if self.store is not None:
+                return self.store.ingest_dir(src, dst)
+
+            _makedirs(os.path.dirname(dst))
+            if move:
+                try:
+                    os.rename(src, dst)
+                    return None
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+            shutil.copytree(src, dst)
+
+        elif job == "files":
+            if self.store is not None:
+                return self.store.ingest_file(src, dst)
+
+            _makedirs(os.path.dirname(dst))
+            shutil.copyfile(src, dst)
+
+        elif job == "hardlinks":
+            _makedirs(os.path.dirname(dst))
+            filelink.create(src, dst, filelink.HARDLINK)
+
+        else:
+            raise ValueError("Unknown transfer job %r" % job)
+
+        return None
+
+    def wait(self, owner):
+        """Wait for all transfers of the owner
+
+        Args:
+            owner (str): Instance name
+
+        Returns:
+            dict: Transfer key as key, transfer result as value
+
+        Raises:
+            Exception: The first error of failed transfers, raised after all
+                transfers of the owner are finished.
+
+        """
+        with self._lock:
+            jobs = self._jobs.pop(owner, [])
+
+        results = dict()
+        error = None
+        for key, result in jobs:
+            try:
+                results[key] = result.get()
+            except Exception as e:
+                error = error or e
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def cancel(self):
+        """Skip all transfers that have not yet started"""
+        self._cancelled = True
+
+    def close(self):
+        """Wait for all transfers and stop the threads"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
 class AssetGraber(object):
     """Copy asset and it's dependencies to another project
 
     This is used for copying asset representation and all it's dependency
     assets from current project to another project.
 
+    The grab runs in two phases:
+        1. Resolve all documents of representations and their dependencies
+           with batched queries, and insert the missing ones into the
+           destination project.
+        2. Copy representation packages concurrently.
+
+    The progress is written into a journal file, if the grab is
+    interrupted, grab the same representations again will resume from
+    where it stopped.
+
     Example:
         >>> # Init with the name of the destination project
         >>> graber = AssetGraber("other_project")
@@ -395,11 +1703,20 @@ class AssetGraber(object):
         >>> graber.grab("5c6159dbed9f0d0509a34e27")
         >>> # Grab another...
         >>> graber.grab("5c6159dbed9f0d0509a34e38")
+        >>> # Or grab many at once
+        >>> graber.grab(["5c6159dbed9f0d0509a34e27",
+        ...              "5c6159dbed9f0d0509a34e38"])
 
     """
 
-    def __init__(self, project):
+    JOURNAL = ".grab_journal.jsonl"
+
+    def __init__(self, project, workers=4, journal=None):
         self.project = project
+        self.workers = workers
+        self.journal = journal or os.path.join(avalon.api.registered_root(),
+                                               project,
+                                               self.JOURNAL)
         self._project = None
         self._mongo_client = None
         self._database = None
@@ -410,14 +1727,35 @@ class AssetGraber(object):
         """Copy representation to project
 
         Args:
-            representation_id (str or ObjectId): representation id
+            representation_id (str or ObjectId or list): representation id,
+                or a list of ids
 
         """
         if not self._connected:
             self._connect()
-        if isinstance(representation_id, str):
-            representation_id = io.ObjectId(representation_id)
-        self._copy_representations(representation_id)
+
+        if not isinstance(representation_id, (list, tuple, set)):
+            representation_id = [representation_id]
+
+        representation_ids = sorted(set(
+            io.ObjectId(_id) if isinstance(_id, str) else _id
+            for _id in representation_id
+        ))
+
+        grabbing = [str(_id) for _id in representation_ids]
+        packages, done = self._read_journal(grabbing)
+
+        if packages is None:
+            # Phase 1
+            packages = self._copy_documents(representation_ids)
+            self._write_journal({"grab": grabbing, "packages": packages},
+                                new=True)
+
+        # Phase 2
+        self._copy_packages([pair for pair in packages
+                             if pair[1] not in done])
+
+        os.remove(self.journal)
 
     def _connect(self):
         timeout = int(Session["AVALON_TIMEOUT"])
@@ -427,70 +1765,204 @@ class AssetGraber(object):
         self._collection = self._database[self.project]
         self._connected = True
 
-        self._project = self._find_one({"type": "project"})
-
-    def _insert_one(self, item):
-        assert isinstance(item, dict), "item must be of type <dict>"
-        return self._collection.insert_one(item)
-
-    def _find_one(self, filter, projection=None, sort=None):
-        assert isinstance(filter, dict), "filter must be <dict>"
-        return self._collection.find_one(
-            filter=filter,
-            projection=projection,
-            sort=sort
-        )
-
-    def _copy_representations(self, representation_id):
-        """Copy all documents and files of representation and dependencies"""
-        # Representation
-        representation = self._find_one({"_id": representation_id})
-        if not representation:
-            representation = io.find_one({"_id": representation_id})
-            self._insert_one(representation)
-
-            # Version
-            version = io.find_one({"_id": representation["parent"]})
-            if not self._find_one({"_id": version["_id"]}):
-                self._insert_one(version)
-
-                # Subset
-                subset = io.find_one({"_id": version["parent"]})
-                if not self._find_one({"_id": subset["_id"]}):
-                    self._insert_one(subset)
-
-                    # Asset
-                    asset = io.find_one({"_id": subset["parent"]})
-                    if not self._find_one({"_id": asset["_id"]}):
-                        asset["parent"] = self._project["_id"]
-                        self._insert_one(asset)
-
-                        # Asset Visual Parent
-                        parent_id = asset["data"]["visualParent"]
-                        if parent_id:
-                            parent_id = io.ObjectId(parent_id)
-                            if not self._find_one({"_id": parent_id}):
-                                parent_asset = io.find_one({"_id": parent_id})
-                                parent_asset["parent"] = self._project["_id"]
-                                self._insert_one(parent_asset)
-
-                # Dependencies
-                for dependency_id in version["data"]["dependencies"]:
-                    dependency_id = io.ObjectId(dependency_id)
-                    for representation_ in io.find({"parent": dependency_id}):
-                        self._copy_representations(representation_["_id"])
-
-        # Copy package
-        parents = io.parenthood(representation)
-        src_package = get_representation_path_(representation, parents)
-        parents = parents[:-1] + [self._project]
-        dst_package = get_representation_path_(representation, parents)
-        self._copy_dir(src_package, dst_package)
+        self._project = self._collection.find_one({"type": "project"})
+
+    def _read_journal(self, grabbing):
+        """Return packages and done destinations from unfinished grab"""
+        if not os.path.isfile(self.journal):
+            return None, set()
+
+        packages = None
+        done = set()
+        with open(self.journal, "r") as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Incomplete line from interruption
+                    break
+                if "grab" in entry:
+                    if entry["grab"] != grabbing:
+                        # Not the same grab, start over
+                        return None, set()
+                    packages = entry["packages"]
+                else:
+                    done.add(entry["done"])
+
+        if packages is not None:
+            print("Resuming grab, %d of %d packages done."
+                  % (len(done), len(packages)))
+
+        return packages, done
+
+    def _write_journal(self, entry, new=False):
+        _makedirs(os.path.dirname(self.journal))
+        with open(self.journal, "w" if new else "a") as fp:
+            fp.write(json.dumps(entry) + "\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    def _existing_ids(self, ids):
+        """Return ids of documents that already exist in destination"""
+        return set(doc["_id"] for doc in self._collection.find(
+            {"_id": {"$in": list(ids)}}, projection={"_id": True}))
+
+    def _find_missing(self, ids, found):
+        """Find documents from current project which not in destination"""
+        ids = [_id for _id in set(ids) if _id not in found]
+        if not ids:
+            return []
+
+        existing = self._existing_ids(ids)
+        missing = [_id for _id in ids if _id not in existing]
+        if not missing:
+            return []
+
+        docs = list(io.find({"_id": {"$in": missing}}))
+        for doc in docs:
+            found[doc["_id"]] = doc
+
+        return docs
+
+    def _copy_documents(self, representation_ids):
+        """Insert all missing documents of representations and dependencies
+
+        Returns:
+            list: [source package, destination package] of all resolved
+                representations
+
+        """
+        found = dict()
+        assets = list()
+        subsets = list()
+        versions = list()
+        new_representations = list()
+        representations = list()
+        visited = set()
+
+        pending = representation_ids
+        while pending:
+            ids = [_id for _id in set(pending) if _id not in visited]
+            visited.update(ids)
+            if not ids:
+                break
+
+            docs = list(io.find({"_id": {"$in": ids}}))
+            existing = self._existing_ids(ids)
+            new_docs = [doc for doc in docs if doc["_id"] not in existing]
+            for doc in new_docs:
+                found[doc["_id"]] = doc
+
+            representations += docs
+            new_representations += new_docs
+
+            # Parents of the representations that are not in destination.
+            # Dependencies are followed from all representations, including
+            # the existing ones, in case previous grab was interrupted before
+            # their dependencies were inserted.
+            version_ids = set(doc["parent"] for doc in docs)
+            new_versions = self._find_missing(version_ids, found)
+            new_subsets = self._find_missing(
+                (doc["parent"] for doc in new_versions), found)
+            new_assets = self._find_missing(
+                (doc["parent"] for doc in new_subsets), found)
+            new_assets += self._find_missing(
+                (io.ObjectId(doc["data"]["visualParent"])
+                 for doc in new_assets if doc["data"].get("visualParent")),
+                found)
+
+            versions += new_versions
+            subsets += new_subsets
+            assets += new_assets
+
+            # Dependencies
+            dependency_ids = [
+                io.ObjectId(_id) for doc in io.find(
+                    {"_id": {"$in": list(version_ids)}},
+                    projection={"data.dependencies": True})
+                for _id in doc["data"]["dependencies"]
+            ] if version_ids else []
+
+            pending = [doc["_id"] for doc in io.find(
+                {"type": "representation", "parent": {"$in": dependency_ids}},
+                projection={"_id": True})] if dependency_ids else []
+
+        for asset in assets:
+            asset["parent"] = self._project["_id"]
+
+        # Insert from top to bottom, so there will be no orphan document
+        for docs in (assets, subsets, versions, new_representations):
+            if docs:
+                self._collection.insert_many(docs)
+
+        return self._package_paths(representations)
+
+    def _package_paths(self, representations):
+        """Compose package paths with batched parenthood queries"""
+        docs = dict()
+        ids = set(doc["parent"] for doc in representations)
+        for _ in range(3):  # version, subset, asset
+            missing = [_id for _id in ids if _id not in docs]
+            if missing:
+                for doc in io.find({"_id": {"$in": missing}}):
+                    docs[doc["_id"]] = doc
+            ids = set(docs[_id]["parent"] for _id in ids)
+
+        source_project = io.find_one({"type": "project"})
+
+        packages = list()
+        for representation in representations:
+            version = docs[representation["parent"]]
+            subset = docs[version["parent"]]
+            asset = docs[subset["parent"]]
+
+            parents = [version, subset, asset]
+            src = get_representation_path_(representation,
+                                           parents + [source_project])
+            dst = get_representation_path_(representation,
+                                           parents + [self._project])
+            packages.append([src, dst])
+
+        return packages
+
+    def _copy_packages(self, packages):
+        """Copy packages concurrently and record progress in journal"""
+        import threading
+
+        lock = threading.Lock()
+
+        def copy(pair):
+            src, dst = pair
+            self._copy_dir(src, dst)
+            with lock:
+                self._write_journal({"done": dst})
+
+        pool = ThreadPool(max(1, self.workers))
+        try:
+            pool.map(copy, packages)
+        finally:
+            pool.close()
+            pool.join()
 
     def _copy_dir(self, src, dst):
-        """ Copy given source to destination"""
+        """ Copy given source to destination
+
+        Copy into a temporary dir next to destination then rename, so an
+        interrupted copy will not leave an incomplete package.
+
+        """
+        if os.path.isdir(dst):
+            print("Representation dir existed.")
+            return
+
+        temp = dst + ".grabbing"
+        if os.path.isdir(temp):
+            # Left from previous interrupted grab
+            shutil.rmtree(temp)
+
         try:
-            shutil.copytree(src, dst)
+            shutil.copytree(src, temp)
+            os.rename(temp, dst)
         except OSError as e:
             if e.errno == errno.EEXIST:
                 print("Representation dir existed.")
@@ -0,0 +1,252 @@
+"""Benchmark pure-Python hot paths of reveries
+
+Run from the repository root:
+
+    $ python tests/benchmarks/bench_reveries.py           # compare
+    $ python tests/benchmarks/bench_reveries.py --update  # new baseline
+    $ python tests/benchmarks/bench_reveries.py lib.iter_uri
+
+Results are compared with `baseline.json` next to this file. Timings are
+machine dependent, update the baseline on the machine that runs the
+comparison before starting any performance work.
+
+"""
+import os
+import sys
+import types
+
+from harness import benchmark, main
+import generators
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "baseline.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+@benchmark("utils.AssetHasher.add_file", repeat=5)
+def bench_hasher_add_file(tempdir):
+    from reveries.utils import AssetHasher
+
+    path, = generators.make_file_tree(tempdir,
+                                      file_count=1,
+                                      file_size=16 * 1024 * 1024,
+                                      depth=0)
+
+    def run():
+        hasher = AssetHasher()
+        hasher.add_file(path)
+        hasher.digest()
+
+    return run
+
+
+@benchmark("utils.AssetHasher.add_dir", repeat=5)
+def bench_hasher_add_dir(tempdir):
+    from reveries.utils import AssetHasher
+
+    generators.make_file_tree(tempdir, file_count=500, file_size=16 * 1024)
+
+    def run():
+        hasher = AssetHasher()
+        hasher.add_dir(tempdir)
+        hasher.digest()
+
+    return run
+
+
+@benchmark("utils._C4Hasher._b58encode", repeat=5)
+def bench_b58encode(tempdir):
+    from reveries.utils import _C4Hasher
+
+    hasher = _C4Hasher()
+    digests = generators.make_digests(count=2000)
+
+    def run():
+        for digest in digests:
+            hasher._b58encode(digest)
+
+    return run
+
+
+@benchmark("utils._C4Hasher.digest_many", repeat=5)
+def bench_digest_many(tempdir):
+    from reveries.utils import _C4Hasher
+
+    hasher = _C4Hasher()
+    data = generators.make_digests(count=2000)
+
+    def run():
+        hasher.digest_many(data)
+
+    return run
+
+
+@benchmark("utils.deep_update", number=10, repeat=5)
+def bench_deep_update(tempdir):
+    from reveries.utils import deep_update
+
+    data = generators.make_nested_dict(width=8, depth=4, seed=0)
+    update = generators.make_nested_dict(width=8, depth=4, seed=1)
+
+    def run():
+        deep_update(data, update)
+
+    return run
+
+
+@benchmark("lib.matrix_equals", repeat=5)
+def bench_matrix_equals(tempdir):
+    from reveries.lib import matrix_equals, DEFAULT_MATRIX
+
+    matrices = generators.make_matrices(count=20000)
+
+    def run():
+        for matrix in matrices:
+            matrix_equals(DEFAULT_MATRIX, matrix, 1e-10)
+
+    return run
+
+
+@benchmark("lib.iter_uri", repeat=5)
+def bench_iter_uri(tempdir):
+    from reveries.lib import iter_uri
+
+    paths = generators.make_dag_paths(count=20000, depth=8)
+
+    def run():
+        for path in paths:
+            for _ in iter_uri(path, "|"):
+                pass
+
+    return run
+
+
+@benchmark("utils.plugins_by_range", repeat=5)
+def bench_plugins_by_range(tempdir):
+    from reveries.utils import plugins_by_range
+
+    plugin_dir = generators.make_plugin_dir(tempdir, count=100)
+
+    def run():
+        plugins_by_range(paths=[plugin_dir])
+
+    return run
+
+
+@benchmark("plugins.parse_contract_environment", number=10, repeat=5)
+def bench_parse_contract_environment(tempdir):
+    import pyblish.api
+    from reveries.plugins import parse_contract_environment
+
+    os.environ.update(generators.make_contract_environment(
+        instance_count=200))
+    devnull = open(os.devnull, "w")
+
+    def run():
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            parse_contract_environment(pyblish.api.Context())
+        finally:
+            sys.stdout = stdout
+
+    return run
+
+
+@benchmark("utils.ImageSequence.scan", number=5, repeat=5)
+def bench_sequence_scan(tempdir):
+    from reveries.utils import ImageSequence, frame_range
+
+    patterns = generators.make_image_sequence(tempdir,
+                                              frame_count=5000,
+                                              aovs=["beauty", "diffuse"])
+    frames = frame_range(1001, 6000)
+
+    def run():
+        for pattern in patterns.values():
+            sequence = ImageSequence.scan(*os.path.split(pattern))
+            assert not sequence.missing(frames)
+
+    return run
+
+
+@benchmark("utils.hardlink_files", number=1, repeat=5)
+def bench_hardlink_files(tempdir):
+    from reveries.utils import ImageSequence, hardlink_files
+
+    patterns = generators.make_image_sequence(tempdir,
+                                              frame_count=2000,
+                                              aovs=["beauty", "diffuse"])
+    sources = list()
+    for aov, pattern in patterns.items():
+        sequence = ImageSequence.scan(*os.path.split(pattern))
+        sources += [(aov, path) for path in sequence.file_paths()]
+
+    publish = os.path.join(tempdir, "publish")
+    runs = [0]
+
+    def run():
+        runs[0] += 1
+        target = publish + str(runs[0])
+        hardlink_files([
+            (path, os.path.join(target, aov, os.path.basename(path)))
+            for aov, path in sources
+        ])
+
+    return run
+
+
+def load_plugin(path, name):
+    """Load plugin class from file without discovering the whole dir"""
+    from reveries.vendor import six
+
+    module = types.ModuleType(os.path.splitext(os.path.basename(path))[0])
+    module.__file__ = path
+    with open(path) as f:
+        six.exec_(f.read(), module.__dict__)
+
+    return getattr(module, name)
+
+
+@benchmark("IntegrateAvalonSubset.integrate", repeat=5)
+def bench_integrate(tempdir):
+    path = os.path.join(REPO_ROOT,
+                        "plugins", "global", "publish",
+                        "integrate_avalon_subset.py")
+    IntegrateAvalonSubset = load_plugin(path, "IntegrateAvalonSubset")
+
+    transfers = generators.make_transfers(tempdir,
+                                          package_count=5,
+                                          file_count=50)
+    publish = os.path.join(tempdir, "publish")
+    runs = [0]
+
+    def run():
+        # Integrate into a new publish dir each time
+        runs[0] += 1
+        target = publish + str(runs[0])
+
+        plugin = IntegrateAvalonSubset()
+        plugin.store = None
+        plugin.move_packages = False
+        plugin.representation_dirs = dict()
+        plugin.transferred = dict()
+        plugin.transfers = {
+            job: [(src, dst.replace(publish, target, 1))
+                  for src, dst in transfers[job]]
+            for job in transfers
+        }
+        plugin.integrate()
+
+    return run
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    sys.exit(main(BASELINE))
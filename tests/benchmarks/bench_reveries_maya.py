@@ -0,0 +1,179 @@
+"""Benchmark `reveries.maya.lib` hot paths on a fake Maya scene
+
+This runs without Maya, `maya.cmds` and `maya.api.OpenMaya` are provided by
+`reveries.maya.vendor.maya_mock`. Run from the repository root:
+
+    $ python tests/benchmarks/bench_reveries_maya.py
+    $ python tests/benchmarks/bench_reveries_maya.py --update
+
+Scene sizes (node count) are set by `REVERIES_BENCH_MAYA_SCALES`, default
+is "2000,10000". For example, to see how they scale up to a million nodes:
+
+    $ REVERIES_BENCH_MAYA_SCALES=10000,100000,1000000 \\
+        python tests/benchmarks/bench_reveries_maya.py maya.lsAttrs[1000000]
+
+Results are compared with `baseline.json` next to this file, see
+`bench_reveries.py`.
+
+"""
+import os
+import sys
+import types
+import importlib
+
+from harness import benchmark, main
+import generators
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "baseline.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+SCALES = [int(scale) for scale in os.environ.get(
+    "REVERIES_BENCH_MAYA_SCALES", "2000,10000").split(",")]
+
+
+def import_maya_lib():
+    """Import `reveries.maya.lib` with fake Maya
+
+    The `reveries.maya` package requires a running Maya session (menu, Qt,
+    avalon.maya), so it's registered as a bare package here and only the
+    `lib` module is imported.
+
+    """
+    if "reveries.maya.lib" in sys.modules:
+        return sys.modules["reveries.maya.lib"]
+
+    import reveries
+
+    if "reveries.maya" not in sys.modules:
+        package = types.ModuleType("reveries.maya")
+        package.__path__ = [os.path.join(reveries.PACKAGE_DIR, "maya")]
+        sys.modules["reveries.maya"] = package
+
+    from reveries.maya.vendor import maya_mock
+    maya_mock.install()
+
+    return importlib.import_module("reveries.maya.lib")
+
+
+def new_scene(node_count):
+    from maya import cmds
+
+    cmds.file(new=True, force=True)
+    return generators.build_maya_scene(cmds, node_count=node_count)
+
+
+def register(name, repeat=3):
+    """Register benchmark for each scale, the setup takes node count"""
+    def decorator(setup):
+        for scale in SCALES:
+            benchmark("%s[%d]" % (name, scale), repeat=repeat)(
+                lambda tempdir, scale=scale: setup(scale))
+        return setup
+    return decorator
+
+
+@register("maya.lsAttrs")
+def bench_ls_attrs(node_count):
+    lib = import_maya_lib()
+    from maya import cmds
+
+    scene = new_scene(node_count)
+    target = scene["transforms"][len(scene["transforms"]) // 2]
+    value = cmds.getAttr(target + "." + lib.AVALON_ID_ATTR_LONG)
+
+    assert lib.lsAttrs({lib.AVALON_ID_ATTR_LONG: value}) == [target]
+
+    def run():
+        lib.lsAttrs({lib.AVALON_ID_ATTR_LONG: value})
+
+    return run
+
+
+@register("maya.serialise_shaders")
+def bench_serialise_shaders(node_count):
+    lib = import_maya_lib()
+
+    scene = new_scene(node_count)
+    transforms = scene["transforms"]
+
+    assert lib.serialise_shaders(transforms)
+
+    def run():
+        lib.serialise_shaders(transforms)
+
+    return run
+
+
+@register("maya.apply_shaders")
+def bench_apply_shaders(node_count):
+    lib = import_maya_lib()
+
+    scene = new_scene(node_count)
+    # Re-apply the shading of the first asset, like loading look onto a
+    # model in a large scene
+    asset = [node for node in scene["transforms"]
+             if node.startswith(scene["assets"][0] + "|")]
+    relationships = lib.serialise_shaders(asset)
+
+    devnull = open(os.devnull, "w")
+
+    def run():
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            lib.apply_shaders(relationships)
+        finally:
+            sys.stdout = stdout
+
+    return run
+
+
+@register("maya.is_visible")
+def bench_is_visible(node_count):
+    lib = import_maya_lib()
+
+    shapes = new_scene(node_count)["shapes"]
+
+    def run():
+        for shape in shapes:
+            lib.is_visible(shape)
+
+    return run
+
+
+@register("maya.filter_mesh_parenting")
+def bench_filter_mesh_parenting(node_count):
+    lib = import_maya_lib()
+
+    transforms = new_scene(node_count)["transforms"]
+
+    def run():
+        lib.filter_mesh_parenting(transforms)
+
+    return run
+
+
+@register("maya.get_highest_in_hierarchy")
+def bench_get_highest_in_hierarchy(node_count):
+    lib = import_maya_lib()
+    from maya import cmds
+
+    scene = new_scene(node_count)
+    nodes = cmds.ls(scene["assets"] + scene["transforms"], long=True)
+
+    def run():
+        lib.get_highest_in_hierarchy(nodes)
+
+    return run
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    sys.exit(main(BASELINE))
@@ -0,0 +1,287 @@
+"""Synthetic data generators for benchmarks
+
+All generators are seeded, so the same arguments always produce the same
+data and benchmark results are comparable between runs.
+
+"""
+import os
+import random
+
+
+def make_file_tree(root, file_count=200, file_size=64 * 1024, depth=3,
+                   seed=0):
+    """Write `file_count` files of random bytes into nested dirs under `root`
+
+    Returns:
+        list: File paths
+
+    """
+    rand = random.Random(seed)
+    paths = list()
+
+    for i in range(file_count):
+        dirs = ["dir%d" % rand.randint(0, 3) for _ in range(depth)]
+        dir_path = os.path.join(root, *dirs)
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+
+        path = os.path.join(dir_path, "file.%04d.bin" % i)
+        with open(path, "wb") as fp:
+            fp.write(bytearray(rand.getrandbits(8) for _ in range(256))
+                     * (file_size // 256))
+        paths.append(path)
+
+    return paths
+
+
+def make_digests(count=1000, seed=0):
+    """Return `count` of random 64 bytes, the size of sha512 digest"""
+    rand = random.Random(seed)
+    return [bytes(bytearray(rand.getrandbits(8) for _ in range(64)))
+            for _ in range(count)]
+
+
+def make_nested_dict(width=8, depth=4, seed=0, prefix="key"):
+    """Return a dict tree with `width` keys in each of `depth` levels"""
+    rand = random.Random(seed)
+
+    def build(level):
+        if level == depth:
+            return rand.random()
+        return {"%s%d" % (prefix, i): build(level + 1)
+                for i in range(width)}
+
+    return build(0)
+
+
+def make_matrices(count=10000, non_identity_ratio=0.1, seed=0):
+    """Return a list of 4x4 matrices as flat lists of 16 floats
+
+    Most of them are identity matrix, like a freezed model.
+
+    """
+    rand = random.Random(seed)
+    identity = [1.0, 0.0, 0.0, 0.0,
+                0.0, 1.0, 0.0, 0.0,
+                0.0, 0.0, 1.0, 0.0,
+                0.0, 0.0, 0.0, 1.0]
+
+    matrices = list()
+    for _ in range(count):
+        matrix = list(identity)
+        if rand.random() < non_identity_ratio:
+            matrix[12 + rand.randint(0, 2)] = rand.random()
+        matrices.append(matrix)
+
+    return matrices
+
+
+def make_dag_paths(count=10000, depth=8, seed=0):
+    """Return `count` of Maya long names with `depth` levels"""
+    rand = random.Random(seed)
+    return ["|" + "|".join("node%d" % rand.randint(0, 99)
+                           for _ in range(depth))
+            for _ in range(count)]
+
+
+PLUGIN_TEMPLATE = """
+import pyblish.api
+
+
+class BenchPlugin{index}(pyblish.api.{type}):
+    order = {order}
+    label = "Bench Plugin {index}"
+
+    def process(self, {arg}):
+        pass
+"""
+
+
+def make_plugin_dir(root, count=100, seed=0):
+    """Write `count` of pyblish plugin files with orders in CVEI range
+
+    Returns:
+        str: The plugin dir
+
+    """
+    rand = random.Random(seed)
+    plugin_dir = os.path.join(root, "plugins")
+    os.makedirs(plugin_dir)
+
+    for i in range(count):
+        context = rand.random() < 0.3
+        source = PLUGIN_TEMPLATE.format(
+            index=i,
+            type="ContextPlugin" if context else "InstancePlugin",
+            order=round(rand.uniform(-0.5, 3.5), 3),
+            arg="context" if context else "instance",
+        )
+        with open(os.path.join(plugin_dir, "plugin_%03d.py" % i), "w") as fp:
+            fp.write(source)
+
+    return plugin_dir
+
+
+def make_contract_environment(instance_count=50, context_count=10, seed=0):
+    """Return environment variables like a contractor job received"""
+    rand = random.Random(seed)
+    environment = dict()
+
+    for i in range(context_count):
+        environment["AVALON_CONTEXT_entry%d" % i] = "value%d" % i
+
+    for i in range(instance_count):
+        environment["AVALON_DELEGATED_SUBSET_%d" % i] = "subset%d" % i
+        environment["AVALON_DELEGATED_VERSION_NUM_%d" % i] = str(
+            rand.randint(1, 100))
+
+    return environment
+
+
+def make_transfers(root, package_count=5, file_count=50, file_size=16 * 1024,
+                   seed=0):
+    """Create staging packages and files, return integrator transfers
+
+    Returns:
+        dict: Transfers in the form of `IntegrateAvalonSubset.transfers`
+
+    """
+    transfers = dict(packages=list(), files=list(), hardlinks=list())
+
+    staging = os.path.join(root, "staging")
+    publish = os.path.join(root, "publish")
+
+    for i in range(package_count):
+        src = os.path.join(staging, "package%d" % i)
+        make_file_tree(src,
+                       file_count=file_count,
+                       file_size=file_size,
+                       depth=1,
+                       seed=seed + i)
+        transfers["packages"].append(
+            (src, os.path.join(publish, "package%d" % i)))
+
+    files = make_file_tree(os.path.join(staging, "files"),
+                           file_count=file_count,
+                           file_size=file_size,
+                           depth=0,
+                           seed=seed)
+    for src in files:
+        dst = os.path.join(publish, "files", os.path.basename(src))
+        transfers["files"].append((src, dst))
+        transfers["hardlinks"].append((src, dst + ".link"))
+
+    return transfers
+
+
+def make_image_sequence(root, frame_count=5000, aovs=("beauty",),
+                        file_size=1024, step=1):
+    """Write render-like image sequences, one dir per AOV
+
+    Each dir also has a few non-sequence files, like render logs.
+
+    Returns:
+        dict: AOV name as key, output path pattern as value
+
+    """
+    payload = b"\0" * file_size
+    patterns = dict()
+
+    for aov in aovs:
+        aov_dir = os.path.join(root, aov)
+        os.makedirs(aov_dir)
+        for frame in range(1001, 1001 + frame_count * step, step):
+            path = os.path.join(aov_dir, "%s.%04d.exr" % (aov, frame))
+            with open(path, "wb") as fp:
+                fp.write(payload)
+        for name in ("render.log", "%s.tmp" % aov):
+            with open(os.path.join(aov_dir, name), "w") as fp:
+                fp.write(name)
+
+        patterns[aov] = os.path.join(aov_dir, aov + ".####.exr")
+
+    return patterns
+
+
+def build_maya_scene(cmds, node_count=10000, meshes_per_asset=100,
+                     shaders_per_asset=5, seed=0):
+    """Build a shaded set-dressing like scene with `cmds`
+
+    Works with both real `maya.cmds` (in mayapy) and the fake one from
+    `reveries.maya.vendor.maya_mock`, so results could be compared.
+
+    Each asset is in its own namespace, and has a root group with mesh
+    transforms grouped 10 per group. Every mesh transform has an `AvalonID`
+    attribute, a portion of them are hidden, mesh-parented, have an
+    intermediate shape or have faces assigned to another shading group.
+
+    Returns:
+        dict: "assets" (list of root long names), "transforms" (list of mesh
+            transform long names), "shapes" (list of mesh shape long names)
+
+    """
+    rand = random.Random(seed)
+    scene = {"assets": [], "transforms": [], "shapes": []}
+
+    # Roughly 2.2 nodes per mesh, transform + shape + groups and shaders
+    mesh_count = max(1, int(node_count / 2.2))
+    asset_count = max(1, mesh_count // meshes_per_asset)
+
+    for a in range(asset_count):
+        namespace = "asset%04d" % a
+        cmds.namespace(add=namespace)
+
+        root = cmds.createNode("transform", name=namespace + ":ROOT")
+        root = cmds.ls(root, long=True)[0]
+        scene["assets"].append(root)
+
+        engines = list()
+        for s in range(shaders_per_asset):
+            engines.append(cmds.sets(name="%s:shader%d_SG" % (namespace, s),
+                                     renderable=True,
+                                     noSurfaceShader=True,
+                                     empty=True))
+
+        group = previous = None
+        for m in range(meshes_per_asset):
+            if not m % 10:
+                group = cmds.createNode("transform",
+                                        name="%s:grp%d" % (namespace, m),
+                                        parent=root)
+
+            parent = group
+            if previous is not None and rand.random() < 0.05:
+                parent = previous  # Mesh parenting
+
+            transform = cmds.createNode("transform",
+                                        name="%s:geo%d" % (namespace, m),
+                                        parent=parent)
+            transform = cmds.ls(transform, long=True)[0]
+            shape = cmds.createNode("mesh",
+                                    name="%s:geo%dShape" % (namespace, m),
+                                    parent=transform)
+            shape = cmds.ls(shape, long=True)[0]
+
+            if rand.random() < 0.1:
+                orig = cmds.createNode("mesh",
+                                       name="%s:geo%dOrig" % (namespace, m),
+                                       parent=transform)
+                cmds.setAttr(orig + ".intermediateObject", True)
+
+            if rand.random() < 0.05:
+                cmds.setAttr(transform + ".visibility", False)
+
+            cmds.addAttr(transform, longName="AvalonID", dataType="string")
+            cmds.setAttr(transform + ".AvalonID",
+                         "%08x-%04d" % (rand.getrandbits(32), m),
+                         type="string")
+
+            cmds.sets(shape, forceElement=rand.choice(engines))
+            if rand.random() < 0.1:
+                cmds.sets(shape + ".f[0:9]", forceElement=rand.choice(engines))
+
+            scene["transforms"].append(transform)
+            scene["shapes"].append(shape)
+            previous = transform
+
+    return scene
@@ -0,0 +1,157 @@
+"""A minimal benchmark harness with baseline comparison
+
+Benchmarks are registered with `benchmark` decorator. Each benchmark is a
+function that takes a temporary directory and returns the callable to time,
+so the setup (data generation) is not timed.
+
+The best time of all repeats is compared with the baseline json, if it's
+slower than baseline times the threshold, the run is failed.
+
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import argparse
+import platform
+from timeit import default_timer
+
+
+_registry = list()
+
+
+def benchmark(name, number=1, repeat=5):
+    """Register benchmark
+
+    Arguments:
+        name (str): Benchmark name, the key in baseline
+        number (int, optional): Calls per repeat
+        repeat (int, optional): Number of repeats
+
+    """
+    def register(setup):
+        _registry.append((name, setup, number, repeat))
+        return setup
+    return register
+
+
+def measure(setup, number, repeat):
+    """Return best and median seconds per call of the benchmark"""
+    tempdir = tempfile.mkdtemp(prefix="reveries_bench_")
+    try:
+        func = setup(tempdir)
+
+        timings = list()
+        for _ in range(repeat):
+            start = default_timer()
+            for _ in range(number):
+                func()
+            timings.append((default_timer() - start) / number)
+
+    finally:
+        shutil.rmtree(tempdir, ignore_errors=True)
+
+    timings.sort()
+    return timings[0], timings[len(timings) // 2]
+
+
+def run(names=None):
+    """Run benchmarks
+
+    Arguments:
+        names (list, optional): Benchmark names to run, default all
+
+    Returns:
+        dict: {name: {"best": seconds, "median": seconds}}
+
+    """
+    results = dict()
+    for name, setup, number, repeat in _registry:
+        if names and name not in names:
+            continue
+
+        best, median = measure(setup, number, repeat)
+        results[name] = {"best": best, "median": median}
+        print("%-40s best %10.6fs  median %10.6fs" % (name, best, median))
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return names of benchmarks that regressed from baseline
+
+    Arguments:
+        results (dict): Results from `run`
+        baseline (dict): Baseline results
+        threshold (float): Allowed ratio of result over baseline
+
+    """
+    regressed = list()
+    for name in sorted(results):
+        if name not in baseline:
+            print("%-40s no baseline" % name)
+            continue
+
+        ratio = results[name]["best"] / baseline[name]["best"]
+        status = "REGRESSED" if ratio > threshold else "ok"
+        print("%-40s %6.2fx  %s" % (name, ratio, status))
+
+        if ratio > threshold:
+            regressed.append(name)
+
+    return regressed
+
+
+def main(baseline_path, argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("names", nargs="*",
+                        help="Benchmark names to run, default all")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="Allowed ratio over baseline, default 1.5")
+    parser.add_argument("--baseline", default=baseline_path,
+                        help="Baseline json file path")
+    parser.add_argument("--update", action="store_true",
+                        help="Write results as new baseline")
+    parser.add_argument("--list", action="store_true",
+                        help="List benchmark names")
+
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, _, _, _ in _registry:
+            print(name)
+        return 0
+
+    results = run(args.names)
+
+    if args.update:
+        baseline = dict()
+        if os.path.isfile(args.baseline):
+            with open(args.baseline) as fp:
+                baseline = json.load(fp)
+        baseline.update(results)
+        with open(args.baseline, "w") as fp:
+            json.dump(baseline, fp, indent=4, sort_keys=True)
+        print("Baseline updated on %s (Python %s): %s"
+              % (platform.node(), platform.python_version(), args.baseline))
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline found, run with --update to create one.")
+        return 0
+
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)
+
+    print("")
+    regressed = compare(results, baseline, args.threshold)
+    if regressed:
+        print("%d benchmark(s) regressed." % len(regressed))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit("Run `python tests/benchmarks/bench_reveries.py` instead.")
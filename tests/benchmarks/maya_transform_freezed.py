@@ -0,0 +1,100 @@
+"""Benchmark transform freezed validation on a large environment model
+
+This requires Maya, run with `mayapy`:
+
+    $ mayapy tests/benchmarks/maya_transform_freezed.py [transform count]
+
+"""
+import sys
+import time
+import random
+
+
+def build_environment_model(count, unfreezed_ratio=0.01):
+    """Build a model hierarchy with `count` mesh transforms
+
+    Transforms are grouped 100 per group, a small portion of them will be
+    moved to have non-identity matrix.
+
+    """
+    from maya import cmds
+
+    root = cmds.createNode("transform", name="ENV_MODEL")
+    nodes = [root]
+
+    group = None
+    for i in range(count):
+        if not i % 100:
+            group = cmds.createNode("transform",
+                                    name="GRP_%d" % (i // 100),
+                                    parent=root)
+            nodes.append(group)
+
+        transform = cmds.createNode("transform",
+                                    name="geo_%d" % i,
+                                    parent=group)
+        cmds.createNode("mesh", name="geo_%dShape" % i, parent=transform)
+        nodes.append(transform)
+
+        if random.random() < unfreezed_ratio:
+            cmds.setAttr(transform + ".translateX", random.random())
+
+    return cmds.ls(nodes, long=True)
+
+
+def legacy_get_invalid(transforms):
+    from maya import cmds
+    from reveries import lib
+    from reveries.maya.lib import TRANSFORM_ATTRS
+
+    invalid = list()
+    for transform in transforms:
+        matrix = cmds.xform(transform,
+                            query=True,
+                            matrix=True,
+                            objectSpace=True)
+
+        if not lib.matrix_equals(lib.DEFAULT_MATRIX, matrix, 1e-30):
+            if any(cmds.getAttr(transform + "." + attr, keyable=True)
+                   for attr in TRANSFORM_ATTRS):
+                invalid.append(transform)
+
+    return invalid
+
+
+def snapshot_get_invalid(nodes):
+    from reveries.maya.snapshot import SceneSnapshot
+
+    snapshot = SceneSnapshot(nodes)
+    transforms = snapshot.ls(nodes, type="transform")
+    candidates = snapshot.ls_non_identity(transforms, 1e-30)
+    return [transform for transform in candidates
+            if snapshot.is_transform_keyable(transform)]
+
+
+def timeit(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def main(count=50000):
+    import maya.standalone
+    maya.standalone.initialize()
+
+    random.seed(0)
+    nodes = build_environment_model(count)
+    print("Transforms: %d" % len(nodes))
+
+    legacy_time, legacy = timeit(legacy_get_invalid, nodes)
+    snapshot_time, result = timeit(snapshot_get_invalid, nodes)
+
+    assert sorted(legacy) == sorted(result), "Results not matched."
+
+    print("Invalid: %d" % len(result))
+    print("cmds.xform per node:  %.3fs" % legacy_time)
+    print("Scene snapshot batch: %.3fs" % snapshot_time)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,6 +1,11 @@
 
 import pytest
 import os
+import json
+import time
+import codecs
+import shutil
+import hashlib
 import tempfile
 
 try:
@@ -31,7 +36,12 @@ def test_clear_stage():
     tmp_1 = tempfile.mkdtemp(prefix=prefix)
     tmp_2 = tempfile.mkdtemp(prefix=prefix)
 
+    # Directories without owner are kept in grace period
     reveries.utils.clear_stage(prefix=prefix)
+    assert os.path.isdir(tmp_1)
+    assert os.path.isdir(tmp_2)
+
+    reveries.utils.clear_stage(prefix=prefix, grace=0)
 
     # They should be all removed
     assert os.path.isdir(tmp_1) is False
@@ -196,6 +206,48 @@ def test_asset_hasher():
     hasher.clear()
 
 
+def _legacy_c4_id(digest):
+    # The original digit by digit implementation
+    b58chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    long_value = int(codecs.encode(digest, "hex_codec"), 16)
+    result = ""
+    while long_value >= 58:
+        long_value, mod = divmod(long_value, 58)
+        result = b58chars[mod] + result
+    result = b58chars[long_value] + result
+    return "c4" + "1" * (88 - len(result)) + result
+
+
+def test_c4_hasher():
+    # Reference C4 IDs
+    references = {
+        b"": "c459dsjfscH38cYeXXYogktxf4Cd9ibshE3BHUo6a58hBXmRQdZrAkZzsWcbW"
+             "tDg5oQstpDuni4Hirj75GEmTc1sFT",
+        b"foo": "c45xZeXwMSpqXjpDumcHMA6mhoAmGHkUo7r9WmN2UgSEQzj9KjgseaQdkEJ"
+                "11fGb5S1WEENcV3q8RFWwEeVpC7Fjk2",
+        b"bar": "c45KgBYEvEE7Yfv16JAgnUT29bon2WsYAiBFZvnKNJiQR8kya2tRtEdfD6v"
+                "i8bjvmmDDrepEGmkNvk88M8NWdeV9ig",
+    }
+
+    hasher = reveries.utils._C4Hasher()
+    for data, c4_id in references.items():
+        hasher.clear()
+        hasher.hash_obj.update(data)
+        assert hasher.digest() == c4_id
+
+    data = list(references)
+    assert hasher.digest_many(data) == [references[d] for d in data]
+
+    # Same as original implementation, including digests that need padding
+    digests = [b"\x00" * 64, b"\x00" * 63 + b"\x01", b"\xff" * 64]
+    digests += [hashlib.sha512(str(i).encode()).digest() for i in range(500)]
+    for digest in digests:
+        assert hasher.encode(digest) == _legacy_c4_id(digest)
+
+    assert hasher._b58encode(b"\x00\x01") == "2"
+    assert hasher._b58encode(b"\x00") == "1"
+
+
 @mock.patch.dict('avalon.Session', {"AVALON_APP": "Maya"})
 @mock.patch('avalon.api.registered_root')
 def test_get_representation_path_(registered_root):
@@ -217,3 +269,365 @@ def test_get_representation_path_(registered_root):
 
     assert path == ("ROOT/Blockbuster/Maya/Asset/Hero/publish/"
                     "modelDefault/v005/MayaBinary")
+
+
+def test_members_data():
+    prefix = "test_members"
+    wdir = tempfile.mkdtemp(prefix=prefix)
+    json_path = os.path.join(wdir, "setdress.json")
+
+    members = [
+        {"containerId": "CON%d" % i,
+         "namespace": "prop_%d" % i,
+         "matrix": [float(i)] * 16,
+         "subMatrix": {"CON%d" % i: {"id": "<default>"}}}
+        for i in range(5)
+    ]
+
+    with open(json_path, "w") as fp:
+        json.dump(members, fp)
+
+    # Convert legacy members file
+    #
+    members_path = reveries.utils.convert_members_file(json_path)
+
+    assert members_path.endswith(".jsonl")
+    assert os.path.isfile(json_path)
+    assert reveries.utils.load_members(members_path) == members
+    assert reveries.utils.load_members(json_path) == members
+
+    # Lazy read
+    #
+    with reveries.utils.MembersReader(members_path) as reader:
+        assert len(reader) == 5
+        assert "CON3" in reader
+        assert reader.container_ids() == ["CON%d" % i for i in range(5)]
+        assert reader.get("CON3") == members[3]
+        assert reader.get("CON9") is None
+        assert list(reader) == members
+
+    # Not a members data file
+    #
+    with pytest.raises(ValueError):
+        reveries.utils.MembersReader(json_path)
+
+    shutil.rmtree(wdir)  # clean up
+
+
+def test_resolve_file_patterns():
+    tmp = tempfile.mkdtemp()
+    try:
+        names = [
+            "color.1001.tif",
+            "color.1002.tif",
+            "color.tif",
+            "bump_u1_v1.exr",
+            "seq.0001.png",
+            "seq.0002.png",
+            "seq.1.png",
+        ]
+        for name in names:
+            with open(os.path.join(tmp, name), "w") as fp:
+                fp.write(name)
+
+        def join(name):
+            return os.path.join(tmp, name)
+
+        patterns = [
+            join("color.<UDIM>.tif"),
+            join("bump_u<U>_v<V>.exr"),
+            join("seq.####.png"),
+            join("color.tif"),
+            join("missing.tif"),
+            join("missing.<UDIM>.tif"),
+        ]
+        result = reveries.utils.resolve_file_patterns(patterns, workers=2)
+
+        def paths(pattern):
+            return [path for path, size, mtime in result[pattern]]
+
+        assert paths(patterns[0]) == [join("color.1001.tif"),
+                                      join("color.1002.tif")]
+        assert paths(patterns[1]) == [join("bump_u1_v1.exr")]
+        assert paths(patterns[2]) == [join("seq.0001.png"),
+                                      join("seq.0002.png")]
+        assert paths(patterns[3]) == [join("color.tif")]
+        assert result[patterns[4]] == []
+        assert result[patterns[5]] == []
+
+        path, size, mtime = result[patterns[3]][0]
+        assert size == len("color.tif")
+        assert mtime == os.path.getmtime(path)
+
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_hash_files():
+    tmp = tempfile.mkdtemp()
+    try:
+        paths = list()
+        for name, content in [("a", "foo"), ("b", "bar"), ("c", "foo")]:
+            path = os.path.join(tmp, name)
+            with open(path, "w") as fp:
+                fp.write(content)
+            paths.append(path)
+
+        hashes = reveries.utils.hash_files(paths + paths[:1], workers=2)
+
+        assert sorted(hashes) == sorted(paths)
+        for path in paths:
+            assert hashes[path] == reveries.utils.hash_file(path)
+        assert hashes[paths[0]] == hashes[paths[2]]
+        assert hashes[paths[0]] != hashes[paths[1]]
+
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_content_store():
+    tmp = tempfile.mkdtemp()
+    try:
+        src = os.path.join(tmp, "staging")
+        os.makedirs(os.path.join(src, "sub"))
+        for name, content in [("a.abc", "foo"),
+                              (os.path.join("sub", "b.abc"), "foo"),
+                              ("c.abc", "bar")]:
+            with open(os.path.join(src, name), "w") as fp:
+                fp.write(content)
+
+        store = reveries.utils.ContentStore(root=tmp, project="Test")
+        dst_1 = os.path.join(tmp, "v001")
+        dst_2 = os.path.join(tmp, "v002")
+        manifest = store.ingest_dir(src, dst_1)
+        store.ingest_dir(src, dst_2)
+
+        paths = [path for path, c4_id in manifest]
+        assert paths == ["a.abc", "c.abc", "sub/b.abc"]
+
+        # Same content stored once and hardlinked
+        stored = os.listdir(os.path.join(store.root, manifest[0][1][2:4]))
+        assert manifest[0][1] == manifest[2][1]
+        assert len(set(c4_id for path, c4_id in manifest)) == 2
+        assert os.stat(os.path.join(dst_2, "a.abc")).st_nlink == 5
+        assert manifest[0][1] in stored
+
+        # Destination must be new
+        with pytest.raises(OSError):
+            store.ingest_dir(src, dst_1)
+
+        # Only unreferenced files will be collected
+        representations = [{"data": {"storeManifest": manifest[:1]}}]
+        with mock.patch("avalon.io.find", return_value=representations):
+            removed = store.collect_garbage(grace=-1)
+
+        assert removed == [store.path(manifest[1][1])]
+        assert os.path.isfile(store.path(manifest[0][1]))
+        assert not os.path.isfile(store.path(manifest[1][1]))
+        # Published file still there
+        assert os.path.isfile(os.path.join(dst_1, "c.abc"))
+
+    finally:
+        for root, dirs, files in os.walk(tmp):
+            for name in files:
+                os.chmod(os.path.join(root, name), 0o644)
+        shutil.rmtree(tmp)
+
+
+def test_staging_owner():
+    root = tempfile.mkdtemp()
+    try:
+        prefix = "test_stage_"
+        in_use = reveries.utils.temp_dir(prefix=prefix, root=root)
+        orphan = reveries.utils.temp_dir(prefix=prefix, root=root)
+        legacy = tempfile.mkdtemp(prefix=prefix, dir=root)
+        creating = tempfile.mkdtemp(prefix=prefix, dir=root)
+        # Not modified since two days ago
+        two_days_ago = time.time() - 86400 * 2
+        os.utime(legacy, (two_days_ago, two_days_ago))
+
+        assert reveries.utils.is_staging_dir(in_use)
+        assert not reveries.utils.is_staging_dir(legacy)
+
+        # Owner process of `orphan` has gone
+        with open(orphan + ".owner", "r") as fp:
+            owner = json.load(fp)
+        owner["pid"] = 2 ** 22 + 1
+        with open(orphan + ".owner", "w") as fp:
+            json.dump(owner, fp)
+
+        removed = reveries.utils.clear_stage(prefix=prefix, root=root)
+
+        assert sorted(removed) == sorted([orphan, legacy])
+        assert os.path.isdir(in_use)
+        assert sorted(os.listdir(root)) == sorted([
+            os.path.basename(in_use),
+            os.path.basename(in_use) + ".owner",
+            os.path.basename(creating),
+        ])
+
+        assert reveries.utils.remove_stage(in_use)
+        assert reveries.utils.remove_stage(creating)
+        assert os.listdir(root) == []
+
+    finally:
+        shutil.rmtree(root)
+
+
+def test_fingerprint_modes():
+    root = tempfile.mkdtemp(prefix="test_fingerprint_")
+    try:
+        workspace = os.path.join(root, "workspace")
+        os.makedirs(os.path.join(workspace, "scenes"))
+        file_path = os.path.join(workspace, "scenes", "shot.ma")
+        with open(file_path, "wb") as fp:
+            fp.write(b"0123456789" * 200000)
+
+        for mode, hash_func in reveries.utils.FINGERPRINT_MODES.items():
+            hash_val = hash_func(workspace)
+            assert hash_val == hash_func(workspace)
+            assert hash_val != hash_func(file_path)
+
+        # Chunked hash covers full content
+        before = reveries.utils.chunked_hash(file_path, chunk_size=4096)
+        with open(file_path, "r+b") as fp:
+            fp.seek(100001)
+            fp.write(b"x")
+        after = reveries.utils.chunked_hash(file_path, chunk_size=4096)
+        assert before != after
+
+        # Sampled hash detects size change
+        before = reveries.utils.sampled_hash(file_path)
+        with open(file_path, "ab") as fp:
+            fp.write(b"x")
+        assert before != reveries.utils.sampled_hash(file_path)
+
+        # Full C4 hash in background
+        source_hash = reveries.utils.BackgroundHash(workspace)
+        assert source_hash.result() == reveries.utils.hash_path(workspace)
+
+        project = {"data": {}}
+        assert reveries.utils.fingerprint_mode(project) == "c4"
+        project["data"]["fingerprint"] = "sampled"
+        assert reveries.utils.fingerprint_mode(project) == "sampled"
+        project["data"]["fingerprint"] = "md5"
+        with pytest.raises(ValueError):
+            reveries.utils.fingerprint_mode(project)
+
+    finally:
+        shutil.rmtree(root)
+
+
+def test_transfer_queue():
+    root = tempfile.mkdtemp(prefix="test_transfer_")
+    try:
+        staging = os.path.join(root, "staging")
+        publish = os.path.join(root, "publish", "v001")
+        os.makedirs(os.path.join(staging, "mayaAscii"))
+        with open(os.path.join(staging, "mayaAscii", "model.ma"), "w") as fp:
+            fp.write("model")
+        with open(os.path.join(root, "texture.png"), "w") as fp:
+            fp.write("texture")
+
+        queue = reveries.utils.TransferQueue(workers=2)
+        package = queue.submit("model",
+                               "packages",
+                               os.path.join(staging, "mayaAscii"),
+                               os.path.join(publish, "mayaAscii"))
+        texture = os.path.join(publish, "TexturePack", "a", "texture.png")
+        queue.submit("look",
+                     "files",
+                     os.path.join(root, "texture.png"),
+                     texture)
+        # Hardlink to a file that may not yet copied
+        queue.submit("look",
+                     "hardlinks",
+                     texture,
+                     os.path.join(publish, "TexturePack", "b", "texture.png"))
+        # Nothing to transfer
+        assert queue.submit("look", "files", texture, texture) is None
+
+        # Hardlink into a package dir that may not yet copied
+        queue.submit("model",
+                     "hardlinks",
+                     os.path.join(root, "texture.png"),
+                     os.path.join(publish, "mayaAscii", "reused.png"))
+        # Depends on both the copying file and the copying package
+        queue.submit("model",
+                     "hardlinks",
+                     texture,
+                     os.path.join(publish, "mayaAscii", "linked.png"))
+
+        assert package in queue.wait("model")
+        assert os.path.isfile(os.path.join(publish, "mayaAscii",
+                                           "linked.png"))
+        assert len(queue.wait("look")) == 2
+        assert queue.wait("look") == dict()
+
+        with open(os.path.join(publish, "mayaAscii", "model.ma")) as fp:
+            assert fp.read() == "model"
+        with open(os.path.join(publish,
+                               "TexturePack", "b", "texture.png")) as fp:
+            assert fp.read() == "texture"
+
+        # Error raised on wait
+        queue.submit("model",
+                     "packages",
+                     os.path.join(staging, "mayaAscii"),
+                     os.path.join(publish, "mayaAscii"))
+        with pytest.raises(OSError):
+            queue.wait("model")
+
+        queue.close()
+
+        project = {"data": {}}
+        assert not reveries.utils.TransferQueue.enabled(project)
+        project["data"]["asyncTransfer"] = True
+        assert reveries.utils.TransferQueue.enabled(project)
+
+    finally:
+        shutil.rmtree(root)
+
+
+def test_image_sequence():
+    assert reveries.utils.frame_range(1, 5) == [1, 2, 3, 4, 5]
+    assert reveries.utils.frame_range(1, 10, 3) == [1, 4, 7, 10]
+    assert reveries.utils.frame_range(1, 11, 2.5) == [1, 4, 6, 9, 11]
+    assert reveries.utils.frame_range(1, 2, 0.5) == [1, 2]
+
+    format_frame_list = reveries.utils.format_frame_list
+    assert format_frame_list([10, 1, 2, 3, 5, 11, 12, 2]) == "1-3,5,10-12"
+    assert format_frame_list([7]) == "7"
+    assert format_frame_list([]) == ""
+
+    root = tempfile.mkdtemp(prefix="test_sequence_")
+    try:
+        seq_dir = os.path.join(root, "beauty")
+        os.makedirs(os.path.join(seq_dir, "sub.0001.exr"))  # Not a file
+        for name in ["beauty.%04d.exr" % f for f in range(998, 1011, 2)] + [
+                "beauty.0999.exr.tmp", "beauty.txt", "other.0001.exr"]:
+            with open(os.path.join(seq_dir, name), "w") as fp:
+                fp.write(name)
+
+        for pattern in ("beauty.####.exr", "beauty.%04d.exr", None):
+            sequence = reveries.utils.ImageSequence.scan(seq_dir, pattern)
+            assert sequence.entry_file_name == "beauty.%04d.exr"
+            assert sorted(sequence.frames) == list(range(998, 1011, 2))
+            assert sequence.start == 998
+            assert sequence.end == 1010
+            frames = reveries.utils.frame_range(998, 1010, 2)
+            assert sequence.missing(frames) == []
+            assert sequence.missing(range(998, 1003)) == [999, 1001]
+
+        with pytest.raises(ValueError):
+            reveries.utils.ImageSequence.scan(seq_dir, "none.####.exr")
+
+        publish = os.path.join(root, "publish")
+        transfers = [(src, os.path.join(publish, os.path.basename(src)))
+                     for src in sequence.file_paths()]
+        reveries.utils.hardlink_files(transfers)
+        for src, dst in transfers:
+            assert os.stat(src).st_ino == os.stat(dst).st_ino
+
+    finally:
+        shutil.rmtree(root)